@@ -49,6 +49,7 @@ AI 기반 수요 예측과 이상치 탐지, 운영 인사이트를 제공하는
 #### 🚨 [6. 이상치 탐지 및 원인 분석 (`anomaly_detection.py`, `error_analysis.py`)]
 - 공휴일 및 요일별 계절성을 고려한 **Z-score 기반 이상치 탐지** 기능입니다.
 - 수요 급증/급감의 원인을 명절, 연휴, 특정 요일 효과 등과 연결지어 분석 결과를 제공합니다.
+- **이상치 리더보드** (`anomaly_leaderboard.py`)에서 기간 내 전체 센터 × 품목의 이상치를 한 화면에서 확인할 수 있습니다.
 
 #### 🧠 [7. AI 기반 운영 인사이트 (`model_ranking.py`, `insight_dashboard.py`)]
 - 평균 수요, 변동성, 예측 안정성 등을 기준으로 **품목별/센터별 위험도 순위**를 제공하고,
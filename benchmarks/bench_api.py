@@ -0,0 +1,83 @@
+# ⏱️ API 부하 벤치마크	로컬 ASGI 클라이언트로 동시 요청 처리량(req/s)과 지연 시간 측정
+# 🤝 요청 병합 효과	같은 요청 동시 다발 vs 서로 다른 요청 비교
+#
+# 사용법: python benchmarks/bench_api.py --requests 200 --concurrency 32
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import main
+
+
+async def _load(client: httpx.AsyncClient, requests: list, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(path, params):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path, params=params)
+            latencies.append(time.perf_counter() - start)
+            failures += response.status_code != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(path, params) for path, params in requests))
+    elapsed = time.perf_counter() - start
+    return {
+        "요청 수": len(requests),
+        "실패": failures,
+        "req/s": round(len(requests) / elapsed, 1),
+        "p50(ms)": round(np.percentile(latencies, 50) * 1000, 1),
+        "p95(ms)": round(np.percentile(latencies, 95) * 1000, 1),
+    }
+
+
+async def run(n_requests: int, concurrency: int, period_days: int, model: str) -> None:
+    # ASGI 전송은 lifespan을 실행하지 않으므로 직접 열어 서비스를 초기화
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            service = main.service
+            cube = service.store.cube
+            pairs = [(center, item) for center in cube.centers for item in cube.items]
+
+            def forecast(center, item):
+                params = {"center": center, "item": item, "period_days": period_days, "model": model}
+                return "/forecast", params
+
+            distinct = [forecast(center, item) for center, item in pairs]
+            distinct = (distinct * (n_requests // len(distinct) + 1))[:n_requests]
+
+            scenarios = [
+                ("동일 요청 동시 다발 (병합)", [forecast(*pairs[0])] * n_requests),
+                ("서로 다른 요청 (첫 요청: 디스크 로드/학습)", distinct),
+                ("서로 다른 요청 (메모리 모델 캐시)", distinct),
+                ("이상치 조회", [("/anomalies", {"limit": 100})] * n_requests),
+            ]
+            for name, requests in scenarios:
+                before = service.stats()
+                result = await _load(client, requests, concurrency)
+                after = service.stats()
+                result["병합된 요청"] = after["requests_coalesced"] - before["requests_coalesced"]
+                print(f"{name}: {result}")
+            print(f"모델 캐시: {service.stats()['model_cache']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="예측 API 동시 부하 벤치마크")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--period-days", type=int, default=14)
+    parser.add_argument("--model", choices=["lgbm", "prophet"], default="lgbm")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.concurrency, args.period_days, args.model))
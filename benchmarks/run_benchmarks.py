@@ -0,0 +1,355 @@
+# ⏱️ 벤치마크 모음	로딩 · dtype 축소 · 피처 생성 · 롤업 · 요약 통계 기간 조회 · 이상치 탐지 · 순위 스윕 · 차트 페이로드 소요 시간 측정
+# 🧪 합성 데이터	원본 CSV 없이도 센터 수 × 연수 규모를 바꿔가며 측정 (--data로 실제 CSV 지정 가능)
+# 📁 결과 저장	실행 환경/규모와 함께 JSON으로 저장하고, --compare로 이전 결과 대비 회귀 여부 확인
+#
+# 사용법: python benchmarks/run_benchmarks.py --centers 25 --years 6 --repeat 3
+#         python benchmarks/run_benchmarks.py --compare benchmarks/results/<이전 결과>.json
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from synthetic import make_logistics_frame, write_logistics_csv
+
+from src.calendar import HolidayCalendar
+from src.cube import LogisticsCube
+from src.features import FeatureStore
+from src.loader import KEY_COLUMNS, load_logistics_data, parse_logistics_csv
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+PERIOD_DAYS = 14
+# 이 비율 이상 느려지면 회귀로 표시
+DEFAULT_THRESHOLD = 0.10
+
+
+class BenchContext:
+    """벤치마크 간에 공유하는 입력 (필요할 때 한 번만 만들고 측정 대상에서는 제외)."""
+
+    def __init__(self, path: str, sweep_series: int, workers: int):
+        self.path = path
+        self.sweep_series = sweep_series
+        self.workers = workers
+
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        return parse_logistics_csv(self.path)
+
+    @cached_property
+    def item_columns(self) -> list:
+        return [col for col in self.df.columns if col not in KEY_COLUMNS]
+
+    @cached_property
+    def calendar(self) -> HolidayCalendar:
+        return HolidayCalendar(self.df["date"].min(), self.df["date"].max())
+
+    @cached_property
+    def cube(self) -> LogisticsCube:
+        return LogisticsCube.from_frame(self.df, self.item_columns)
+
+    @cached_property
+    def features(self) -> FeatureStore:
+        return FeatureStore.build(self.cube, self.calendar)
+
+
+BENCHMARKS = {}
+
+
+def bench(name: str):
+    """벤치마크 함수를 등록합니다. 함수는 ctx를 받아 측정할 호출(callable)을 반환합니다."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+@bench("load_csv")
+def _load_csv(ctx: BenchContext):
+    return lambda: {"rows": len(parse_logistics_csv(ctx.path))}
+
+
+@bench("load_cached")
+def _load_cached(ctx: BenchContext):
+    from src.loader import feather
+    if feather is None:
+        raise ImportError("pyarrow 미설치 (Feather 캐시 비활성화)")
+    load_logistics_data(ctx.path)  # 캐시 생성
+    return lambda: {"rows": len(load_logistics_data(ctx.path))}
+
+
+@bench("derived_columns")
+def _derived_columns(ctx: BenchContext):
+    from src.store import add_derived_columns
+    return lambda: add_derived_columns(ctx.df, ctx.calendar)
+
+
+@bench("compact_dtypes")
+def _compact_dtypes(ctx: BenchContext):
+    from src.loader import compact_dtypes
+
+    def run():
+        compacted = compact_dtypes(ctx.df)
+        return {
+            "raw_mb": round(ctx.df.memory_usage(deep=True).sum() / 1e6, 2),
+            "compact_mb": round(compacted.memory_usage(deep=True).sum() / 1e6, 2),
+        }
+    return run
+
+
+@bench("build_cube")
+def _build_cube(ctx: BenchContext):
+    return lambda: LogisticsCube.from_frame(ctx.df, ctx.item_columns)
+
+
+@bench("build_features")
+def _build_features(ctx: BenchContext):
+    return lambda: FeatureStore.build(ctx.cube, ctx.calendar)
+
+
+@bench("build_rollups")
+def _build_rollups(ctx: BenchContext):
+    from src.rollups import Rollups
+    return lambda: Rollups(ctx.cube)
+
+
+SUMMARY_STATS = ["mean", "std", "min", "max"]
+
+
+def check_summary(ctx: BenchContext, rollups, start=None, end=None) -> None:
+    """
+    롤업 기간 조회가 원본 groupby(data_summary 이전 구현)와 같은 결과인지 확인합니다.
+
+    min/max는 dtype과 값이 정확히 같아야 하고, mean/std는 groupby의 누적 방식(Kahan/Welford) 자체의
+    반올림 오차(상대 1e-12 이내)만 허용하며, 화면에 표시하는 소수 둘째 자리 반올림 값은 정확히 같아야 합니다.
+
+    Raises:
+    - AssertionError: 결과가 다른 경우
+    """
+    df = ctx.df
+    if start is not None:
+        df = df[(df["date"] >= start) & (df["date"] <= end)]
+    expected = df.groupby("center_name")[ctx.item_columns].agg(SUMMARY_STATS)
+    actual = rollups.query_range(start, end, by=("center",), stats=SUMMARY_STATS)
+
+    assert list(actual.index) == list(expected.index), "센터 목록이 다릅니다"
+    assert list(actual.columns) == list(expected.columns), "컬럼 구성이 다릅니다"
+    for column in expected.columns:
+        if column[1] in ("min", "max"):
+            assert actual[column].dtype == expected[column].dtype, f"{column} dtype이 다릅니다"
+            assert actual[column].equals(expected[column]), f"{column} 값이 다릅니다"
+        else:
+            np.testing.assert_allclose(actual[column], expected[column], rtol=1e-12, err_msg=str(column))
+    pd.testing.assert_frame_equal(actual.round(2), expected.round(2), check_names=False)
+
+
+@bench("summary_range")
+def _summary_range(ctx: BenchContext):
+    from src.rollups import Rollups
+
+    # data_summary 페이지에서 달 중간에 걸친 기간 × 전체 센터/품목을 선택한 경우
+    rollups = Rollups(ctx.cube, item_dtypes=ctx.df[ctx.item_columns].dtypes.to_dict())
+    dates = ctx.cube.dates
+    start, end = dates[len(dates) // 4], dates[-len(dates) // 4]
+    # 측정 전에 전체 기간 / 부분 기간 결과를 원본 groupby와 비교
+    check_summary(ctx, rollups)
+    check_summary(ctx, rollups, start, end)
+
+    def run():
+        summary = rollups.query_range(start, end, by=("center",), stats=["mean", "std", "min", "max"])
+        return {"groups": len(summary)}
+    return run
+
+
+@bench("anomaly_detection")
+def _anomaly_detection(ctx: BenchContext):
+    from src.anomaly import WeekdayAnomalies
+
+    def run():
+        engine = WeekdayAnomalies(ctx.cube, ctx.calendar)
+        return {"outliers": int(engine.is_outlier.sum())}
+    return run
+
+
+@bench("ranking_sweep")
+def _ranking_sweep(ctx: BenchContext):
+    import lightgbm  # noqa: F401  (미설치면 건너뜀)
+    from src.sweep import make_holdout_tasks, run_sweep
+
+    def run():
+        tasks = make_holdout_tasks(ctx.features, PERIOD_DAYS)[:ctx.sweep_series]
+        outcomes = list(run_sweep(tasks, max_workers=ctx.workers))
+        return {"series": len(tasks), "errors": sum(o.error is not None for o in outcomes)}
+    return run
+
+
+@bench("ranking_global")
+def _ranking_global(ctx: BenchContext):
+    import lightgbm  # noqa: F401
+    from src.global_model import fit_global_model
+
+    def run():
+        return {"series": len(fit_global_model(ctx.features, PERIOD_DAYS).holdout_metrics())}
+    return run
+
+
+@bench("chart_payload")
+def _chart_payload(ctx: BenchContext):
+    from src.visualizer import line_chart_by_center
+
+    # item_trend 페이지에서 전체 기간 × 센터 5곳을 선택한 경우
+    centers = ctx.cube.centers[:5]
+    item = ctx.item_columns[0]
+    filtered = ctx.df[ctx.df["center_name"].isin(centers)]
+    pivot_df = filtered.pivot_table(index="date", columns="center_name", values=item)
+    full_bytes = len(line_chart_by_center(pivot_df, item, point_budget=len(pivot_df)).to_json())
+
+    def run():
+        payload = line_chart_by_center(pivot_df, item).to_json()
+        return {"payload_bytes": len(payload), "full_payload_bytes": full_bytes}
+    return run
+
+
+def _measure(fn, repeat: int) -> dict:
+    runs, extra = [], {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - start)
+        if isinstance(out, dict):
+            extra = out
+    return {
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "runs": [round(seconds, 6) for seconds in runs],
+        **extra,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmarks(path: str, names: list, repeat: int = 3, sweep_series: int = 50,
+                   workers: int = None) -> dict:
+    """
+    선택한 벤치마크를 실행하고 결과를 반환합니다.
+
+    Parameters:
+    - path (str): 물류 CSV 경로
+    - names (list): 실행할 벤치마크 이름 (BENCHMARKS 키)
+    - repeat (int): 반복 횟수 (min/median 기록)
+    - sweep_series (int): ranking_sweep에서 학습할 최대 시리즈 수
+    - workers (int): ranking_sweep 워커 수
+
+    Returns:
+    - dict: 벤치마크 이름 → {min, median, runs, ...} 또는 {skipped}
+    """
+    ctx = BenchContext(path, sweep_series, workers)
+    results = {}
+    for name in names:
+        try:
+            fn = BENCHMARKS[name](ctx)
+        except ImportError as e:
+            results[name] = {"skipped": str(e)}
+            print(f"{name:<20} 건너뜀 ({e})")
+            continue
+        results[name] = _measure(fn, repeat)
+        extra = {k: v for k, v in results[name].items() if k not in ("min", "median", "runs")}
+        print(f"{name:<20} median {results[name]['median']:.4f}s  min {results[name]['min']:.4f}s  {extra or ''}")
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    이전 결과 대비 median 비율을 출력하고 회귀한 벤치마크 이름 목록을 반환합니다.
+    """
+    regressions = []
+    print(f"\n기준: {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if "median" not in result or not base or "median" not in base:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  ⚠️ 회귀"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  ✅ 개선"
+        print(f"{name:<20} {base['median']:.4f}s → {result['median']:.4f}s  (x{ratio:.2f}){flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="대시보드 핵심 경로 벤치마크")
+    parser.add_argument("--data", default=None, help="측정할 CSV (기본값: 합성 데이터 생성)")
+    parser.add_argument("--centers", type=int, default=25)
+    parser.add_argument("--years", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sweep-series", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=RESULTS_DIR)
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.data
+        if path is None:
+            path = os.path.join(tmp, "synthetic.csv")
+            write_logistics_csv(make_logistics_frame(args.centers, args.years, seed=args.seed), path)
+        print(f"데이터: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        benchmarks = run_benchmarks(path, args.only, args.repeat, args.sweep_series, args.workers)
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "data": args.data or {"centers": args.centers, "years": args.years, "seed": args.seed},
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "benchmarks": benchmarks,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    out_path = os.path.join(
+        args.output, f"{datetime.now():%Y%m%d-%H%M%S}_{result['meta']['commit']}.json"
+    )
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out_path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print(f"회귀: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# 🌐 main.py - FastAPI 예측 서비스 (Spring Boot 등 외부 시스템 연동용)
+# 🔮 /forecast, /forecast/batch	센터 × 품목 예측 (대시보드와 같은 모델 레지스트리 사용)
+# 🚨 /anomalies	기간 내 전체 네트워크 이상치
+# 📊 /metrics	배치 백테스트 결과 기반 시리즈별 지표
+# 🔬 /diagnostics	구간별 지연 시간/캐시 적중률 (JSON, /diagnostics/prometheus는 Prometheus 텍스트)
+#
+# 실행: uvicorn main:app --port 8005
+
+import asyncio
+import datetime
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+
+from src import instrument
+from src.forecast_service import ForecastService, ResultsNotFound
+
+service: ForecastService = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global service
+    service = ForecastService()
+    yield
+    service.close()
+
+
+app = FastAPI(title="SOPO Forecast API", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    # 엔드포인트(요청 경로)별 지연 시간 분위수
+    with instrument.span("api_request", path=request.url.path):
+        return await call_next(request)
+
+
+# src.forecasters에 등록된 모델 (forecast_service.FORECAST_MODELS)
+ForecastModel = Literal["lgbm", "prophet", "naive", "seasonal_naive", "weekday_mean"]
+
+
+class SeriesKey(BaseModel):
+    center: str
+    item: str
+
+
+class BatchForecastRequest(BaseModel):
+    series: list[SeriesKey] = Field(..., min_length=1, max_length=500)
+    period_days: int = Field(14, ge=1, le=90)
+    model: ForecastModel = "lgbm"
+
+
+async def _forecast(center: str, item: str, period_days: int, model: str) -> dict:
+    key = ("forecast", center, item, period_days, model)
+    return await service.run(key, service.forecast, center, item, period_days, model)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", **service.stats()}
+
+
+@app.get("/forecast")
+async def forecast(
+    center: str,
+    item: str,
+    period_days: int = Query(14, ge=1, le=90),
+    model: ForecastModel = "lgbm",
+):
+    try:
+        return await _forecast(center, item, period_days, model)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0])) from e
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+@app.post("/forecast/batch")
+async def forecast_batch(request: BatchForecastRequest):
+    # 조합별 요청도 병합 대상이므로 단건 요청과 같은 조합은 한 번만 계산됨
+    outcomes = await asyncio.gather(
+        *(_forecast(s.center, s.item, request.period_days, request.model) for s in request.series),
+        return_exceptions=True,
+    )
+    results, errors = [], []
+    for s, outcome in zip(request.series, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append({"center": s.center, "item": s.item, "error": str(outcome)})
+        else:
+            results.append(outcome)
+    return {"results": results, "errors": errors}
+
+
+@app.get("/anomalies")
+async def anomalies(
+    # 날짜 형식(YYYY-MM-DD)이 아니면 FastAPI가 422로 응답
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    center: list[str] = Query(None),
+    item: list[str] = Query(None),
+    z_thresh: float = Query(None, gt=0),
+    limit: int = Query(100, ge=1, le=10000),
+):
+    key = ("anomalies", start, end, tuple(center or ()), tuple(item or ()), z_thresh, limit)
+    return await service.run(key, service.anomalies, start, end, center, item, z_thresh, limit)
+
+
+@app.get("/metrics")
+async def metrics(
+    period_days: int = Query(14, ge=1, le=90),
+    model: Literal["lgbm", "prophet", "global"] = "lgbm",
+):
+    try:
+        return await service.run(("metrics", period_days, model), service.metrics, period_days, model)
+    except ResultsNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@app.get("/diagnostics")
+async def diagnostics():
+    return instrument.snapshot()
+
+
+@app.get("/diagnostics/prometheus", response_class=PlainTextResponse)
+async def diagnostics_prometheus():
+    return PlainTextResponse(instrument.to_prometheus(), media_type="text/plain; version=0.0.4")
@@ -2,15 +2,16 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-import holidays
 import sys
 import os
 
 # src 경로 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.dataset import cached_result, get_anomalies, get_dataset, get_item_columns
+from src.instrument import finish_page, plotly_chart, start_page
+
+start_page("anomaly_detection")
 
 # -------------------------
 # 1. 페이지 설정
@@ -21,62 +22,24 @@ st.title("📊 요일 및 공휴일 기반 이상치 탐지")
 # -------------------------
 # 2. 데이터 불러오기
 # -------------------------
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
-df['weekday'] = df['date'].dt.day_name()
+df = get_dataset()
+item_columns = get_item_columns()
 
 # -------------------------
 # 3. 사용자 필터
 # -------------------------
 st.sidebar.header("필터 옵션")
-center = st.sidebar.selectbox("센터 선택", df["center_name"].unique())
-item = st.sidebar.selectbox("품목 선택", df.columns[2:13])
-
-# -------------------------
-# 4. 이상치 탐지 함수
-# -------------------------
-def detect_outliers_by_weekday(df, center_name, item_col, z_thresh=2.5):
-    center_df = df[df["center_name"] == center_name].copy()
-    stats = center_df.groupby("weekday")[item_col].agg(["mean", "std"]).rename(columns={"mean": "avg", "std": "std"})
-
-    center_df["avg"] = center_df["weekday"].map(stats["avg"])
-    center_df["std"] = center_df["weekday"].map(stats["std"])
-    center_df["z_score"] = (center_df[item_col] - center_df["avg"]) / center_df["std"]
-    center_df["is_outlier"] = center_df["z_score"].abs() > z_thresh
-
-    return center_df
+center = st.sidebar.selectbox("센터 선택", df["center_name"].unique().tolist())
+item = st.sidebar.selectbox("품목 선택", item_columns)
 
 # -------------------------
-# 5. 공휴일 영향 판단 함수
+# 4~5. 이상치 탐지 / 공휴일 영향 판단
 # -------------------------
-def mark_holiday_related_outliers(df: pd.DataFrame, country='KR'):
-    years = df['date'].dt.year.unique().tolist()
-    kr_holidays = holidays.KR(years=years)
-
-    # 공휴일 날짜 목록 생성
-    holiday_df = pd.DataFrame({
-        "holiday_date": pd.to_datetime(list(kr_holidays.keys())),
-        "holiday_name": list(kr_holidays.values())
-    })
+# 전체 센터 × 품목의 요일별 Z-score와 공휴일 ±2일 여부는 src.anomaly 엔진에서 한 번에 계산되어 캐싱됩니다.
+def anomaly_series(center: str, item: str) -> pd.DataFrame:
+    # 캐시 키의 데이터 버전보다 먼저 가져온 탐지 결과를 쓰지 않도록 계산 시점에 가져옴
+    return get_anomalies().series_frame(center, item)
 
-    # ±2일 범위 포함 (추석/설날도 자동 포함됨)
-    extended_holidays = []
-    for _, row in holiday_df.iterrows():
-        base_date = row['holiday_date']
-        for offset in range(-2, 3):  # -2, -1, 0, +1, +2
-            date = base_date + pd.Timedelta(days=offset)
-            extended_holidays.append((date, row['holiday_name']))
-
-    holiday_map = pd.DataFrame(extended_holidays, columns=["date", "holiday_name"]).drop_duplicates()
-    df = df.merge(holiday_map, how="left", on="date")
-    df["is_holiday_related"] = df["holiday_name"].notna()
-
-    return df
 
 # -------------------------
 # 6. 판단 기준 설명
@@ -91,8 +54,8 @@ st.markdown("""
 # -------------------------
 # 7. 탐지 실행
 # -------------------------
-result_df = detect_outliers_by_weekday(df, center, item)
-result_df = mark_holiday_related_outliers(result_df)
+# 같은 데이터 버전 × 센터 × 품목이면 결과 캐시에서 재사용
+result_df = cached_result("anomaly_series", anomaly_series, center, item)
 
 # -------------------------
 # 8. 시각화
@@ -133,7 +96,7 @@ fig.update_layout(
     hovermode="x unified",
 )
 
-st.plotly_chart(fig, use_container_width=True)
+plotly_chart(fig, use_container_width=True)
 
 # -------------------------
 # 9. 이상치 테이블
@@ -148,3 +111,5 @@ display_df = display_df.rename(columns={
 })
 
 st.dataframe(display_df.sort_values("date"), use_container_width=True)
+
+finish_page()
@@ -0,0 +1,97 @@
+# pages/anomaly_leaderboard.py
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import sys
+import os
+
+# src 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.dataset import get_anomalies, get_cube
+from src.instrument import finish_page, plotly_chart, start_page
+
+start_page("anomaly_leaderboard")
+
+# -------------------------
+# 1. 페이지 설정
+# -------------------------
+st.set_page_config(page_title="Anomaly Leaderboard", layout="wide")
+st.title("🚨 전체 네트워크 이상치 리더보드")
+
+# -------------------------
+# 2. 데이터 불러오기
+# -------------------------
+cube = get_cube()
+anomalies = get_anomalies()
+
+# -------------------------
+# 3. 사용자 필터
+# -------------------------
+st.sidebar.header("필터 옵션")
+
+last_date = cube.dates[-1]
+date_range = st.sidebar.date_input(
+    "기간 선택",
+    value=(last_date - pd.Timedelta(days=30), last_date),
+    min_value=cube.dates[0],
+    max_value=last_date
+)
+selected_centers = st.sidebar.multiselect("센터 선택 (비우면 전체)", options=cube.centers)
+selected_items = st.sidebar.multiselect("품목 선택 (비우면 전체)", options=cube.items)
+holiday_filter = st.sidebar.radio("공휴일 영향", ["전체", "공휴일 이상치만", "일반 이상치만"])
+
+# 기간의 끝 날짜를 아직 고르지 않은 경우 시작일 하루로 조회
+start_date, end_date = (date_range[0], date_range[-1]) if len(date_range) else (last_date, last_date)
+
+# -------------------------
+# 4. 이상치 조회
+# -------------------------
+outliers = anomalies.outliers(
+    start_date, end_date,
+    centers=selected_centers or None,
+    items=selected_items or None,
+)
+if holiday_filter == "공휴일 이상치만":
+    outliers = outliers[outliers["is_holiday_related"]]
+elif holiday_filter == "일반 이상치만":
+    outliers = outliers[~outliers["is_holiday_related"]]
+
+st.markdown(f"""
+### 🧠 기준
+- 요일별 평균/표준편차 기준 `|Z-score| > {anomalies.z_thresh}`
+- 공휴일 **±{anomalies.window_days}일 이내**이면 공휴일 이상치로 분류
+""")
+
+if outliers.empty:
+    st.info("선택한 기간에 이상치가 없습니다.")
+else:
+    # -------------------------
+    # 5. 센터별 이상치 건수
+    # -------------------------
+    counts = outliers.groupby(["center_name", "item"]).size().reset_index(name="count")
+    fig = px.bar(
+        counts, x="center_name", y="count", color="item",
+        title="센터 × 품목별 이상치 건수",
+        labels={"center_name": "센터", "count": "이상치 건수", "item": "품목"}
+    )
+    fig.update_layout(template="plotly_white")
+    plotly_chart(fig, use_container_width=True)
+
+    # -------------------------
+    # 6. 이상치 목록 (|Z| 내림차순)
+    # -------------------------
+    st.markdown(f"### 📋 이상치 목록 ({len(outliers)}건)")
+    display_df = outliers.rename(columns={
+        "date": "날짜",
+        "center_name": "센터",
+        "item": "품목",
+        "value": "물동량",
+        "avg": "요일 평균",
+        "z_score": "Z점수",
+        "holiday_name": "공휴일이름",
+        "is_holiday_related": "공휴일영향여부"
+    })
+    st.dataframe(display_df.round(2), use_container_width=True)
+
+finish_page()
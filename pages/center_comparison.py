@@ -8,9 +8,13 @@ import os
 
 # src 경로 추가 및 로더 불러오기
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.dataset import get_item_columns, get_range_index
+from src.instrument import finish_page, plotly_chart, start_page
+from src.range_index import RANGE_STATS
 from src.visualizer import bar_chart_by_item
 
+start_page("center_comparison")
+
 # -------------------------
 # 1. 페이지 설정
 # -------------------------
@@ -20,36 +24,48 @@ st.title("센터 간 품목별 물동량 비교")
 # -------------------------
 # 2. 데이터 불러오기
 # -------------------------
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
+# 날짜 축 누적합 인덱스: 기간 조회는 이진 탐색 + 누적합 뺄셈으로 계산 (전체 행 스캔 없음)
+range_index = get_range_index()
+item_columns = get_item_columns()
+cube = range_index.cube
+min_date, max_date = cube.dates[0].date(), cube.dates[-1].date()
 
 # -------------------------
 # 3. 사용자 입력 필터
 # -------------------------
 st.sidebar.header("필터 옵션")
 
-# 날짜 선택 (한 날짜만)
-selected_date = st.sidebar.date_input(
-    "날짜 선택",
-    value=df["date"].min(),
-    min_value=df["date"].min(),
-    max_value=df["date"].max()
-)
+# 단일 날짜 또는 기간 선택
+compare_mode = st.sidebar.radio("비교 단위", ["단일 날짜", "기간"])
+if compare_mode == "단일 날짜":
+    selected_date = st.sidebar.date_input(
+        "날짜 선택",
+        value=min_date,
+        min_value=min_date,
+        max_value=max_date
+    )
+    start_date = end_date = selected_date
+    stat = "sum"
+else:
+    selected_range = st.sidebar.date_input(
+        "기간 선택",
+        value=(max(min_date, (cube.dates[-1] - pd.Timedelta(days=29)).date()), max_date),
+        min_value=min_date,
+        max_value=max_date
+    )
+    # 종료일을 고르는 중에는 시작일만 들어옴
+    start_date, end_date = (selected_range[0], selected_range[-1]) if selected_range else (min_date, max_date)
+    stat = st.sidebar.radio("집계 방식", list(RANGE_STATS), format_func=lambda key: RANGE_STATS[key])
 
-# 센터 선택
+# 센터 선택 (센터 순서는 데이터 등장 순서)
 selected_centers = st.sidebar.multiselect(
     "센터 선택",
-    options=df["center_name"].unique().tolist(),
-    default=df["center_name"].unique().tolist()[:5]
+    options=cube.centers,
+    default=cube.centers[:5]
 )
 
 # 품목 선택
-category_columns = df.columns[2:13]
+category_columns = item_columns
 selected_items = st.sidebar.multiselect(
     "품목 선택",
     options=category_columns,
@@ -57,30 +73,43 @@ selected_items = st.sidebar.multiselect(
 )
 
 # -------------------------
-# 4. 필터링
+# 4. 기간 집계
 # -------------------------
-filtered_df = df[
-    (df["date"] == pd.to_datetime(selected_date)) &
-    (df["center_name"].isin(selected_centers))
-]
+# 센터 × 품목 (관측이 없는 센터는 제외)
+stats_df = range_index.range_stats(
+    start_date, end_date, stat, centers=selected_centers, items=selected_items
+).dropna(how="all")
 
 # -------------------------
 # 5. 시각화
 # -------------------------
-st.subheader(f"{selected_date.strftime('%Y-%m-%d')} 기준 센터 간 품목 비교")
+if compare_mode == "단일 날짜":
+    st.subheader(f"{start_date.strftime('%Y-%m-%d')} 기준 센터 간 품목 비교")
+else:
+    st.subheader(
+        f"{start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')} 센터 간 품목 {RANGE_STATS[stat]} 비교"
+    )
+    if stat == "growth":
+        st.caption("바로 앞 같은 길이 기간의 일평균 대비 증감률입니다.")
 
-if filtered_df.empty:
+if stats_df.empty or not selected_items:
     st.warning("조건에 맞는 데이터가 없습니다.")
 else:
+    value_name = "물동량" if stat == "sum" and compare_mode == "단일 날짜" else RANGE_STATS[stat]
     # 긴 포맷으로 변환
-    melted_df = filtered_df.melt(
+    melted_df = stats_df.reset_index().melt(
         id_vars="center_name",
         value_vars=selected_items,
         var_name="품목",
-        value_name="물동량"
+        value_name=value_name
     )
 
     # Plotly barplot
-    fig = bar_chart_by_item(melted_df)
+    fig = bar_chart_by_item(melted_df, value_name, f"센터별 품목 {value_name} 비교")
+
+    plotly_chart(fig, use_container_width=True)
+
+    if compare_mode == "기간":
+        st.dataframe(stats_df.round(2), use_container_width=True)
 
-    st.plotly_chart(fig, use_container_width=True)
+finish_page()
@@ -5,7 +5,10 @@ import os
 
 # src 경로 추가 및 데이터 로더 import
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.dataset import get_item_columns, get_rollups
+from src.instrument import finish_page, start_page
+
+start_page("data_summary")
 
 # -------------------------
 # 1. 페이지 설정
@@ -16,28 +19,35 @@ st.title("📊 물동량 요약 통계 및 다운로드")
 # -------------------------
 # 2. 데이터 로딩
 # -------------------------
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
+rollups = get_rollups()
+item_columns = get_item_columns()
+centers = rollups.cube.centers
+first_date, last_date = rollups.cube.dates[0].date(), rollups.cube.dates[-1].date()
 
 # -------------------------
 # 3. 필터 옵션
 # -------------------------
 st.sidebar.header("필터 옵션")
 
+# 기간 선택 (기본값: 전체 기간)
+date_range = st.sidebar.date_input(
+    "기간 선택",
+    value=(first_date, last_date),
+    min_value=first_date,
+    max_value=last_date
+)
+# 기간의 끝 날짜를 아직 고르지 않은 경우 시작일 하루로 조회
+start_date, end_date = (date_range[0], date_range[-1]) if len(date_range) else (first_date, last_date)
+
 # 센터 선택
 selected_centers = st.sidebar.multiselect(
     "센터 선택",
-    options=df["center_name"].unique().tolist(),
-    default=df["center_name"].unique().tolist()
+    options=centers,
+    default=centers
 )
 
 # 품목 선택
-category_columns = df.columns[2:13]
+category_columns = item_columns
 selected_items = st.sidebar.multiselect(
     "품목 선택",
     options=category_columns,
@@ -45,26 +55,27 @@ selected_items = st.sidebar.multiselect(
 )
 
 # -------------------------
-# 4. 데이터 필터링
+# 4. 요약 통계 계산
 # -------------------------
-filtered_df = df[df["center_name"].isin(selected_centers)]
+# 그룹: 센터 × 품목별 평균/표준편차/최소/최대
+# (기간 양 끝은 일 단위, 사이는 월 단위 롤업 블록을 병합, 원본 행 스캔 없음)
+summary = None
+if selected_centers and selected_items:
+    summary = rollups.query_range(
+        start_date, end_date, by=("center",), stats=["mean", "std", "min", "max"],
+        centers=selected_centers, items=selected_items
+    )
 
-# -------------------------
-# 5. 요약 통계 계산
-# -------------------------
-if filtered_df.empty:
-    st.warning("선택된 센터에 해당하는 데이터가 없습니다.")
+if summary is None or summary.empty:
+    st.warning("선택된 센터/품목에 해당하는 데이터가 없습니다.")
 else:
-    st.subheader("📈 선택된 센터 및 품목의 요약 통계")
-
-    # 그룹: 센터 × 품목별 평균/표준편차/최소/최대
-    summary = filtered_df.groupby("center_name")[selected_items].agg(["mean", "std", "min", "max"])
+    st.subheader(f"📈 선택된 센터 및 품목의 요약 통계 ({start_date} ~ {end_date})")
     summary.columns = ['_'.join(col) for col in summary.columns]  # 다중 컬럼 flatten
 
     st.dataframe(summary.round(2), use_container_width=True)
 
     # -------------------------
-    # 6. CSV 다운로드
+    # 5. CSV 다운로드
     # -------------------------
     csv = summary.to_csv().encode("utf-8-sig")
 
@@ -74,3 +85,5 @@ else:
         file_name="logistics_summary.csv",
         mime="text/csv"
     )
+
+finish_page()
@@ -0,0 +1,149 @@
+import streamlit as st
+import pandas as pd
+import sys
+import os
+
+# src 경로 추가 및 계측/데이터 모듈 import
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src import instrument, result_cache
+from src.dataset import get_store
+
+# -------------------------
+# 1. 페이지 설정 (운영자 전용)
+# -------------------------
+st.set_page_config(page_title="Diagnostics", layout="wide")
+
+if os.environ.get(instrument.DIAGNOSTICS_ENV) != "1" and st.query_params.get("diag") != "1":
+    st.info("진단 페이지는 비활성화되어 있습니다.")
+    st.stop()
+
+st.title("🔬 진단: 구간별 지연 시간 및 캐시 적중률")
+st.caption(
+    f"프로세스 {os.getpid()} 기준 누적 값 · 분위수는 구간별 최근 {instrument.MAX_SAMPLES}회 기록 기준"
+    + ("" if instrument.TRACE_MEMORY else " · 메모리 측정은 SOPO_TRACE_MEMORY=1일 때만 기록")
+)
+
+data = instrument.snapshot()
+
+
+def _span_table(entries: list) -> pd.DataFrame:
+    rows = []
+    for entry in entries:
+        rows.append({
+            "구간": entry["name"],
+            "페이지": entry["labels"].get("page", ""),
+            "구분": ", ".join(f"{k}={v}" for k, v in entry["labels"].items() if k != "page"),
+            "횟수": entry["count"],
+            "p50(ms)": entry["p50"] * 1000,
+            "p95(ms)": entry["p95"] * 1000,
+            "p99(ms)": entry["p99"] * 1000,
+            "최대(ms)": entry["max_s"] * 1000,
+            "누적(s)": entry["total_s"],
+            "메모리 최대(KB)": entry["memory_max_kb"],
+        })
+    return pd.DataFrame(rows)
+
+
+# -------------------------
+# 2. 페이지별 지연 시간
+# -------------------------
+st.subheader("📄 페이지별 실행 시간")
+pages = [entry for entry in data["spans"] if entry["name"] == "page"]
+if pages:
+    st.dataframe(
+        _span_table(pages).drop(columns=["구간", "구분"]).sort_values("p95(ms)", ascending=False).round(1),
+        use_container_width=True, hide_index=True
+    )
+else:
+    st.caption("아직 기록된 페이지 실행이 없습니다.")
+
+# -------------------------
+# 3. 구간별 지연 시간 (로딩, 피처, 학습, 직렬화 등)
+# -------------------------
+st.subheader("⏱️ 구간별 실행 시간")
+stages = [entry for entry in data["spans"] if entry["name"] != "page"]
+if stages:
+    st.dataframe(
+        _span_table(stages).sort_values("누적(s)", ascending=False).round(2),
+        use_container_width=True, hide_index=True
+    )
+
+# -------------------------
+# 4. 캐시 적중률
+# -------------------------
+st.subheader("🗃️ 캐시 적중률")
+if data["caches"]:
+    cache_df = pd.DataFrame([
+        {
+            "캐시": entry["name"],
+            "구분": ", ".join(f"{k}={v}" for k, v in entry["labels"].items()),
+            "적중": entry["hits"],
+            "미스": entry["misses"],
+            "적중률(%)": entry["hit_rate"] * 100,
+            "축출": entry["evictions"],
+        }
+        for entry in data["caches"]
+    ])
+    st.dataframe(cache_df.round(1), use_container_width=True, hide_index=True)
+
+# -------------------------
+# 5. 결과 캐시 (선택값별 계산 결과, 용량 기반 LRU + TTL)
+# -------------------------
+st.subheader("🧺 결과 캐시")
+stats = result_cache.cache_stats()
+if stats:
+    st.dataframe(pd.DataFrame([
+        {
+            "캐시": entry["name"],
+            "항목 수": entry["entries"],
+            "사용(MB)": entry["bytes"] / 1e6,
+            "상한(MB)": entry["max_bytes"] / 1e6,
+            "TTL(s)": entry["ttl_s"],
+            "적중": entry["hits"],
+            "미스": entry["misses"],
+            "적중률(%)": entry["hit_rate"] * 100,
+            "축출": entry["evictions"],
+            "만료": entry["expirations"],
+        }
+        for entry in stats
+    ]).round(2), use_container_width=True, hide_index=True)
+else:
+    st.caption("아직 사용된 결과 캐시가 없습니다.")
+
+# -------------------------
+# 6. 데이터셋 메모리 (dtype 스키마 적용 전/후)
+# -------------------------
+st.subheader("📦 데이터셋 메모리")
+store = get_store()
+report = store.memory_report
+if report is not None:
+    st.dataframe(report.round(2), use_container_width=True, hide_index=True)
+else:
+    st.caption("dtype 스키마가 비활성화되어 있습니다 (SOPO_COMPACT_DTYPES=0).")
+shared_arrays = [
+    store.cube.values, *store.features.arrays.values(), *store.rollups.tables["day"].arrays.values(),
+    store.range_index.sums, store.range_index.counts,
+]
+cube_mb = sum(array.nbytes for array in shared_arrays) / 1e6
+if store.shared_dir:
+    st.caption(f"배열 저장소/피처/일 롤업/기간 누적합 {cube_mb:,.1f}MB를 공유 스냅샷에서 읽기 전용으로 매핑 중: `{store.shared_dir}`")
+else:
+    st.caption(f"배열 저장소/피처/일 롤업/기간 누적합 {cube_mb:,.1f}MB를 프로세스 전용 메모리에 보관 중 (공유: SOPO_SHARED_ARRAYS=1)")
+
+# -------------------------
+# 7. 내보내기 / 초기화
+# -------------------------
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.download_button("⬇️ JSON", instrument.to_json(), file_name="sopo_metrics.json", mime="application/json")
+with col2:
+    st.download_button("⬇️ Prometheus", instrument.to_prometheus(), file_name="sopo_metrics.prom", mime="text/plain")
+with col3:
+    if st.button("🧹 기록 초기화"):
+        instrument.reset()
+        result_cache.clear_all()
+        st.rerun()
+
+port = os.environ.get(instrument.METRICS_PORT_ENV)
+if port:
+    st.caption(f"Prometheus 수집 주소: http://<host>:{port}/metrics (JSON: /metrics.json)")
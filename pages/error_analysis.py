@@ -2,87 +2,85 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from lightgbm import LGBMRegressor
-from sklearn.metrics import root_mean_squared_error, r2_score
 from scipy.stats import zscore
-import holidays
 import sys
 import os
 
 # src 경로 추가 및 데이터 로더 import
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.batch import MODEL_LABELS
+from src.dataset import get_backtest_results, get_calendar, get_features, get_holdout_forecast
+from src.instrument import finish_page, start_page
 
-# 데이터 로딩
-DATA_PATH = "data/logistics_by_center.csv"
+start_page("error_analysis")
 
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
+# 데이터 로딩
+features = get_features()
 
-df = load_data()
+calendar = get_calendar()
+backtest = get_backtest_results()
 
-kr_holidays = holidays.KR()
-period_days = 14
+period_days = st.sidebar.selectbox("예측 기간 (일)", [7, 14, 30], index=1)
+model_kind = "lgbm"
+if backtest is not None:
+    model_kind = st.sidebar.selectbox(
+        "모델", backtest.manifest["models"], format_func=lambda kind: MODEL_LABELS[kind]
+    )
 
 # 평가 결과 저장 리스트
 error_analysis_results = []
 
 # 고정 품목 & 센터 리스트
-centers = df["center_name"].unique()
-items = df.columns[2:]
+centers = features.cube.centers
+items = features.cube.items
 
 # 전체 성능 저장
 performance = []
 
-# 모든 센터 × 품목 조합 순회
-for center in centers:
-    for item in items:
-        try:
-            target_df = df[df["center_name"] == center][["date", item]].copy()
-            target_df = target_df.rename(columns={"date": "ds", item: "y"})
-
-            # 특징 생성
-            target_df["is_holiday"] = target_df["ds"].isin(kr_holidays).astype(int)
-            target_df["dow"] = target_df["ds"].dt.dayofweek
-            target_df["lag_1"] = target_df["y"].shift(1)
-            target_df["lag_7"] = target_df["y"].shift(7)
-            target_df["rolling_mean_7"] = target_df["y"].rolling(7).mean()
-            target_df = target_df.dropna().reset_index(drop=True)
-
-            if len(target_df) <= period_days:
+if backtest is not None and backtest.has(model_kind, period_days):
+    # 배치 작업이 저장한 평가 구간 예측을 사용 (실시간 재학습 없음)
+    st.caption(f"배치 결과 생성: {backtest.manifest['generated_at']} · 모델: {MODEL_LABELS[model_kind]}")
+    metrics = backtest.series_metrics(model_kind, period_days).set_index(["센터", "품목"])
+    predictions = backtest.series_predictions(model_kind, period_days)
+    for (center, item), group in predictions.groupby(["센터", "품목"], sort=False):
+        performance.append({
+            "center": center,
+            "item": item,
+            "rmse": metrics.loc[(center, item), "RMSE"],
+            "r2": metrics.loc[(center, item), "R2"],
+            "y_true": group["y"].to_numpy(),
+            "y_pred": group["yhat"].to_numpy(),
+            "dates": group["ds"].to_numpy()
+        })
+elif model_kind != "lgbm":
+    st.warning(
+        f"저장된 결과에 {MODEL_LABELS[model_kind]} {period_days}일 백테스트가 없습니다. "
+        "`python -m src.batch backtest`를 실행하세요."
+    )
+    st.stop()
+
+# 저장된 결과가 없으면 모든 센터 × 품목 조합을 실시간으로 학습
+if not performance:
+    for center in centers:
+        for item in items:
+            try:
+                # 공유 피처 행렬에서 잘라 마지막 period_days일 예측 (데이터 부족 시 ValueError)
+                result = get_holdout_forecast("lgbm", center, item, period_days)
+                metrics = result.metrics()
+
+                performance.append({
+                    "center": center,
+                    "item": item,
+                    "rmse": metrics["RMSE"],
+                    "r2": metrics["R2"],
+                    "y_true": result.y_true,
+                    "y_pred": result.y_pred,
+                    "dates": result.test["ds"].values
+                })
+
+            except Exception:
                 continue
 
-            train_df = target_df.iloc[:-period_days].copy().reset_index(drop=True)
-            test_df = target_df.iloc[-period_days:].copy().reset_index(drop=True)
-
-            features = ["lag_1", "lag_7", "rolling_mean_7", "dow", "is_holiday"]
-            X_train = train_df[features]
-            y_train = train_df["y"]
-            X_test = test_df[features]
-            y_test = test_df["y"]
-
-            model = LGBMRegressor(random_state=42)
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-            y_pred = np.where(y_pred < 0, 0, y_pred)
-
-            rmse = root_mean_squared_error(y_test, y_pred)
-            r2 = r2_score(y_test, y_pred)
-
-            performance.append({
-                "center": center,
-                "item": item,
-                "rmse": rmse,
-                "r2": r2,
-                "y_true": y_test.values,
-                "y_pred": y_pred,
-                "dates": test_df["ds"].values
-            })
-
-        except Exception:
-            continue
-
 # RMSE 기준 하위 10개 선택
 sorted_perf = sorted(performance, key=lambda x: x["rmse"], reverse=True)[:10]
 
@@ -95,7 +93,7 @@ for entry in sorted_perf:
     reasons = []
 
     # 1. 공휴일 영향
-    if any(d in kr_holidays for d in dates):
+    if calendar.lookup(dates, "is_holiday").any():
         reasons.append("공휴일 포함")
 
     # 2. 급등/급락
@@ -127,4 +125,6 @@ for entry in sorted_perf:
 result_df = pd.DataFrame(error_analysis_results).sort_values(by="RMSE", ascending=False).reset_index(drop=True)
 
 st.subheader("예측 오차 원인 분석 결과")
-st.dataframe(result_df)
\ No newline at end of file
+st.dataframe(result_df)
+
+finish_page()
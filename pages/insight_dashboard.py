@@ -3,36 +3,28 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import holidays
 import streamlit as st
 import sys
 import os
 
 # src 경로 추가 및 데이터 로더 import
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.dataset import get_calendar, get_rollups
+from src.instrument import finish_page, plotly_chart, start_page
+from src.store import festival_week_flags
 
-# 데이터 로딩
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
+start_page("insight_dashboard")
 
-# 🗓️ 날짜 파생 컬럼
-kr_holidays = holidays.KR()
-df["is_holiday"] = df["date"].isin(kr_holidays)
-df["year"] = df["date"].dt.year
-df["month"] = df["date"].dt.month
-df["dow"] = df["date"].dt.dayofweek
-df["year_month"] = df["date"].dt.to_period("M").astype(str)
+# 데이터 로딩
+rollups = get_rollups()
+calendar = get_calendar()
 
-item_columns = df.columns[2:13]
+# 🧮 모든 집계는 미리 만들어 둔 일/월/연 × 센터 × 품목 롤업에서 조회합니다
+#     (원본 행 groupby 없음, 데이터가 추가되면 롤업이 증분 갱신됨).
+days = rollups.periods("day")["start"]
 
 # 📌 1. 품목 평균 비중 (Pie Chart)
-mean_by_item = df[item_columns].mean()
+mean_by_item = rollups.query("year", stats="mean")
 pie_df = pd.DataFrame({"item": mean_by_item.index, "avg_volume": mean_by_item.values})
 fig_pie = px.pie(
     pie_df.sort_values("avg_volume", ascending=False),
@@ -41,7 +33,8 @@ fig_pie = px.pie(
 )
 
 # 📊 2. 요일별 평균 물동량 (Line Chart)
-weekday_avg = df.groupby("dow")[item_columns].mean().T
+dow = pd.Series(days.dt.dayofweek.to_numpy(), name="dow")
+weekday_avg = rollups.query("day", by=("period",), stats="mean", period_key=dow).T
 weekday_avg.columns = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 weekday_colors = px.colors.qualitative.Set3
 fig_weekday = go.Figure()
@@ -59,7 +52,7 @@ fig_weekday.update_layout(
 )
 
 # 📉 3. 요일 변동성 표준편차
-weekday_std = df.groupby("dow")[item_columns].std().T.mean(axis=1)
+weekday_std = rollups.query("day", by=("period",), stats="std", period_key=dow).T.mean(axis=1)
 std_df = pd.DataFrame({"item": weekday_std.index, "std_dev": weekday_std.values})
 fig_std = px.bar(
     std_df.sort_values("std_dev", ascending=False),
@@ -69,10 +62,10 @@ fig_std = px.bar(
 )
 
 # 🎎 4. 명절 주간 vs 일반 주간 (food)
-df["is_festival_week"] = df["date"].apply(
-    lambda d: any([(d - pd.Timedelta(days=i)) in kr_holidays for i in range(3)])
-)
-festival_vs_normal = df.groupby("is_festival_week")[["food"]].mean().reset_index()
+is_festival_week = pd.Series(festival_week_flags(calendar, days), name="is_festival_week")
+festival_vs_normal = rollups.query(
+    "day", by=("period",), items=["food"], stats="mean", period_key=is_festival_week
+).reset_index()
 festival_vs_normal["label"] = festival_vs_normal["is_festival_week"].map({True: "명절 주간", False: "일반 주간"})
 fig_festival = px.bar(
     festival_vs_normal, x="label", y="food",
@@ -81,7 +74,7 @@ fig_festival = px.bar(
 )
 
 # 🏢 5. 센터별 누적 물동량 상위 10
-center_total = df.groupby("center_name")[item_columns].sum().sum(axis=1).sort_values(ascending=False).head(10)
+center_total = rollups.query("year", by=("center",), stats="sum").sum(axis=1).sort_values(ascending=False).head(10)
 center_df = pd.DataFrame({"center": center_total.index, "total_volume": center_total.values})
 fig_center = px.bar(
     center_df, x="center", y="total_volume",
@@ -90,7 +83,7 @@ fig_center = px.bar(
 )
 
 # 📈 6. 월별 물동량 추이
-monthly_total = df.groupby("year_month")[item_columns].sum().sum(axis=1).reset_index()
+monthly_total = rollups.query("month", by=("period",), stats="sum").sum(axis=1).reset_index()
 monthly_total.columns = ["year_month", "total_volume"]
 fig_monthly = px.line(
     monthly_total, x="year_month", y="total_volume",
@@ -104,19 +97,21 @@ st.title("📦 생활물류 통계 인사이트 대시보드")
 # ▶️ 2열 배치 (품목 비중 / 센터 누적)
 col1, col2 = st.columns(2)
 with col1:
-    st.plotly_chart(fig_pie, use_container_width=True)
+    plotly_chart(fig_pie, use_container_width=True)
 with col2:
-    st.plotly_chart(fig_center, use_container_width=True)
+    plotly_chart(fig_center, use_container_width=True)
 
 # ▶️ 단일 차트 (요일 추이)
-st.plotly_chart(fig_weekday, use_container_width=True)
+plotly_chart(fig_weekday, use_container_width=True)
 
 # ▶️ 2열 배치 (표준편차 / 명절비교)
 col3, col4 = st.columns(2)
 with col3:
-    st.plotly_chart(fig_std, use_container_width=True)
+    plotly_chart(fig_std, use_container_width=True)
 with col4:
-    st.plotly_chart(fig_festival, use_container_width=True)
+    plotly_chart(fig_festival, use_container_width=True)
 
 # ▶️ 단일 차트 (월별 추이)
-st.plotly_chart(fig_monthly, use_container_width=True)
\ No newline at end of file
+plotly_chart(fig_monthly, use_container_width=True)
+
+finish_page()
@@ -10,8 +10,11 @@ import os
 
 # src 경로 추가 및 데이터 로더 import
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
-from src.visualizer import line_chart_by_center
+from src.dataset import cached_result, get_dataset, get_item_columns
+from src.instrument import finish_page, plotly_chart, start_page
+from src.visualizer import DEFAULT_POINT_BUDGET, DOWNSAMPLE_METHODS, line_chart_by_center
+
+start_page("item_trend")
 
 # -------------------------
 # 0. 한글 폰트 설정 (맑은 고딕)
@@ -28,47 +31,63 @@ st.title("품목별 물동량 추이")
 # -------------------------
 # 2. 데이터 불러오기
 # -------------------------
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
+df = get_dataset()
+item_columns = get_item_columns()
 
 # -------------------------
 # 3. 필터 구성
 # -------------------------
 st.sidebar.header("필터 옵션")
 
-# (1) 연도 또는 연-월 선택
-df['year'] = df['date'].dt.year
-df['year_month'] = df['date'].dt.to_period("M").astype(str)  # 예: "2018-01"
+# (1) 연도 또는 연-월 선택 (year, year_month 예: "2018-01")
 
 mode = st.sidebar.radio("필터 기준", ["연도별", "연-월별"])
 
 if mode == "연도별":
-    selected_years = st.sidebar.multiselect("연도 선택", sorted(df['year'].unique()), default=[2018])
-    df = df[df['year'].isin(selected_years)]
+    period_column = "year"
+    selected_periods = st.sidebar.multiselect("연도 선택", sorted(df['year'].unique()), default=[2018])
 else:
-    selected_ym = st.sidebar.multiselect("연-월 선택", sorted(df['year_month'].unique()), default=[df['year_month'].iloc[0]])
-    df = df[df['year_month'].isin(selected_ym)]
+    period_column = "year_month"
+    selected_periods = st.sidebar.multiselect("연-월 선택", sorted(df['year_month'].unique()), default=[df['year_month'].iloc[0]])
+period_df = df[df[period_column].isin(selected_periods)]
 
 # (2) 센터 선택
 selected_centers = st.sidebar.multiselect(
     "센터 선택",
-    options=df["center_name"].unique().tolist(),
-    default=df["center_name"].unique().tolist()[:3]
+    options=period_df["center_name"].unique().tolist(),
+    default=period_df["center_name"].unique().tolist()[:3]
 )
 
 # (3) 품목 선택
-category_columns = df.columns[2:13]  # 정확한 범위로 품목만 선택
+category_columns = item_columns
 selected_item = st.sidebar.selectbox("품목 선택", options=category_columns)
 
+# (4) 차트 해상도: 센터별 최대 점 수 (긴 기간은 모양/봉우리를 보존하며 다운샘플링)
+with st.sidebar.expander("차트 해상도"):
+    point_budget = st.number_input(
+        "센터별 최대 점 수", min_value=100, max_value=20000, value=DEFAULT_POINT_BUDGET, step=100
+    )
+    downsample_method = st.radio(
+        "다운샘플링 방식", DOWNSAMPLE_METHODS,
+        format_func=lambda m: "LTTB (모양 보존)" if m == "lttb" else "Min-Max (봉우리 보존)"
+    )
+
 # -------------------------
-# 4. 데이터 필터링
+# 4. 데이터 필터링 + 피벗 (결과 캐시: 같은 데이터 버전 × 선택이면 다시 계산하지 않음)
 # -------------------------
-filtered_df = df[df["center_name"].isin(selected_centers)]
+def center_pivot(period_column: str, periods: list, centers: list, item: str) -> pd.DataFrame:
+    # 캐시 키의 데이터 버전보다 먼저 가져온 df를 쓰지 않도록 계산 시점에 다시 가져옴
+    data = get_dataset()
+    filtered_df = data[data[period_column].isin(periods) & data["center_name"].isin(centers)]
+    if filtered_df.empty:
+        return pd.DataFrame()
+    # center_name은 category이므로 선택하지 않은 센터가 빈 컬럼으로 생기지 않도록 observed=True
+    return filtered_df.pivot_table(index="date", columns="center_name", values=item, observed=True)
+
+
+pivot_df = cached_result(
+    "item_trend_pivot", center_pivot, period_column, selected_periods, selected_centers, selected_item
+)
 
 
 # -------------------------
@@ -78,18 +97,19 @@ import plotly.graph_objects as go
 
 st.subheader(f"{selected_item} 일별 추이 (센터별 비교)")
 
-if filtered_df.empty:
+if pivot_df.empty:
     st.warning("해당 조건에 맞는 데이터가 없습니다.")
 else:
-    pivot_df = filtered_df.pivot_table(index="date", columns="center_name", values=selected_item)
-
     # Plotly figure 생성
-    fig = line_chart_by_center(pivot_df, selected_item)
+    fig = line_chart_by_center(pivot_df, selected_item, int(point_budget), downsample_method)
     
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
+
+
 
 
 
+finish_page()
 
 
 # # -------------------------
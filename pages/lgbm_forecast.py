@@ -2,18 +2,20 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-from sklearn.metrics import mean_absolute_error, root_mean_squared_error, r2_score
-from sklearn.model_selection import train_test_split
-from lightgbm import LGBMRegressor
-import holidays
 import sys
 import os
 
 # src 경로 추가 및 로더 불러오기
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.dataset import (
+    get_dataset, get_global_model, get_holdout_forecast, get_item_columns, get_model_registry,
+)
+from src.future_view import render_future_forecast
+from src.instrument import finish_page, plotly_chart, start_page
+from src.metrics import regression_metrics
+
+start_page("lgbm_forecast")
 
 # -------------------------
 # 1. 페이지 설정
@@ -24,70 +26,36 @@ st.title("🔍 LightGBM 기반 물동량 예측")
 # -------------------------
 # 2. 데이터 로딩
 # -------------------------
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
+df = get_dataset()
+item_columns = get_item_columns()
 
 # -------------------------
 # 3. 사용자 필터
 # -------------------------
 st.sidebar.header("예측 조건")
-center = st.sidebar.selectbox("센터 선택", df["center_name"].unique())
-item = st.sidebar.selectbox("품목 선택", df.columns[2:13])
+center = st.sidebar.selectbox("센터 선택", df["center_name"].unique().tolist())
+item = st.sidebar.selectbox("품목 선택", item_columns)
 period_days = st.sidebar.selectbox("예측 기간 (일)", [7, 14, 30], index=1)
+show_global = st.sidebar.checkbox("글로벌 모델 예측 함께 보기", value=False)
+show_future = st.sidebar.checkbox("미래 예측 보기 (마지막 관측일 이후)", value=False)
 
 # -------------------------
-# 4. 피처 생성
-# -------------------------
-target_df = df[df["center_name"] == center][["date", item]].copy()
-target_df = target_df.rename(columns={"date": "ds", item: "y"})
-
-# 시계열 피처
-target_df["lag_1"] = target_df["y"].shift(1)
-target_df["lag_7"] = target_df["y"].shift(7)
-target_df["rolling_mean_7"] = target_df["y"].rolling(7).mean()
-
-# 날짜 피처
-target_df["dow"] = target_df["ds"].dt.dayofweek
-kr_holidays = holidays.KR(years=target_df["ds"].dt.year.unique())
-target_df["is_holiday"] = target_df["ds"].isin(kr_holidays).astype(int)
-
-# 결측 제거
-target_df = target_df.dropna()
-
-# -------------------------
-# 5. 학습/예측 데이터 분리
+# 4. 모델 학습 및 예측
 # -------------------------
-train_df = target_df.iloc[:-period_days]
-test_df = target_df.iloc[-period_days:]
-
-feature_cols = ["lag_1", "lag_7", "rolling_mean_7", "dow", "is_holiday"]
-
-X_train = train_df[feature_cols]
-y_train = train_df["y"]
-X_test = test_df[feature_cols]
+# 공유 피처 행렬에서 시계열(lag_1, lag_7, rolling_mean_7, dow, is_holiday, 결측 제거 완료)을
+# 잘라 마지막 period_days일을 평가 구간으로 사용하고,
+# 같은 센터/품목/기간/파라미터/데이터 조합은 저장된 모델을 재사용 (예측값 음수는 0으로 보정됨),
+# 예측 결과 자체도 결과 캐시에 보관해 같은 선택으로 다시 실행하면 재계산하지 않음
+result = get_holdout_forecast("lgbm", center, item, period_days, registry=get_model_registry())
+test_df = result.test
 y_test = test_df["y"]
+y_pred = result.y_pred
 
 # -------------------------
-# 6. 모델 학습 및 예측
+# 5. 평가 지표
 # -------------------------
-model = LGBMRegressor(random_state=42)
-model.fit(X_train, y_train)
-y_pred = model.predict(X_test)
-
-# ⛔ 예측값 보정 (음수 제거)
-y_pred = np.where(y_pred < 0, 0, y_pred)
-
-# -------------------------
-# 7. 평가 지표
-# -------------------------
-mae = mean_absolute_error(y_test, y_pred)
-rmse = root_mean_squared_error(y_test, y_pred)
-r2 = r2_score(y_test, y_pred)
+metrics = result.metrics()
+mae, rmse, r2 = metrics["MAE"], metrics["RMSE"], metrics["R2"]
 
 st.markdown(f"""
 ### 🧪 예측 성능 평가 (LightGBM)
@@ -96,8 +64,22 @@ st.markdown(f"""
 - **R² Score**: `{r2:.3f}`
 """)
 
+# 글로벌 모델(전체 센터 × 품목 단일 학습)의 같은 구간 예측
+if show_global:
+    global_pred = test_df[["ds"]].merge(
+        get_global_model(period_days).series_holdout(center, item)[["ds", "yhat"]],
+        how="left", on="ds"
+    )["yhat"].values
+    global_metrics = regression_metrics(y_test.values, global_pred)
+    st.markdown(f"""
+### 🌐 글로벌 모델 성능
+- **MAE**: `{global_metrics["MAE"]:.2f}`
+- **RMSE**: `{global_metrics["RMSE"]:.2f}`
+- **R² Score**: `{global_metrics["R2"]:.3f}`
+""")
+
 # -------------------------
-# 8. 시각화
+# 6. 시각화
 # -------------------------
 st.subheader(f"{center} - {item} 예측 결과 비교")
 
@@ -119,6 +101,15 @@ fig.add_trace(go.Scatter(
     line=dict(color="green")
 ))
 
+if show_global:
+    fig.add_trace(go.Scatter(
+        x=test_df["ds"],
+        y=global_pred,
+        mode="lines+markers",
+        name="글로벌 모델 예측값",
+        line=dict(color="orange", dash="dot")
+    ))
+
 fig.update_layout(
     xaxis_title="날짜",
     yaxis_title="물동량",
@@ -127,10 +118,10 @@ fig.update_layout(
     legend_title="구분"
 )
 
-st.plotly_chart(fig, use_container_width=True)
+plotly_chart(fig, use_container_width=True)
 
 # -------------------------
-# 9. 예측 결과 테이블
+# 7. 예측 결과 테이블
 # -------------------------
 st.markdown("### 📋 예측 결과 테이블")
 
@@ -139,5 +130,16 @@ result_df = pd.DataFrame({
     "실제값": y_test.values,
     "예측값": y_pred
 })
+if show_global:
+    result_df["글로벌 모델 예측값"] = global_pred
 
 st.dataframe(result_df.set_index("날짜").round(2), use_container_width=True)
+
+# -------------------------
+# 8. 미래 예측 (마지막 관측일 이후)
+# -------------------------
+# 위 결과는 평가 구간(백테스트), 여기서는 실제값이 없는 다음 period_days일 (src/future_view.py)
+if show_future:
+    render_future_forecast(center, item, period_days)
+
+finish_page()
@@ -1,17 +1,24 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from prophet import Prophet
-from lightgbm import LGBMRegressor
-from sklearn.metrics import mean_absolute_error, root_mean_squared_error, r2_score
 import plotly.graph_objects as go
-import holidays
 import sys
 import os
 
 # 경로 설정
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.dataset import (
+    get_dataset, get_global_model, get_holdout_forecast, get_item_columns, get_model_registry,
+    get_rolling_backtest,
+)
+from src.backtest import BACKTEST_MODELS
+from src.features import FEATURE_COLUMNS
+from src.forecasters import available_forecasters, forecaster_label
+from src.future_view import render_future_forecast
+from src.instrument import finish_page, plotly_chart, start_page
+from src.metrics import regression_metrics
+
+start_page("model_comparison")
 
 # -------------------------------
 # 1. 페이지 설정
@@ -22,93 +29,69 @@ st.title("📊 Prophet vs LightGBM 예측 성능 비교")
 # -------------------------------
 # 2. 데이터 로딩
 # -------------------------------
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
+df = get_dataset()
+item_columns = get_item_columns()
 
 # -------------------------------
 # 3. 사용자 입력
 # -------------------------------
 st.sidebar.header("예측 조건 선택")
-center = st.sidebar.selectbox("센터", df["center_name"].unique())
-item = st.sidebar.selectbox("품목", df.columns[2:13])
+center = st.sidebar.selectbox("센터", df["center_name"].unique().tolist())
+item = st.sidebar.selectbox("품목", item_columns)
 period_days = st.sidebar.selectbox("예측 기간 (일)", [7, 14, 30], index=1)
-
-# -------------------------------
-# 4. 데이터 전처리
-# -------------------------------
-target_df = df[df["center_name"] == center][["date", item]].copy()
-target_df = target_df.rename(columns={"date": "ds", item: "y"})
-target_df["is_holiday"] = target_df["ds"].isin(
-    holidays.KR(years=target_df["ds"].dt.year.unique())
-).astype(int)
-target_df["dow"] = target_df["ds"].dt.dayofweek
-target_df["lag_1"] = target_df["y"].shift(1)
-target_df["lag_7"] = target_df["y"].shift(7)
-target_df["rolling_mean_7"] = target_df["y"].rolling(7).mean()
-target_df = target_df.dropna().reset_index(drop=True)
-
-# 학습/테스트 분리
-train_df = target_df.iloc[:-period_days].copy().reset_index(drop=True)
-test_df = target_df.iloc[-period_days:].copy().reset_index(drop=True)
-
-# -------------------------------
-# 5. Prophet 모델 학습
-# -------------------------------
-prophet = Prophet(
-    weekly_seasonality=False,
-    yearly_seasonality=True,
-    daily_seasonality=False
+# 설치된 패키지로 실행할 수 있는 모델만 표시 (기준선 모델은 항상 사용 가능)
+model_options = available_forecasters(installed_only=True)
+selected_models = st.sidebar.multiselect(
+    "비교 모델",
+    options=model_options,
+    default=[name for name in ["prophet", "lgbm"] if name in model_options],
+    format_func=forecaster_label
 )
-prophet.add_regressor("is_holiday")
-prophet.add_regressor("dow")
-prophet.add_regressor("lag_1")
-prophet.fit(train_df)
-
-future = test_df[["ds", "is_holiday", "dow", "lag_1"]]
-forecast = prophet.predict(future)
-forecast["yhat"] = forecast["yhat"].apply(lambda x: max(x, 0))  # 음수 제거
-
-# -------------------------------
-# 6. LightGBM 모델 학습
-# -------------------------------
-features = ["lag_1", "lag_7", "rolling_mean_7", "dow", "is_holiday"]
-X_train = train_df[features]
-y_train = train_df["y"]
-X_test = test_df[features]
+show_global = st.sidebar.checkbox("글로벌 LightGBM 포함", value=False)
+show_rolling = st.sidebar.checkbox("롤링 백테스트 (다중 폴드)", value=False)
+if show_rolling:
+    n_folds = st.sidebar.slider("폴드 수", min_value=2, max_value=8, value=4)
+show_future = st.sidebar.checkbox("미래 예측 보기 (마지막 관측일 이후)", value=False)
+
+# -------------------------------
+# 4. 모델별 학습 및 예측
+# -------------------------------
+# 모든 모델의 학습 구간이 같도록 전체 피처 기준으로 결측을 제거 (피처 목록은 모델 키에 포함),
+# 저장된 모델은 재사용하고 지표 비교만 하므로 예측 구간 시뮬레이션은 생략 (음수는 0으로 보정됨)
+registry = get_model_registry()
+results = {
+    name: get_holdout_forecast(
+        name, center, item, period_days, registry=registry, columns=FEATURE_COLUMNS
+    )
+    for name in selected_models
+}
+if not results:
+    st.info("비교할 모델을 선택하세요.")
+    st.stop()
+test_df = next(iter(results.values())).test
 y_test = test_df["y"]
 
-lgbm = LGBMRegressor(random_state=42)
-lgbm.fit(X_train, y_train)
-lgbm_pred = lgbm.predict(X_test)
-lgbm_pred = np.where(lgbm_pred < 0, 0, lgbm_pred)  # 음수 제거
+# 글로벌 모델 (전체 센터 × 품목 단일 학습)의 같은 구간 예측
+if show_global:
+    global_pred = test_df[["ds"]].merge(
+        get_global_model(period_days).series_holdout(center, item)[["ds", "yhat"]],
+        how="left", on="ds"
+    )["yhat"].values
 
 # -------------------------------
-# 7. 성능 평가 함수
-# -------------------------------
-def evaluate(y_true, y_pred):
-    return {
-        "MAE": mean_absolute_error(y_true, y_pred),
-        "RMSE": root_mean_squared_error(y_true, y_pred),
-        "R2": r2_score(y_true, y_pred)
-    }
-
-prophet_metrics = evaluate(y_test, forecast["yhat"])
-lgbm_metrics = evaluate(y_test, lgbm_pred)
-
-# -------------------------------
-# 8. 성능 지표 출력
+# 5. 성능 지표 출력
 # -------------------------------
 st.markdown("### 🧪 성능 지표 비교")
-metrics_df = pd.DataFrame([prophet_metrics, lgbm_metrics], index=["Prophet", "LightGBM"])
+metrics_df = pd.DataFrame(
+    [result.metrics() for result in results.values()],
+    index=[forecaster_label(name) for name in results]
+)
+if show_global:
+    metrics_df.loc["Global LightGBM"] = regression_metrics(y_test.values, global_pred)
 st.dataframe(metrics_df.style.format("{:.3f}"), use_container_width=True)
 
 # -------------------------------
-# 9. 예측 결과 시각화
+# 6. 예측 결과 시각화
 # -------------------------------
 st.markdown("### 📈 예측 결과 시각화")
 
@@ -121,20 +104,24 @@ fig.add_trace(go.Scatter(
     name="실제값",
     line=dict(color="black")
 ))
-fig.add_trace(go.Scatter(
-    x=test_df["ds"],
-    y=forecast["yhat"],
-    mode="lines+markers",
-    name="Prophet 예측",
-    line=dict(color="blue")
-))
-fig.add_trace(go.Scatter(
-    x=test_df["ds"],
-    y=lgbm_pred,
-    mode="lines+markers",
-    name="LightGBM 예측",
-    line=dict(color="green")
-))
+# 기존 두 모델은 색을 고정하고, 기준선 등 나머지 모델은 Plotly 기본 색 사용
+model_colors = {"prophet": "blue", "lgbm": "green"}
+for name, result in results.items():
+    fig.add_trace(go.Scatter(
+        x=test_df["ds"],
+        y=result.y_pred,
+        mode="lines+markers",
+        name=f"{forecaster_label(name)} 예측",
+        line=dict(color=model_colors.get(name))
+    ))
+if show_global:
+    fig.add_trace(go.Scatter(
+        x=test_df["ds"],
+        y=global_pred,
+        mode="lines+markers",
+        name="Global LightGBM 예측",
+        line=dict(color="orange", dash="dot")
+    ))
 
 fig.update_layout(
     xaxis_title="날짜",
@@ -144,16 +131,77 @@ fig.update_layout(
     hovermode="x unified"
 )
 
-st.plotly_chart(fig, use_container_width=True)
+plotly_chart(fig, use_container_width=True)
 
 # -------------------------------
-# 10. 예측 결과 테이블
+# 7. 예측 결과 테이블
 # -------------------------------
 st.markdown("### 📋 예측 결과 테이블")
 result_df = pd.DataFrame({
     "날짜": test_df["ds"],
     "실제값": y_test,
-    "Prophet 예측": forecast["yhat"],
-    "LightGBM 예측": lgbm_pred
+    **{f"{forecaster_label(name)} 예측": result.y_pred for name, result in results.items()}
 })
+if show_global:
+    result_df["Global LightGBM 예측"] = global_pred
 st.dataframe(result_df.set_index("날짜").round(2), use_container_width=True)
+
+# -------------------------------
+# 8. 롤링 백테스트 (다중 폴드)
+# -------------------------------
+# 단일 평가 구간은 우연에 따라 순위가 바뀌므로, 예측 시작점을 period_days씩 당긴 여러 폴드로 비교
+if show_rolling:
+    st.markdown("### 📆 롤링 백테스트 (다중 폴드)")
+    rolling_kinds = [name for name in selected_models if name in BACKTEST_MODELS]
+    rolling_kinds += [kind for kind in (["global"] if show_global else []) + ["seasonal_naive"] if kind not in rolling_kinds]
+
+    fold_tables = []
+    summary_rows = []
+    for kind in rolling_kinds:
+        # 글로벌/기준선은 전체 시리즈 결과(캐시)를 공유하고, 개별 모델은 이 시리즈만 학습
+        series = None if kind in ("global", "seasonal_naive") else [(center, item)]
+        report = get_rolling_backtest(period_days, n_folds, kind=kind, series=series)
+        folds = report.series_folds(center, item)
+        if folds.empty:
+            continue
+        # (폴드 × 날짜) 배열로 펼쳐 폴드별 지표를 한 번에 계산 (다른 폴드의 날짜는 NaN)
+        y_by_fold = folds.pivot(index="ds", columns="fold", values="y")
+        yhat_by_fold = folds.pivot(index="ds", columns="fold", values="yhat")
+        fold_metrics = regression_metrics(y_by_fold.to_numpy().T, yhat_by_fold.to_numpy().T)
+        fold_tables.append(pd.DataFrame({
+            "모델": BACKTEST_MODELS[kind],
+            "폴드": y_by_fold.columns,
+            "MAE": fold_metrics["MAE"],
+            "RMSE": fold_metrics["RMSE"],
+            "R2": fold_metrics["R2"],
+        }))
+        summary_rows.append({
+            "모델": BACKTEST_MODELS[kind],
+            **regression_metrics(folds["y"].to_numpy(), folds["yhat"].to_numpy()),
+            "RMSE 편차": np.nanstd(fold_metrics["RMSE"]),
+        })
+
+    if summary_rows:
+        st.markdown("#### 전체 폴드 종합")
+        st.dataframe(
+            pd.DataFrame(summary_rows).set_index("모델").style.format("{:.3f}"),
+            use_container_width=True
+        )
+        st.markdown("#### 폴드별 성능")
+        st.dataframe(
+            pd.concat(fold_tables, ignore_index=True).style.format(
+                {"MAE": "{:.2f}", "RMSE": "{:.2f}", "R2": "{:.3f}"}
+            ),
+            use_container_width=True, hide_index=True
+        )
+    else:
+        st.warning("폴드를 구성할 수 있는 데이터가 부족합니다.")
+
+# -------------------------------
+# 9. 미래 예측 (마지막 관측일 이후)
+# -------------------------------
+# 위 결과는 평가 구간(백테스트), 여기서는 실제값이 없는 다음 period_days일 (src/future_view.py)
+if show_future:
+    render_future_forecast(center, item, period_days)
+
+finish_page()
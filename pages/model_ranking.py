@@ -1,98 +1,109 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from lightgbm import LGBMRegressor
-from sklearn.metrics import mean_absolute_error, root_mean_squared_error, r2_score
-import holidays
 import sys
 import os
 
 # 경로 설정
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.backtest import BACKTEST_MODELS, WINDOWS
+from src.batch import MODEL_LABELS
+from src.dataset import get_backtest_results, get_features, get_global_model, get_rolling_backtest
+from src.instrument import finish_page, start_page
+from src.sweep import make_holdout_tasks, resolve_workers, run_sweep
+
+start_page("model_ranking")
 
 # -------------------------------
 # 1. 페이지 기본 설정
 # -------------------------------
 st.set_page_config(page_title="모델 성능 순위", layout="wide")
-st.title("📊 LightGBM 예측 성능 순위 (센터 × 품목)")
+st.title("📊 예측 성능 순위 (센터 × 품목)")
 
 # -------------------------------
 # 2. 데이터 로딩
 # -------------------------------
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
+features = get_features()
 
 # -------------------------------
 # 3. 설정
 # -------------------------------
 period_days = st.sidebar.selectbox("예측 기간 (일)", [7, 14, 30], index=1)
-kr_holidays = holidays.KR()
+backtest = get_backtest_results()
+training_modes = ["개별 모델 (센터 × 품목)", "글로벌 모델 (단일)", "롤링 백테스트 (다중 폴드)"]
+if backtest is not None:
+    training_modes.insert(0, "저장된 백테스트 결과")
+training_mode = st.sidebar.radio("학습 방식", training_modes)
+use_stored = training_mode == "저장된 백테스트 결과"
+use_global = training_mode.startswith("글로벌")
+use_rolling = training_mode.startswith("롤링")
+if use_rolling:
+    rolling_kind = st.sidebar.selectbox(
+        "모델", list(BACKTEST_MODELS), format_func=lambda kind: BACKTEST_MODELS[kind]
+    )
+    n_folds = st.sidebar.slider("폴드 수", min_value=2, max_value=8, value=4)
+    window = st.sidebar.radio(
+        "학습 창", WINDOWS, format_func=lambda w: "확장 (처음부터)" if w == "expanding" else "슬라이딩 (최근 1년)"
+    )
+elif use_stored:
+    model_kind = st.sidebar.selectbox(
+        "모델", backtest.manifest["models"], format_func=lambda kind: MODEL_LABELS[kind]
+    )
+elif not use_global:
+    max_workers = st.sidebar.number_input(
+        "병렬 워커 수", min_value=1, max_value=os.cpu_count() or 1,
+        value=resolve_workers(len(features.cube.centers) * len(features.cube.items))[0]
+    )
 
 # -------------------------------
 # 4. 성능 계산
 # -------------------------------
-st.info("모든 센터 × 품목에 대해 LightGBM 예측을 수행 중입니다...")
-
 results = []
-centers = df["center_name"].unique()
-items = df.columns[2:]
-
-for center in centers:
-    for item in items:
-        try:
-            target_df = df[df["center_name"] == center][["date", item]].copy()
-            target_df = target_df.rename(columns={"date": "ds", item: "y"})
-
-            # 특징 생성
-            target_df["is_holiday"] = target_df["ds"].isin(
-                holidays.KR(years=target_df["ds"].dt.year.unique())
-            ).astype(int)
-            target_df["dow"] = target_df["ds"].dt.dayofweek
-            target_df["lag_1"] = target_df["y"].shift(1)
-            target_df["lag_7"] = target_df["y"].shift(7)
-            target_df["rolling_mean_7"] = target_df["y"].rolling(7).mean()
-            target_df = target_df.dropna().reset_index(drop=True)
-
-            if len(target_df) <= period_days:
-                continue
-
-            train_df = target_df.iloc[:-period_days].copy().reset_index(drop=True)
-            test_df = target_df.iloc[-period_days:].copy().reset_index(drop=True)
-
-            features = ["lag_1", "lag_7", "rolling_mean_7", "dow", "is_holiday"]
-            X_train = train_df[features]
-            y_train = train_df["y"]
-            X_test = test_df[features]
-            y_test = test_df["y"]
-
-            # 모델 학습 및 예측
-            model = LGBMRegressor(random_state=42)
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-            y_pred = np.where(y_pred < 0, 0, y_pred)
-
-            # 성능 지표 계산
-            mae = mean_absolute_error(y_test, y_pred)
-            rmse = root_mean_squared_error(y_test, y_pred)
-            r2 = r2_score(y_test, y_pred)
-
-            results.append({
-                "센터": center,
-                "품목": item,
-                "MAE": round(mae, 2),
-                "RMSE": round(rmse, 2),
-                "R2": round(r2, 3)
-            })
-
-        except Exception as e:
-            st.warning(f"🚨 오류 발생 - {center} / {item}: {e}")
-            continue
+errors = []
+
+if use_stored and backtest.has(model_kind, period_days):
+    # 배치 작업이 미리 계산한 결과를 읽기만 함
+    results = backtest.series_metrics(model_kind, period_days).to_dict("records")
+    errors = backtest.series_errors(model_kind, period_days).to_dict("records")
+    st.caption(
+        f"배치 결과 생성: {backtest.manifest['generated_at']} · 기준 데이터: ~{backtest.manifest['data_end']}"
+    )
+    if backtest.manifest["data_end"] < str(features.cube.dates[-1].date()):
+        st.warning("배치 결과 이후 추가된 데이터가 있습니다. `python -m src.batch backtest`로 갱신하세요.")
+elif use_stored:
+    st.warning(f"저장된 결과에 {MODEL_LABELS[model_kind]} {period_days}일 백테스트가 없습니다.")
+elif use_rolling:
+    # 예측 시작점을 period_days씩 당겨가며 여러 폴드로 평가하고, 시리즈별로 전체 폴드 잔차를 모아 순위 산정
+    report = get_rolling_backtest(period_days, n_folds, window, rolling_kind)
+    st.markdown("### 🗂️ 폴드별 성능 (시리즈 평균)")
+    st.dataframe(report.fold_metrics(), use_container_width=True, hide_index=True)
+    results = report.series_metrics().to_dict("records")
+elif use_global:
+    # 전체 시리즈를 하나의 모델로 학습하고 시리즈별 지표를 한 번에 계산
+    results = get_global_model(period_days).holdout_metrics().to_dict("records")
+else:
+    st.info("모든 센터 × 품목에 대해 LightGBM 예측을 수행 중입니다...")
+
+    tasks = make_holdout_tasks(features, period_days)
+    progress = st.progress(0.0)
+    partial_table = st.empty()
+
+    for done, outcome in enumerate(run_sweep(tasks, max_workers=int(max_workers)), start=1):
+        if outcome.error is not None:
+            errors.append({"센터": outcome.center, "품목": outcome.item, "오류": outcome.error})
+        else:
+            results.append(outcome.result)
+
+        progress.progress(done / len(tasks), text=f"{done} / {len(tasks)} 조합 완료")
+        # 부분 결과를 주기적으로 갱신 (매 조합마다 다시 그리지 않음)
+        if results and (done % 10 == 0 or done == len(tasks)):
+            partial_table.dataframe(pd.DataFrame(results), use_container_width=True)
+
+    progress.empty()
+    partial_table.empty()
+
+if errors:
+    with st.expander(f"🚨 오류 발생 조합 {len(errors)}건"):
+        st.dataframe(pd.DataFrame(errors), use_container_width=True)
 
 # -------------------------------
 # 5. 결과 출력
@@ -108,3 +119,5 @@ if results:
     st.dataframe(result_df_sorted, use_container_width=True)
 else:
     st.error("⚠️ 계산 가능한 조합이 없습니다. 데이터를 다시 확인해주세요.")
+
+finish_page()
@@ -1,15 +1,16 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-from prophet import Prophet
-from sklearn.metrics import mean_absolute_error, root_mean_squared_error, r2_score
-import holidays
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.loader import load_logistics_data
+from src.dataset import get_dataset, get_holdout_forecast, get_item_columns, get_model_registry
+from src.future_view import render_future_forecast
+from src.instrument import finish_page, plotly_chart, start_page
+from src.prophet_backend import DEFAULT_UNCERTAINTY_SAMPLES
+
+start_page("prophet_forecast")
 
 # -------------------------
 # 1. 페이지 설정
@@ -20,75 +21,40 @@ st.title("🔮 Prophet 기반 물동량 예측")
 # -------------------------
 # 2. 데이터 로딩
 # -------------------------
-DATA_PATH = "data/logistics_by_center.csv"
-
-@st.cache_data
-def load_data():
-    return load_logistics_data(DATA_PATH)
-
-df = load_data()
+df = get_dataset()
+item_columns = get_item_columns()
 
 # -------------------------
 # 3. 사용자 입력
 # -------------------------
 st.sidebar.header("예측 조건")
-center = st.sidebar.selectbox("센터 선택", df["center_name"].unique())
-item = st.sidebar.selectbox("품목 선택", df.columns[2:13])
+center = st.sidebar.selectbox("센터 선택", df["center_name"].unique().tolist())
+item = st.sidebar.selectbox("품목 선택", item_columns)
 period_days = st.sidebar.selectbox("예측 기간 (일)", [7, 14, 30], index=1)
+show_interval = st.sidebar.checkbox("예측 구간 표시 (느림)", value=False)
+show_future = st.sidebar.checkbox("미래 예측 보기 (Global LightGBM / Seasonal Naive)", value=False)
 
 # -------------------------
-# 4. Prophet용 데이터 전처리
-# -------------------------
-target_df = df[df["center_name"] == center][["date", item]].copy()
-target_df = target_df.rename(columns={"date": "ds", item: "y"})
-
-# 공휴일 정보
-kr_holidays = holidays.KR(years=target_df["ds"].dt.year.unique())
-target_df["is_holiday"] = target_df["ds"].isin(kr_holidays).astype(int)
-target_df["dow"] = target_df["ds"].dt.dayofweek
-target_df["lag_1"] = target_df["y"].shift(1)
-target_df = target_df.dropna()
-
-# 학습 / 평가 분리
-train_df = target_df.iloc[:-period_days].copy()
-test_df = target_df.iloc[-period_days:].copy()
-
-# -------------------------
-# 5. Prophet 모델 구성 및 학습
+# 4. Prophet 모델 학습 및 예측
 # -------------------------
-model = Prophet(
-    weekly_seasonality=False,
-    yearly_seasonality=True,
-    daily_seasonality=False
+# 공휴일 정보 + 요일 + 전일 물동량을 외생 변수로 사용 (결측 제거 완료).
+# 같은 센터/품목/기간/구성/데이터 조합은 저장된 모델을 재사용하고,
+# 며칠만 추가된 경우에는 직전 모델의 파라미터에서 웜 스타트.
+# 예측 구간을 표시하지 않으면 불확실성 시뮬레이션을 생략 (음수값은 0으로 보정됨)
+result = get_holdout_forecast(
+    "prophet", center, item, period_days, registry=get_model_registry(),
+    uncertainty_samples=DEFAULT_UNCERTAINTY_SAMPLES if show_interval else 0,
 )
-
-# 외생 변수 등록
-model.add_regressor("is_holiday")
-model.add_regressor("dow")
-model.add_regressor("lag_1")
-
-model.fit(train_df)
+forecast = result.forecast
 
 # -------------------------
-# 6. 예측용 future 데이터 구성
+# 5. 성능 평가
 # -------------------------
-future = test_df[["ds", "is_holiday", "dow", "lag_1"]].copy()
-forecast = model.predict(future)
+y_true = result.y_true
+y_pred = result.y_pred
 
-# 음수값 보정
-forecast["yhat"] = forecast["yhat"].apply(lambda x: max(x, 0))
-forecast["yhat_lower"] = forecast["yhat_lower"].apply(lambda x: max(x, 0))
-forecast["yhat_upper"] = forecast["yhat_upper"].apply(lambda x: max(x, 0))
-
-# -------------------------
-# 7. 성능 평가
-# -------------------------
-y_true = test_df["y"].values
-y_pred = forecast["yhat"].values
-
-mae = mean_absolute_error(y_true, y_pred)
-rmse = root_mean_squared_error(y_true, y_pred)
-r2 = r2_score(y_true, y_pred)
+metrics = result.metrics()
+mae, rmse, r2 = metrics["MAE"], metrics["RMSE"], metrics["R2"]
 
 st.markdown(f"""
 ### 🧪 예측 성능 평가 (Prophet)
@@ -98,20 +64,31 @@ st.markdown(f"""
 """)
 
 # -------------------------
-# 8. 시각화
+# 6. 시각화
 # -------------------------
 st.subheader(f"{center} - {item} 예측 결과")
 
 fig = go.Figure()
 
 fig.add_trace(go.Scatter(
-    x=test_df["ds"],
+    x=forecast["ds"],
     y=y_true,
     mode="lines+markers",
     name="실제값",
     line=dict(color="blue")
 ))
 
+if "yhat_lower" in forecast.columns:
+    fig.add_trace(go.Scatter(
+        x=pd.concat([forecast["ds"], forecast["ds"][::-1]]),
+        y=pd.concat([forecast["yhat_upper"], forecast["yhat_lower"][::-1]]),
+        fill="toself",
+        fillcolor="rgba(0, 128, 0, 0.15)",
+        line=dict(color="rgba(0, 0, 0, 0)"),
+        hoverinfo="skip",
+        name="예측 구간"
+    ))
+
 fig.add_trace(go.Scatter(
     x=forecast["ds"],
     y=y_pred,
@@ -128,10 +105,10 @@ fig.update_layout(
     legend_title="구분"
 )
 
-st.plotly_chart(fig, use_container_width=True)
+plotly_chart(fig, use_container_width=True)
 
 # -------------------------
-# 9. 예측 결과 테이블
+# 7. 예측 결과 테이블
 # -------------------------
 st.markdown("### 📋 예측 결과 테이블")
 
@@ -142,3 +119,15 @@ result_df = pd.DataFrame({
 })
 
 st.dataframe(result_df.set_index("날짜").round(2), use_container_width=True)
+
+# -------------------------
+# 8. 미래 예측 (마지막 관측일 이후)
+# -------------------------
+# 위 결과는 평가 구간(백테스트), 여기서는 실제값이 없는 다음 period_days일 (src/future_view.py)
+if show_future:
+    render_future_forecast(
+        center, item, period_days,
+        note="Prophet은 미래 구간 예측을 제공하지 않아 Global LightGBM / Seasonal Naive 예측만 표시합니다.",
+    )
+
+finish_page()
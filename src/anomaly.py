@@ -0,0 +1,202 @@
+# 🚨 일괄 이상치 탐지	모든 센터 × 품목의 요일별 Z-score를 한 번에 계산
+# 🗓️ 공휴일 영향	정렬된 공휴일 날짜 이진 탐색으로 ±N일 여부 판단 (iterrows 확장 제거)
+# 📋 리더보드	기간 내 전체 네트워크 이상치를 하나의 표로 조회
+
+import copy
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.calendar import HolidayCalendar
+from src.cube import LogisticsCube
+
+DEFAULT_Z_THRESH = 2.5
+HOLIDAY_WINDOW_DAYS = 2
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class WeekdayAnomalies:
+    """
+    (센터, 요일, 품목)별 평균/표준편차를 기준으로 한 Z-score 이상치 탐지 결과입니다.
+
+    요일별 통계는 병합 가능한 형태(count, mean, M2)로 보관하여 새 날짜가 추가될 때
+    전체를 다시 계산하지 않고 갱신할 수 있습니다.
+
+    Attributes:
+    - count, mean, m2 (np.ndarray): (센터 수, 7, 품목 수) 요일별 관측 수/평균/제곱편차합
+    - z_score (np.ndarray): (센터 수, 일수, 품목 수) Z-score (미관측/표준편차 0이면 NaN)
+    - holiday_name (np.ndarray): 날짜별 ±HOLIDAY_WINDOW_DAYS 이내 가장 가까운 공휴일 이름
+    """
+
+    def __init__(self, cube: LogisticsCube, calendar: HolidayCalendar,
+                 z_thresh: float = DEFAULT_Z_THRESH, window_days: int = HOLIDAY_WINDOW_DAYS):
+        self.cube = cube
+        self.calendar = calendar
+        self.z_thresh = z_thresh
+        self.window_days = window_days
+        self.dow = cube.dates.dayofweek.to_numpy()
+
+        n_centers, _, n_items = cube.shape
+        self.count = np.zeros((n_centers, 7, n_items))
+        self.mean = np.full((n_centers, 7, n_items), np.nan)
+        self.m2 = np.zeros((n_centers, 7, n_items))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # 관측이 없는 요일
+            for day in range(7):
+                block = cube.values[:, self.dow == day, :]
+                self.count[:, day, :] = (~np.isnan(block)).sum(axis=1)
+                self.mean[:, day, :] = np.nanmean(block, axis=1)
+                self.m2[:, day, :] = np.nansum((block - self.mean[:, day:day + 1, :]) ** 2, axis=1)
+
+        self.z_score = self._z_scores(slice(None))
+        self.holiday_name = calendar.nearest_holiday_name(cube.dates, window_days)
+
+    @property
+    def std(self) -> np.ndarray:
+        """(센터, 요일, 품목)별 표본 표준편차 (pandas std와 같은 ddof=1)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(self.m2 / (self.count - 1))
+
+    def _z_scores(self, centers) -> np.ndarray:
+        mean = self.mean[centers][:, self.dow, :]
+        std = self.std[centers][:, self.dow, :]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (self.cube.values[centers] - mean) / std
+        return np.where(np.isfinite(z), z, np.nan)
+
+    def copy(self, cube: LogisticsCube) -> "WeekdayAnomalies":
+        """
+        cube(복사된 저장소)에 연결한 새 탐지 결과를 반환합니다.
+
+        update는 통계/Z-score 배열을 새로 만들어 교체하므로 배열은 공유해도 됩니다.
+        """
+        anomalies = copy.copy(self)
+        anomalies.cube = cube
+        return anomalies
+
+    def update(self, calendar: HolidayCalendar, center_codes: np.ndarray, day_codes: np.ndarray) -> None:
+        """
+        cube에 새로 추가된 (센터, 날짜) 관측을 반영합니다.
+
+        요일별 통계는 새 관측만으로 만든 블록을 기존 통계에 병합(Chan et al.)하고,
+        Z-score는 통계가 바뀐 센터만 다시 계산합니다.
+
+        Parameters:
+        - calendar (HolidayCalendar): 새 날짜를 포함하는 공휴일 달력
+        - center_codes (np.ndarray): 추가된 행의 센터 코드
+        - day_codes (np.ndarray): 추가된 행의 날짜 위치
+        """
+        cube = self.cube
+        n_centers, n_days, n_items = cube.shape
+        pad = n_centers - self.count.shape[0]
+        if pad > 0:
+            self.count = np.concatenate([self.count, np.zeros((pad, 7, n_items))])
+            self.mean = np.concatenate([self.mean, np.full((pad, 7, n_items), np.nan)])
+            self.m2 = np.concatenate([self.m2, np.zeros((pad, 7, n_items))])
+        self.dow = cube.dates.dayofweek.to_numpy()
+
+        # 새 관측만으로 (센터, 요일, 품목) 블록 통계 계산
+        new_values = cube.values[center_codes, day_codes, :]
+        valid = ~np.isnan(new_values)
+        idx = (center_codes, self.dow[day_codes])
+        block_count = np.zeros_like(self.count)
+        block_sum = np.zeros_like(self.count)
+        np.add.at(block_count, idx, valid)
+        np.add.at(block_sum, idx, np.where(valid, new_values, 0.0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            block_mean = block_sum / block_count
+        block_m2 = np.zeros_like(self.count)
+        np.add.at(block_m2, idx, np.where(valid, (new_values - block_mean[idx]) ** 2, 0.0))
+
+        # 기존 통계와 병합
+        total = self.count + block_count
+        old_mean = np.nan_to_num(self.mean)
+        delta = np.nan_to_num(block_mean) - old_mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean = np.where(total > 0, old_mean + delta * block_count / total, np.nan)
+            self.m2 = self.m2 + block_m2 + np.where(
+                total > 0, delta ** 2 * self.count * block_count / total, 0.0
+            )
+        self.count = total
+
+        z_score = np.full(cube.shape, np.nan)
+        old_centers, old_days, _ = self.z_score.shape
+        z_score[:old_centers, :old_days] = self.z_score
+        affected = np.unique(center_codes)
+        z_score[affected] = self._z_scores(affected)
+        self.z_score = z_score
+
+        self.calendar = calendar
+        self.holiday_name = calendar.nearest_holiday_name(cube.dates, self.window_days)
+
+    @property
+    def is_outlier(self) -> np.ndarray:
+        """(센터, 일수, 품목) 이상치 여부 (|Z| > z_thresh)."""
+        return np.abs(np.nan_to_num(self.z_score)) > self.z_thresh
+
+    def series_frame(self, center: str, item: str) -> pd.DataFrame:
+        """
+        단일 센터 × 품목의 이상치 탐지 결과를 반환합니다 (관측일만).
+
+        Returns:
+        - pd.DataFrame: date, weekday, {item}, avg, std, z_score, is_outlier,
+          holiday_name, is_holiday_related 컬럼
+        """
+        cube = self.cube
+        c = cube.center_index[center]
+        i = cube.item_index[item]
+        mask = cube.observed[c]
+        dow = self.dow[mask]
+        z = self.z_score[c, mask, i]
+        holiday_name = self.holiday_name[mask]
+        return pd.DataFrame({
+            "date": cube.dates[mask],
+            "weekday": np.array(WEEKDAY_NAMES)[dow],
+            item: cube.values[c, mask, i],
+            "avg": self.mean[c, dow, i],
+            "std": self.std[c, dow, i],
+            "z_score": z,
+            "is_outlier": np.abs(np.nan_to_num(z)) > self.z_thresh,
+            "holiday_name": holiday_name,
+            "is_holiday_related": pd.notna(holiday_name),
+        })
+
+    def outliers(self, start=None, end=None, centers: list = None, items: list = None) -> pd.DataFrame:
+        """
+        기간 내 모든 센터 × 품목의 이상치를 하나의 표로 반환합니다.
+
+        Parameters:
+        - start, end: 조회 기간 (양 끝 포함, None이면 전체)
+        - centers (list): 센터 필터 (None이면 전체)
+        - items (list): 품목 필터 (None이면 전체)
+
+        Returns:
+        - pd.DataFrame: date, center_name, item, value, avg, z_score, holiday_name,
+          is_holiday_related 컬럼 (|Z| 내림차순)
+        """
+        cube = self.cube
+        d0 = 0 if start is None else cube.dates.searchsorted(pd.Timestamp(start), side="left")
+        d1 = len(cube.dates) if end is None else cube.dates.searchsorted(pd.Timestamp(end), side="right")
+
+        flags = self.is_outlier[:, d0:d1, :].copy()
+        if centers is not None:
+            flags[[c for c in range(len(cube.centers)) if cube.centers[c] not in set(centers)]] = False
+        if items is not None:
+            flags[:, :, [i for i in range(len(cube.items)) if cube.items[i] not in set(items)]] = False
+
+        c_idx, d_idx, i_idx = np.nonzero(flags)
+        d_idx = d_idx + d0
+        holiday_name = self.holiday_name[d_idx]
+        result = pd.DataFrame({
+            "date": cube.dates[d_idx],
+            "center_name": np.array(cube.centers, dtype=object)[c_idx],
+            "item": np.array(cube.items, dtype=object)[i_idx],
+            "value": cube.values[c_idx, d_idx, i_idx],
+            "avg": self.mean[c_idx, self.dow[d_idx], i_idx],
+            "z_score": self.z_score[c_idx, d_idx, i_idx],
+            "holiday_name": holiday_name,
+            "is_holiday_related": pd.notna(holiday_name),
+        })
+        order = np.argsort(-np.abs(result["z_score"].to_numpy()), kind="stable")
+        return result.iloc[order].reset_index(drop=True)
@@ -0,0 +1,307 @@
+# 📆 롤링 백테스트	예측 시작점(origin)을 옮겨가며 여러 폴드로 평가 (확장/슬라이딩 창)
+# ♻️ 피처 재사용	폴드마다 피처를 다시 만들지 않고 공유 피처 행렬을 날짜 마스크로 잘라 사용
+# 📏 벡터화 지표	(폴드 × 시리즈 × 예측일) 잔차 배열에서 폴드별/시리즈별 지표를 한 번에 계산
+#
+# 사용법: python -m src.backtest --horizon 14 --folds 4 --window expanding --model global
+
+import argparse
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.features import FeatureStore
+from src.metrics import regression_metrics
+
+WINDOWS = ["expanding", "sliding"]
+BACKTEST_MODELS = {
+    "global": "Global LightGBM",
+    "lgbm": "LightGBM (개별)",
+    "prophet": "Prophet (개별)",
+    "seasonal_naive": "Seasonal Naive (7일 전)",
+}
+DEFAULT_WINDOW_DAYS = 365
+
+
+def make_folds(n_days: int, horizon: int, n_folds: int, step: int = None,
+               window: str = "expanding", window_days: int = DEFAULT_WINDOW_DAYS) -> list[tuple]:
+    """
+    날짜 축 위의 폴드 (학습 시작 위치, 예측 시작 위치) 목록을 만듭니다.
+
+    마지막 폴드의 예측 구간이 데이터 마지막 날에 끝나도록 뒤에서부터 step일씩 당깁니다.
+
+    Parameters:
+    - n_days (int): 날짜 축 길이
+    - horizon (int): 폴드별 예측 일수
+    - n_folds (int): 폴드 수
+    - step (int): 폴드 간 예측 시작점 간격 (기본값: horizon, 예측 구간이 겹치지 않음)
+    - window (str): "expanding"(처음부터 학습) 또는 "sliding"(최근 window_days일만 학습)
+    - window_days (int): 슬라이딩 창 길이
+
+    Returns:
+    - list[tuple]: 오래된 폴드부터 (train_start, origin)
+
+    Raises:
+    - ValueError: 창 종류, 예측 일수, 폴드 수, 간격이 잘못됐거나 첫 폴드의 학습 구간이 없는 경우
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"지원하지 않는 창 종류: {window}")
+    step = horizon if step is None else step
+    if horizon <= 0 or n_folds <= 0 or step <= 0:
+        raise ValueError(
+            f"예측 일수/폴드 수/간격은 1 이상이어야 합니다: horizon={horizon}, n_folds={n_folds}, step={step}"
+        )
+    origins = [n_days - horizon - step * k for k in reversed(range(n_folds))]
+    if origins[0] <= 0:
+        raise ValueError(f"데이터 기간({n_days}일)이 {n_folds}개 폴드 × {step}일 간격에 비해 짧습니다.")
+    if window == "sliding":
+        return [(max(origin - window_days, 0), origin) for origin in origins]
+    return [(0, origin) for origin in origins]
+
+
+@dataclass
+class BacktestReport:
+    """
+    롤링 백테스트 결과입니다.
+
+    Attributes:
+    - features (FeatureStore): 평가에 사용한 피처 행렬
+    - kind (str): 모델 종류 (BACKTEST_MODELS 키)
+    - horizon (int): 폴드별 예측 일수
+    - folds (list[tuple]): (train_start, origin) 목록
+    - predictions (np.ndarray): (폴드, 센터, horizon, 품목) 예측 (예측이 없으면 NaN)
+    - actuals (np.ndarray): predictions와 같은 shape의 실제값 (예측이 없는 칸은 NaN)
+    """
+
+    features: FeatureStore
+    kind: str
+    horizon: int
+    folds: list
+    predictions: np.ndarray
+    actuals: np.ndarray
+
+    @property
+    def residuals(self) -> np.ndarray:
+        """(폴드, 센터, horizon, 품목) 잔차 (실제값 - 예측값)."""
+        return self.actuals - self.predictions
+
+    def fold_metrics(self) -> pd.DataFrame:
+        """
+        폴드별 지표 (시리즈별 MAE/RMSE/R²의 평균)를 반환합니다.
+
+        Returns:
+        - pd.DataFrame: 폴드, 학습 시작, 예측 시작, 시리즈 수, MAE, RMSE, R2 컬럼
+        """
+        dates = self.features.cube.dates
+        metrics = regression_metrics(self.actuals, self.predictions, axis=2)  # (폴드, 센터, 품목)
+        n_series = (~np.isnan(metrics["RMSE"])).sum(axis=(1, 2))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # 예측이 없는 폴드
+            summary = {
+                name: np.nanmean(values.reshape(len(self.folds), -1), axis=1)
+                for name, values in metrics.items()
+            }
+        return pd.DataFrame({
+            "폴드": np.arange(1, len(self.folds) + 1),
+            "학습 시작": [dates[start] for start, _ in self.folds],
+            "예측 시작": [dates[origin] for _, origin in self.folds],
+            "시리즈 수": n_series,
+            "MAE": np.round(summary["MAE"], 2),
+            "RMSE": np.round(summary["RMSE"], 2),
+            "R2": np.round(summary["R2"], 3),
+        })
+
+    def series_metrics(self) -> pd.DataFrame:
+        """
+        시리즈별로 모든 폴드의 잔차를 모아 계산한 지표와 폴드 간 RMSE 편차를 반환합니다.
+
+        Returns:
+        - pd.DataFrame: 센터, 품목, MAE, RMSE, R2, RMSE 편차 컬럼 (순위표 형식)
+        """
+        cube = self.features.cube
+        _, n_centers, _, n_items = self.predictions.shape
+        # (센터, 품목, 폴드 × horizon)으로 펼쳐 모든 폴드를 한 번에 집계
+        flat_true = self.actuals.transpose(1, 3, 0, 2).reshape(n_centers, n_items, -1)
+        flat_pred = self.predictions.transpose(1, 3, 0, 2).reshape(n_centers, n_items, -1)
+        pooled = regression_metrics(flat_true, flat_pred, axis=-1)
+        per_fold = regression_metrics(self.actuals, self.predictions, axis=2)["RMSE"]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # 한 폴드에서도 예측이 없는 시리즈
+            spread = np.nanstd(per_fold, axis=0)
+
+        c_idx, i_idx = np.nonzero(~np.isnan(pooled["RMSE"]))
+        return pd.DataFrame({
+            "센터": [cube.centers[c] for c in c_idx],
+            "품목": [cube.items[i] for i in i_idx],
+            "MAE": pooled["MAE"][c_idx, i_idx].round(2),
+            "RMSE": pooled["RMSE"][c_idx, i_idx].round(2),
+            "R2": pooled["R2"][c_idx, i_idx].round(3),
+            "RMSE 편차": spread[c_idx, i_idx].round(2),
+        })
+
+    def series_folds(self, center: str, item: str) -> pd.DataFrame:
+        """
+        단일 센터 × 품목의 폴드별 예측 결과를 반환합니다.
+
+        Returns:
+        - pd.DataFrame: fold, ds, y, yhat 컬럼 (예측이 없는 날짜 제외)
+        """
+        cube = self.features.cube
+        c = cube.center_index[center]
+        i = cube.item_index[item]
+        frames = [
+            pd.DataFrame({
+                "fold": k + 1,
+                "ds": cube.dates[origin:origin + self.horizon],
+                "y": self.actuals[k, c, :, i],
+                "yhat": self.predictions[k, c, :, i],
+            })
+            for k, (_, origin) in enumerate(self.folds)
+        ]
+        return pd.concat(frames, ignore_index=True).dropna().reset_index(drop=True)
+
+
+def _series_tasks(features: FeatureStore, folds: list, horizon: int, kind: str, columns: list,
+                  series: list) -> list[dict]:
+    """시리즈별 모델용 과제: 피처는 시리즈당 한 번만 잘라 모든 폴드가 공유합니다."""
+    cube = features.cube
+    tasks = []
+    for center, item in series:
+        target_df = features.series_frame(center, item, columns=columns)
+        if target_df.empty:
+            continue
+        tasks.append({
+            "center": center,
+            "item": item,
+            "kind": kind,
+            "days": (target_df["ds"] - cube.dates[0]).dt.days.to_numpy(),
+            "frame": target_df,
+            "columns": columns,
+            "folds": folds,
+            "horizon": horizon,
+        })
+    return tasks
+
+
+def _fold_masks(task: dict):
+    days = task["days"]
+    for train_start, origin in task["folds"]:
+        train = (days >= train_start) & (days < origin)
+        test = (days >= origin) & (days < origin + task["horizon"])
+        yield origin, train, test
+
+
+def predict_series_folds(task: dict, n_jobs: int = 1) -> list[tuple]:
+    """
+    한 시리즈의 모든 폴드에 task["kind"] 모델을 학습/예측합니다 (프로세스 풀 실행용).
+
+    Returns:
+    - list[tuple]: 폴드별 (예측 시작점 기준 위치 배열, 예측값 배열)
+    """
+    from src.forecasters import make_forecaster
+
+    frame = task["frame"]
+    results = []
+    for origin, train, test in _fold_masks(task):
+        if train.sum() < 2 or not test.any():
+            results.append((np.array([], dtype=int), np.array([])))
+            continue
+        forecaster = make_forecaster(task["kind"], n_jobs=n_jobs).fit(frame[train])
+        y_pred = forecaster.predict(frame[test])["yhat"].to_numpy()
+        results.append((task["days"][test] - origin, y_pred))
+    return results
+
+
+def rolling_backtest(features: FeatureStore, horizon: int = 14, n_folds: int = 4, step: int = None,
+                     window: str = "expanding", window_days: int = DEFAULT_WINDOW_DAYS,
+                     kind: str = "global", series: list = None, max_workers: int = None,
+                     on_progress=None) -> BacktestReport:
+    """
+    모든(또는 지정한) 센터 × 품목에 대해 롤링 원점 백테스트를 실행합니다.
+
+    - global: 폴드마다 글로벌 LightGBM 1회 학습 (폴드 수만큼만 학습)
+    - lgbm / prophet: 시리즈별 모델(src.forecasters)을 프로세스 풀에서 폴드 단위로 학습
+    - seasonal_naive: 7일 전 값(lag_7)을 예측값으로 사용하는 기준선
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - horizon (int): 폴드별 예측 일수
+    - n_folds (int): 폴드 수
+    - step (int): 폴드 간 간격 (기본값: horizon)
+    - window (str): "expanding" 또는 "sliding"
+    - window_days (int): 슬라이딩 창 길이
+    - kind (str): 모델 종류 (BACKTEST_MODELS 키)
+    - series (list): (센터, 품목) 목록 (None이면 전체)
+    - max_workers (int): 시리즈별 모델의 최대 워커 수
+    - on_progress (callable): on_progress(done, total) 진행 콜백
+
+    Returns:
+    - BacktestReport
+    """
+    from src.forecasters import get_forecaster_class
+    from src.global_model import fit_predict_window
+    from src.sweep import run_sweep
+
+    if kind not in BACKTEST_MODELS:
+        raise ValueError(f"지원하지 않는 모델 종류: {kind}")
+
+    cube = features.cube
+    n_days = len(cube.dates)
+    folds = make_folds(n_days, horizon, n_folds, step, window, window_days)
+    n_centers, _, n_items = cube.shape
+    predictions = np.full((len(folds), n_centers, horizon, n_items), np.nan)
+
+    if kind == "global":
+        for k, (train_start, origin) in enumerate(folds):
+            predictions[k] = fit_predict_window(features, train_start, origin, horizon)[2]
+            if on_progress is not None:
+                on_progress(k + 1, len(folds))
+    elif kind == "seasonal_naive":
+        for k, (_, origin) in enumerate(folds):
+            predictions[k] = features.arrays["lag_7"][:, origin:origin + horizon, :]
+    else:
+        if series is None:
+            series = [(center, item) for center in cube.centers for item in cube.items]
+        columns = get_forecaster_class(kind).columns
+        tasks = _series_tasks(features, folds, horizon, kind, columns, series)
+        for done, outcome in enumerate(run_sweep(tasks, fn=predict_series_folds, max_workers=max_workers), start=1):
+            if outcome.error is None:
+                c = cube.center_index[outcome.center]
+                i = cube.item_index[outcome.item]
+                for k, (offsets, y_pred) in enumerate(outcome.result):
+                    predictions[k, c, offsets, i] = y_pred
+            if on_progress is not None:
+                on_progress(done, len(tasks))
+
+    # 미관측일/피처 결측으로 예측이 없는 칸과 실제값 결측 칸을 양쪽에서 함께 제외
+    actuals = np.stack([cube.values[:, origin:origin + horizon, :] for _, origin in folds])
+    predictions = np.where(np.isnan(actuals), np.nan, predictions)
+    actuals = np.where(np.isnan(predictions), np.nan, actuals)
+    if series is not None:
+        selected = np.zeros((n_centers, n_items), dtype=bool)
+        for center, item in series:
+            selected[cube.center_index[center], cube.item_index[item]] = True
+        predictions = np.where(selected[None, :, None, :], predictions, np.nan)
+        actuals = np.where(selected[None, :, None, :], actuals, np.nan)
+    return BacktestReport(features, kind, horizon, folds, predictions, actuals)
+
+
+if __name__ == "__main__":
+    from src.dataset import get_features
+
+    parser = argparse.ArgumentParser(description="롤링 원점 다중 폴드 백테스트")
+    parser.add_argument("--horizon", type=int, default=14)
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--step", type=int, default=None)
+    parser.add_argument("--window", choices=WINDOWS, default="expanding")
+    parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS)
+    parser.add_argument("--model", choices=list(BACKTEST_MODELS), default="global")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    report = rolling_backtest(
+        get_features(), args.horizon, args.folds, args.step, args.window, args.window_days,
+        args.model, max_workers=args.workers,
+    )
+    print(report.fold_metrics().to_string(index=False))
@@ -0,0 +1,289 @@
+# 🌙 배치 백테스트	센터 × 품목 × 예측 기간 × 모델 전체의 지표/예측/잔차를 한 번에 계산
+# 🗄️ 결과 저장소	실행별 run-* 폴더의 Parquet(metrics, predictions, errors) + 그 폴더를 가리키는 manifest(마지막에 원자적 교체)
+# ⚡ 페이지 조회	순위/오차 분석 페이지는 저장된 결과를 읽기만 하여 즉시 표시
+#
+# 사용법: python -m src.batch backtest [--periods 7 14 30] [--models lgbm prophet] [--workers N]
+# 예) 매일 새벽 3시 갱신 (cron): 0 3 * * * cd /app && python -m src.batch backtest
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.features import FeatureStore
+from src.loader import replace_atomic
+from src.metrics import regression_metrics
+from src.prophet_backend import make_prophet_tasks, predict_prophet_holdout
+from src.sweep import make_holdout_tasks, predict_lgbm_holdout, run_sweep
+
+RESULTS_DIR = os.environ.get("SOPO_RESULTS_DIR", "data/results")
+# 결과 파일 구성이 바뀌면 올려서 기존 결과를 무시합니다.
+# 2: 실행마다 새 run-* 폴더에 표를 쓰고 manifest가 그 폴더를 가리킴
+RESULTS_SCHEMA_VERSION = 2
+
+BACKTEST_PERIODS = [7, 14, 30]
+MODEL_KINDS = ["lgbm", "prophet"]
+MODEL_LABELS = {"lgbm": "LightGBM", "prophet": "Prophet"}
+
+_TABLES = ["metrics", "predictions", "errors"]
+_RUN_PREFIX = "run-"
+# 쓰는 중인 실행 폴더 접미사 (정리 대상에서 제외)
+_PENDING_SUFFIX = ".tmp"
+# 이보다 최근에 쓴 실행 폴더는 지우지 않음 (동시에 끝난 다른 배치가 manifest를 바꾸기 직전일 수 있음)
+_RUN_GRACE_S = 3600
+
+
+def backtest_lgbm(task: dict, n_jobs: int = 1) -> dict:
+    """LightGBM 평가 구간의 날짜/실제값/예측값을 반환합니다 (프로세스 풀 실행용)."""
+    return {"ds": task["ds_test"], "y": task["y_test"], "yhat": predict_lgbm_holdout(task, n_jobs)}
+
+
+def backtest_prophet(task: dict, n_jobs: int = 1) -> dict:
+    """Prophet 평가 구간의 날짜/실제값/예측값을 반환합니다 (프로세스 풀 실행용)."""
+    test_df = task["test"]
+    return {
+        "ds": test_df["ds"].to_numpy(),
+        "y": test_df["y"].to_numpy(),
+        "yhat": predict_prophet_holdout(task, n_jobs),
+    }
+
+
+_BACKTESTS = {
+    "lgbm": (make_holdout_tasks, backtest_lgbm),
+    "prophet": (make_prophet_tasks, backtest_prophet),
+}
+
+
+def run_backtest(features: FeatureStore, periods: list = None, kinds: list = None,
+                 max_workers: int = None, on_progress=None) -> dict:
+    """
+    모든 센터 × 품목 × 예측 기간 × 모델의 평가 구간 예측을 계산합니다.
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - periods (list): 예측 기간 목록 (기본값: BACKTEST_PERIODS)
+    - kinds (list): 모델 종류 목록 (기본값: MODEL_KINDS)
+    - max_workers (int): 프로세스 풀 최대 워커 수
+    - on_progress (callable): on_progress(kind, period_days, done, total) 진행 콜백
+
+    Returns:
+    - dict: "metrics", "predictions", "errors" → pd.DataFrame
+    """
+    periods = BACKTEST_PERIODS if periods is None else periods
+    kinds = MODEL_KINDS if kinds is None else kinds
+
+    metrics, predictions, errors = [], [], []
+    for kind in kinds:
+        make_tasks, backtest = _BACKTESTS[kind]
+        for period_days in periods:
+            tasks = make_tasks(features, period_days)
+            outcomes = []
+            for done, outcome in enumerate(run_sweep(tasks, fn=backtest, max_workers=max_workers), start=1):
+                if outcome.error is not None:
+                    errors.append({
+                        "model": kind, "period_days": period_days,
+                        "센터": outcome.center, "품목": outcome.item, "오류": outcome.error,
+                    })
+                else:
+                    outcomes.append(outcome)
+                if on_progress is not None:
+                    on_progress(kind, period_days, done, len(tasks))
+            if not outcomes:
+                continue
+
+            # 모든 시리즈의 평가 구간 길이가 period_days로 같으므로 (시리즈 × 기간) 배열로 한 번에 계산
+            y = np.stack([outcome.result["y"] for outcome in outcomes]).astype(np.float64)
+            yhat = np.stack([outcome.result["yhat"] for outcome in outcomes]).astype(np.float64)
+            series_metrics = regression_metrics(y, yhat, axis=1)
+
+            keys = pd.DataFrame({
+                "model": kind,
+                "period_days": period_days,
+                "센터": [outcome.center for outcome in outcomes],
+                "품목": [outcome.item for outcome in outcomes],
+            })
+            metrics.append(keys.assign(
+                MAE=np.round(series_metrics["MAE"], 2),
+                RMSE=np.round(series_metrics["RMSE"], 2),
+                R2=np.round(series_metrics["R2"], 3),
+            ))
+            predictions.append(keys.loc[keys.index.repeat(period_days)].reset_index(drop=True).assign(
+                ds=pd.to_datetime(np.concatenate([outcome.result["ds"] for outcome in outcomes])),
+                y=y.ravel(),
+                yhat=yhat.ravel(),
+                residual=(y - yhat).ravel(),
+            ))
+
+    def concat(frames, columns):
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    key_columns = ["model", "period_days", "센터", "품목"]
+    return {
+        "metrics": concat(metrics, key_columns + ["MAE", "RMSE", "R2"]),
+        "predictions": concat(predictions, key_columns + ["ds", "y", "yhat", "residual"]),
+        "errors": pd.DataFrame(errors, columns=key_columns + ["오류"]),
+    }
+
+
+def _table_path(root: str, run: str, name: str) -> str:
+    return os.path.join(root, run, f"{name}.parquet")
+
+
+def _manifest_path(root: str) -> str:
+    return os.path.join(root, "manifest.json")
+
+
+def read_manifest(root: str = RESULTS_DIR) -> dict:
+    """결과 저장소의 manifest를 반환합니다 (없거나 형식이 다르면 빈 dict)."""
+    try:
+        with open(_manifest_path(root), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("schema_version") == RESULTS_SCHEMA_VERSION else {}
+
+
+def write_results(tables: dict, features: FeatureStore, root: str = RESULTS_DIR) -> dict:
+    """
+    백테스트 결과를 새 실행 폴더에 Parquet 파일로 저장하고 manifest를 마지막에 원자적으로 교체합니다.
+
+    표 3개는 모두 이번 실행 전용 폴더(run-*)에 쓰고, manifest가 그 폴더를 가리키도록 바꾸는 순간
+    한꺼번에 공개되므로 페이지는 항상 같은 실행의 metrics/predictions/errors를 읽습니다.
+    여러 배치가 동시에 실행되어도 서로의 파일을 덮어쓰지 않으며 마지막에 끝난 실행이 남습니다.
+    직전 manifest가 가리키던 실행은 읽는 중인 페이지를 위해 남기고, 그보다 오래된 실행은 지웁니다
+    (_RUN_GRACE_S 이내에 쓴 실행은 다른 배치가 곧 공개할 수 있으므로 남김).
+
+    Parameters:
+    - tables (dict): run_backtest 결과
+    - features (FeatureStore): 결과 계산에 사용한 피처 행렬 (기준 데이터 기록용)
+    - root (str): 결과 저장 폴더
+
+    Returns:
+    - dict: 저장한 manifest
+    """
+    os.makedirs(root, exist_ok=True)
+    generated_at = datetime.now()
+    pending = tempfile.mkdtemp(
+        dir=root, prefix=f"{_RUN_PREFIX}{generated_at:%Y%m%d%H%M%S}-", suffix=_PENDING_SUFFIX
+    )
+    try:
+        for name in _TABLES:
+            tables[name].to_parquet(os.path.join(pending, f"{name}.parquet"), index=False)
+        run_dir = pending[:-len(_PENDING_SUFFIX)]
+        os.rename(pending, run_dir)
+    except BaseException:
+        shutil.rmtree(pending, ignore_errors=True)
+        raise
+    run = os.path.basename(run_dir)
+
+    metrics = tables["metrics"]
+    previous = read_manifest(root).get("run")
+    manifest = {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "run": run,
+        "generated_at": generated_at.isoformat(timespec="seconds"),
+        "data_end": str(features.cube.dates[-1].date()),
+        "models": sorted(metrics["model"].unique().tolist()),
+        "periods": sorted(int(p) for p in metrics["period_days"].unique()),
+        "series": int(len(metrics)),
+        "errors": int(len(tables["errors"])),
+    }
+
+    def write(tmp_path: str) -> None:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+    replace_atomic(_manifest_path(root), write)
+    _prune_runs(root, keep={run, previous})
+    return manifest
+
+
+def _prune_runs(root: str, keep: set) -> None:
+    """keep에 없고 _RUN_GRACE_S보다 오래된 완료된 실행 폴더를 지웁니다 (쓰는 중인 .tmp 폴더는 남김)."""
+    now = time.time()
+    for name in os.listdir(root):
+        if not name.startswith(_RUN_PREFIX) or name.endswith(_PENDING_SUFFIX) or name in keep:
+            continue
+        path = os.path.join(root, name)
+        try:
+            if now - os.path.getmtime(path) < _RUN_GRACE_S:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+
+
+@dataclass
+class BacktestResults:
+    """저장된 백테스트 결과 (metrics / predictions / errors 표와 manifest)."""
+
+    metrics: pd.DataFrame
+    predictions: pd.DataFrame
+    errors: pd.DataFrame
+    manifest: dict
+
+    @classmethod
+    def read(cls, root: str = RESULTS_DIR) -> "BacktestResults":
+        """
+        결과 저장소를 읽습니다.
+
+        Returns:
+        - BacktestResults: 저장된 결과 (없거나 읽을 수 없으면 None)
+        """
+        manifest = read_manifest(root)
+        if not manifest:
+            return None
+        try:
+            tables = {name: pd.read_parquet(_table_path(root, manifest["run"], name)) for name in _TABLES}
+        except (OSError, ImportError, ValueError):
+            return None
+        return cls(manifest=manifest, **tables)
+
+    def has(self, kind: str, period_days: int) -> bool:
+        return kind in self.manifest["models"] and period_days in self.manifest["periods"]
+
+    def series_metrics(self, kind: str, period_days: int) -> pd.DataFrame:
+        """센터, 품목, MAE, RMSE, R2 컬럼의 시리즈별 지표 (순위표 형식)."""
+        selected = self.metrics[(self.metrics["model"] == kind) & (self.metrics["period_days"] == period_days)]
+        return selected[["센터", "품목", "MAE", "RMSE", "R2"]].reset_index(drop=True)
+
+    def series_predictions(self, kind: str, period_days: int) -> pd.DataFrame:
+        """센터, 품목, ds, y, yhat, residual 컬럼의 평가 구간 예측."""
+        selected = self.predictions[
+            (self.predictions["model"] == kind) & (self.predictions["period_days"] == period_days)
+        ]
+        return selected[["센터", "품목", "ds", "y", "yhat", "residual"]].reset_index(drop=True)
+
+    def series_errors(self, kind: str, period_days: int) -> pd.DataFrame:
+        """센터, 품목, 오류 컬럼의 실패한 조합 목록."""
+        selected = self.errors[(self.errors["model"] == kind) & (self.errors["period_days"] == period_days)]
+        return selected[["센터", "품목", "오류"]].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from src.dataset import get_features
+
+    parser = argparse.ArgumentParser(description="오프라인 배치 작업")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backtest_parser = commands.add_parser("backtest", help="전체 센터 × 품목 × 기간 × 모델 백테스트")
+    backtest_parser.add_argument("--periods", type=int, nargs="+", default=BACKTEST_PERIODS)
+    backtest_parser.add_argument("--models", nargs="+", choices=MODEL_KINDS, default=MODEL_KINDS)
+    backtest_parser.add_argument("--workers", type=int, default=None)
+    backtest_parser.add_argument("--output", default=RESULTS_DIR, help="결과 저장 폴더")
+    args = parser.parse_args()
+
+    def report(kind, period_days, done, total):
+        if done == total or done % 50 == 0:
+            print(f"[{MODEL_LABELS[kind]} {period_days}일] {done} / {total}", flush=True)
+
+    features = get_features()
+    tables = run_backtest(features, args.periods, args.models, args.workers, on_progress=report)
+    manifest = write_results(tables, features, args.output)
+    print(f"{args.output}: 시리즈 {manifest['series']}건, 오류 {manifest['errors']}건 저장")
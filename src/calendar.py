@@ -0,0 +1,137 @@
+# 🗓️ 공휴일 달력	데이터 기간의 한국 공휴일 정보를 날짜 축 배열로 한 번만 계산
+# ⚡ 벡터화 조회	날짜 → 배열 위치 변환 후 인덱싱 (행별 `in` 검사 제거)
+# 🎎 명절 구간	설날/추석 ±N일 플래그, 가장 가까운 공휴일까지 거리
+
+import holidays
+import numpy as np
+import pandas as pd
+
+# 명절 구간 기본 폭 (±일)
+FESTIVAL_WINDOW_DAYS = 2
+FESTIVALS = {"seollal": "설날", "chuseok": "추석"}
+
+
+def _window_flags(flags: np.ndarray, days: int) -> np.ndarray:
+    """bool 배열의 True 위치 ±days 범위를 True로 확장합니다."""
+    if days <= 0:
+        return flags.copy()
+    kernel = np.ones(2 * days + 1, dtype=int)
+    return np.convolve(flags.astype(int), kernel, mode="same") > 0
+
+
+class HolidayCalendar:
+    """
+    일 단위 공휴일 정보 테이블입니다.
+
+    start가 속한 해의 1월 1일부터 end 다음 해 12월 31일까지(미래 예측 구간 포함)를 다루며,
+    모든 값은 날짜 축과 같은 길이의 NumPy 배열입니다.
+
+    Attributes:
+    - dates (pd.DatetimeIndex): 날짜 축
+    - is_holiday (np.ndarray): 공휴일 여부
+    - holiday_name (np.ndarray): 공휴일 이름 (공휴일이 아니면 "")
+    - days_to_holiday (np.ndarray): 가장 가까운 공휴일까지의 거리 (일, 절댓값)
+    - days_since_holiday (np.ndarray): 직전(당일 포함) 공휴일 이후 경과 일수 (없으면 -1)
+    - festival_window (dict): "seollal"/"chuseok" → ±window_days 구간 여부
+    """
+
+    def __init__(self, start, end, window_days: int = FESTIVAL_WINDOW_DAYS):
+        first_year = pd.Timestamp(start).year
+        last_year = pd.Timestamp(end).year + 1
+        self.dates = pd.date_range(f"{first_year}-01-01", f"{last_year}-12-31", freq="D")
+        self.window_days = window_days
+
+        kr_holidays = holidays.KR(years=range(first_year, last_year + 1))
+        # 같은 날짜에 공휴일이 여러 개면 holidays 라이브러리가 "; "로 이어 붙인 이름을 사용
+        holiday_series = pd.Series(
+            list(kr_holidays.values()), index=pd.to_datetime(list(kr_holidays.keys()))
+        ).sort_index()
+
+        positions = self.positions(holiday_series.index)
+        self.is_holiday = np.zeros(len(self.dates), dtype=bool)
+        self.is_holiday[positions] = True
+        self.holiday_name = np.full(len(self.dates), "", dtype=object)
+        self.holiday_name[positions] = holiday_series.to_numpy()
+        self.holiday_positions = positions
+
+        self.days_to_holiday = self._distance_to_holiday(np.arange(len(self.dates)))
+        self.days_since_holiday = self._days_since_holiday(np.arange(len(self.dates)))
+
+        self.festival_window = {}
+        for key, keyword in FESTIVALS.items():
+            flags = np.array([keyword in name for name in self.holiday_name])
+            self.festival_window[key] = _window_flags(flags, window_days)
+
+    def positions(self, dates) -> np.ndarray:
+        """
+        날짜들을 날짜 축 위치(int 배열)로 변환합니다.
+
+        Raises:
+        - ValueError: 달력 범위를 벗어난 날짜가 있을 때
+        """
+        dates = pd.DatetimeIndex(dates)
+        pos = ((dates - self.dates[0]) // pd.Timedelta(days=1)).to_numpy()
+        if len(pos) and (pos.min() < 0 or pos.max() >= len(self.dates)):
+            raise ValueError("달력 범위를 벗어난 날짜가 있습니다.")
+        return pos
+
+    def _distance_to_holiday(self, pos: np.ndarray) -> np.ndarray:
+        hpos = self.holiday_positions
+        if len(hpos) == 0:
+            return np.full(len(pos), np.iinfo(np.int32).max)
+        right = np.searchsorted(hpos, pos)
+        after = hpos[np.minimum(right, len(hpos) - 1)] - pos
+        before = pos - hpos[np.maximum(right - 1, 0)]
+        after = np.where(after >= 0, after, np.iinfo(np.int32).max)
+        before = np.where(before >= 0, before, np.iinfo(np.int32).max)
+        return np.minimum(after, before)
+
+    def _days_since_holiday(self, pos: np.ndarray) -> np.ndarray:
+        hpos = self.holiday_positions
+        left = np.searchsorted(hpos, pos, side="right") - 1
+        return np.where(left >= 0, pos - hpos[np.maximum(left, 0)], -1)
+
+    def lookup(self, dates, column: str) -> np.ndarray:
+        """
+        날짜들의 달력 값을 벡터 인덱싱으로 조회합니다.
+
+        Parameters:
+        - dates: 날짜 배열 (Series, DatetimeIndex 등)
+        - column (str): "is_holiday", "holiday_name", "days_to_holiday",
+          "days_since_holiday" 또는 "seollal_window"/"chuseok_window"
+
+        Returns:
+        - np.ndarray: dates와 같은 길이의 값 배열
+        """
+        if column.endswith("_window"):
+            values = self.festival_window[column[:-len("_window")]]
+        else:
+            values = getattr(self, column)
+        return values[self.positions(dates)]
+
+    def nearest_holiday_name(self, dates, window_days: int) -> np.ndarray:
+        """
+        각 날짜 ±window_days 이내의 가장 가까운 공휴일 이름을 반환합니다 (없으면 None).
+
+        정렬된 공휴일 위치 배열에 대한 이진 탐색으로 계산합니다.
+        """
+        pos = self.positions(dates)
+        hpos = self.holiday_positions
+        if len(hpos) == 0:
+            return np.full(len(pos), None, dtype=object)
+        right = np.minimum(np.searchsorted(hpos, pos), len(hpos) - 1)
+        left = np.maximum(right - 1, 0)
+        # 거리가 같으면 이전 공휴일 우선
+        nearest = np.where(np.abs(hpos[left] - pos) <= np.abs(hpos[right] - pos), hpos[left], hpos[right])
+        names = self.holiday_name[nearest].astype(object)
+        return np.where(np.abs(nearest - pos) <= window_days, names, None)
+
+    def frame(self) -> pd.DataFrame:
+        """달력 전체를 날짜 인덱스 DataFrame으로 반환합니다."""
+        return pd.DataFrame({
+            "is_holiday": self.is_holiday,
+            "holiday_name": self.holiday_name,
+            "days_to_holiday": self.days_to_holiday,
+            "days_since_holiday": self.days_since_holiday,
+            **{f"{key}_window": flags for key, flags in self.festival_window.items()},
+        }, index=self.dates)
@@ -0,0 +1,164 @@
+# 🧊 밀집 배열 저장소	(센터 × 날짜 × 품목) 3차원 NumPy 배열
+# ⚡ O(1) 조회	시리즈/단면 조회가 불리언 마스크 스캔 없이 인덱싱(view)으로 처리
+# 📈 확장성	센터 수가 늘어도 단일 시리즈 조회 비용은 일정
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+class LogisticsCube:
+    """
+    센터 × 날짜 × 품목 물동량을 연속된 3차원 배열로 보관하는 저장소입니다.
+
+    날짜 축은 데이터의 첫 날부터 마지막 날까지 하루 단위로 빠짐없이 구성되며,
+    관측되지 않은 (센터, 날짜) 칸은 NaN으로 채우고 `observed` 마스크로 구분합니다.
+
+    Attributes:
+    - values (np.ndarray): shape (센터 수, 일수, 품목 수)의 float64 배열
+    - observed (np.ndarray): shape (센터 수, 일수)의 관측 여부 bool 배열
+    - dates (pd.DatetimeIndex): 날짜 축 (일 단위 연속)
+    - centers (list[str]): 센터 코드 → 센터명
+    - items (list[str]): 품목 코드 → 품목명
+    """
+
+    def __init__(self, values: np.ndarray, observed: np.ndarray, dates: pd.DatetimeIndex,
+                 centers: list, items: list):
+        self.values = values
+        self.observed = observed
+        self.dates = dates
+        self.centers = list(centers)
+        self.items = list(items)
+        self.center_index = {name: code for code, name in enumerate(self.centers)}
+        self.item_index = {name: code for code, name in enumerate(self.items)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, item_columns: list) -> "LogisticsCube":
+        """
+        긴 형태(date, center_name, 품목...)의 DataFrame으로부터 저장소를 만듭니다.
+
+        Parameters:
+        - df (pd.DataFrame): load_logistics_data 스키마의 DataFrame
+        - item_columns (list): 품목 컬럼 목록
+
+        Returns:
+        - LogisticsCube
+        """
+        # 센터 코드는 데이터 등장 순서 (df["center_name"].unique()와 동일한 순서)
+        center_codes, centers = pd.factorize(df["center_name"], sort=False)
+        start = df["date"].min()
+        day_codes = (df["date"] - start).dt.days.to_numpy()
+        n_days = int(day_codes.max()) + 1
+
+        values = np.full((len(centers), n_days, len(item_columns)), np.nan)
+        values[center_codes, day_codes, :] = df[item_columns].to_numpy(dtype=np.float64)
+        observed = np.zeros((len(centers), n_days), dtype=bool)
+        observed[center_codes, day_codes] = True
+
+        dates = pd.date_range(start, periods=n_days, freq="D")
+        return cls(values, observed, dates, list(centers), list(item_columns))
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    def copy(self) -> "LogisticsCube":
+        """
+        값/관측 배열과 센터 목록을 복사한 새 저장소를 반환합니다.
+
+        증분 반영은 복사본에 기록한 뒤 참조를 교체하므로(copy-on-write), 이미 이 저장소를
+        읽고 있는 페이지는 갱신 도중의 배열을 보지 않습니다.
+        """
+        return LogisticsCube(np.array(self.values), np.array(self.observed), self.dates,
+                             list(self.centers), list(self.items))
+
+    def append(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """
+        새 (날짜, 센터) 행을 저장소에 추가합니다.
+
+        마지막 날짜 이후의 날짜나 새 센터가 들어오면 해당 축을 늘리고(NaN 채움),
+        기존에 관측된 칸을 덮어쓰지는 않는다고 가정합니다 (ingest 단계에서 검증).
+
+        Parameters:
+        - df (pd.DataFrame): load_logistics_data 스키마의 추가 행
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray]: 추가된 행의 (센터 코드, 날짜 위치) 배열
+        """
+        for name in pd.unique(df["center_name"]):
+            if name not in self.center_index:
+                self.center_index[name] = len(self.centers)
+                self.centers.append(name)
+
+        day_codes = (df["date"] - self.dates[0]).dt.days.to_numpy()
+        n_centers = len(self.centers)
+        n_days = max(len(self.dates), int(day_codes.max()) + 1)
+        if (n_centers, n_days) != self.observed.shape:
+            values = np.full((n_centers, n_days, len(self.items)), np.nan)
+            observed = np.zeros((n_centers, n_days), dtype=bool)
+            old_centers, old_days = self.observed.shape
+            values[:old_centers, :old_days] = self.values
+            observed[:old_centers, :old_days] = self.observed
+            self.values, self.observed = values, observed
+            self.dates = pd.date_range(self.dates[0], periods=n_days, freq="D")
+
+        center_codes = df["center_name"].map(self.center_index).to_numpy()
+        self.values[center_codes, day_codes, :] = df[self.items].to_numpy(dtype=np.float64)
+        self.observed[center_codes, day_codes] = True
+        return center_codes, day_codes
+
+    def center_fingerprint(self, center: str) -> str:
+        """
+        단일 센터 데이터의 내용 해시를 반환합니다.
+
+        증분 적재 시 해당 센터의 값이 바뀔 때만 달라지므로, 센터 단위 캐시 키로 사용합니다.
+        """
+        c = self.center_index[center]
+        days = np.flatnonzero(self.observed[c])
+        # 관측된 칸만 해시하여 다른 센터로 인해 날짜 축이 늘어나도 값이 유지되도록 함
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(self.dates[0]).encode())
+        digest.update(days.astype(np.int64).tobytes())
+        digest.update(np.ascontiguousarray(self.values[c, days]).tobytes())
+        return digest.hexdigest()
+
+    def date_position(self, date) -> int:
+        """날짜를 날짜 축 위치로 변환합니다 (범위 밖이면 KeyError)."""
+        pos = (pd.Timestamp(date) - self.dates[0]).days
+        if not 0 <= pos < len(self.dates):
+            raise KeyError(date)
+        return pos
+
+    def series(self, center: str, item: str) -> np.ndarray:
+        """
+        단일 센터 × 품목의 일별 시계열을 복사 없이 view로 반환합니다.
+
+        Returns:
+        - np.ndarray: shape (일수,), 미관측일은 NaN
+        """
+        return self.values[self.center_index[center], :, self.item_index[item]]
+
+    def center_slice(self, center: str) -> np.ndarray:
+        """단일 센터의 (일수, 품목 수) view를 반환합니다."""
+        return self.values[self.center_index[center]]
+
+    def cross_section(self, date) -> np.ndarray:
+        """특정 날짜의 (센터 수, 품목 수) view를 반환합니다."""
+        return self.values[:, self.date_position(date), :]
+
+    def series_frame(self, center: str, item: str) -> pd.DataFrame:
+        """
+        단일 센터 × 품목 시계열을 Prophet 형식(ds, y) DataFrame으로 반환합니다.
+
+        기존 `df[df["center_name"] == center][["date", item]]`와 같은 행만 포함하도록
+        관측된 날짜만 남깁니다.
+
+        Returns:
+        - pd.DataFrame: ds(날짜), y(물동량) 컬럼
+        """
+        mask = self.observed[self.center_index[center]]
+        return pd.DataFrame({
+            "ds": self.dates[mask],
+            "y": self.series(center, item)[mask],
+        })
@@ -0,0 +1,300 @@
+# 📦 공유 데이터셋	프로세스당 한 번만 로딩하여 모든 페이지가 같은 객체를 참조
+# 🔒 읽기 전용	페이지는 파생 컬럼을 직접 추가하지 않고 store에서 한 번만 계산
+# 🪶 복사 없음	copy-on-write 모드로 필터/슬라이스 결과가 원본을 공유
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+from src.anomaly import DEFAULT_Z_THRESH, WeekdayAnomalies
+from src.backtest import BacktestReport, rolling_backtest
+from src.batch import RESULTS_DIR, BacktestResults, read_manifest
+from src.calendar import HolidayCalendar
+from src.cube import LogisticsCube
+from src.features import FeatureStore
+from src.forecasters import HoldoutForecast, holdout_forecast
+from src.future import FUTURE_HORIZONS, FutureForecast, forecast_future
+from src.global_model import GlobalModel, fit_global_model
+from src.instrument import cached_call, mark_cache_miss
+from src.model_registry import ModelRegistry
+from src.range_index import RangeIndex
+from src.result_cache import clear_all, get_cache, make_key
+from src.rollups import Rollups
+from src.store import LiveStore
+
+# 공유 프레임을 필터링한 결과가 원본 버퍼를 공유하도록 copy-on-write 활성화
+pd.set_option("mode.copy_on_write", True)
+
+DATA_PATH = os.environ.get("SOPO_DATA_PATH", "data/logistics_by_center.csv")
+
+
+@st.cache_resource(show_spinner="데이터를 불러오는 중입니다...")
+def _get_store() -> LiveStore:
+    mark_cache_miss()
+    # 이전 저장소 기준으로 계산한 결과는 새 저장소와 섞이지 않도록 비움
+    clear_all()
+    return LiveStore(DATA_PATH)
+
+
+def get_store() -> LiveStore:
+    """
+    워커 프로세스 전체에서 공유하는 데이터 상태를 반환합니다.
+
+    호출할 때마다 원본 CSV에 추가된 행(`python -m src.ingest`)이 있는지 확인하고,
+    있으면 추가된 날짜/센터만 증분 반영합니다 (변경이 없으면 파일 크기 확인 1회).
+
+    Returns:
+    - LiveStore
+    """
+    store = cached_call("store", _get_store)
+    store.sync()
+    return store
+
+
+def get_dataset() -> pd.DataFrame:
+    """
+    워커 프로세스 전체에서 공유하는 물류 데이터셋을 반환합니다.
+
+    모든 페이지/세션이 같은 객체를 받으므로 반환된 DataFrame을 직접 수정하면 안 됩니다
+    (필터링/슬라이싱은 자유롭게 사용).
+
+    Returns:
+    - pd.DataFrame: 원본 컬럼 + weekday, year, month, dow, year_month,
+      is_holiday, is_festival_week 파생 컬럼
+    """
+    return get_store().df
+
+
+def get_item_columns() -> list[str]:
+    """
+    품목(물동량) 컬럼 목록을 원본 CSV 컬럼 순서대로 반환합니다.
+
+    Returns:
+    - list[str]: 품목 컬럼 이름 목록 (파생 컬럼 제외)
+    """
+    return get_store().item_columns
+
+
+def get_calendar() -> HolidayCalendar:
+    """
+    데이터 기간(+ 다음 해)의 한국 공휴일 달력을 반환합니다.
+
+    Returns:
+    - HolidayCalendar: 날짜 축 배열로 구성된 공휴일 정보
+    """
+    return get_store().calendar
+
+
+def get_cube() -> LogisticsCube:
+    """
+    공유 데이터셋을 (센터 × 날짜 × 품목) 밀집 배열로 변환한 저장소를 반환합니다.
+
+    Returns:
+    - LogisticsCube: 단일 시리즈/단면을 view로 조회할 수 있는 저장소
+    """
+    return get_store().cube
+
+
+def get_features() -> FeatureStore:
+    """
+    모든 센터 × 품목 시계열의 예측 피처(lag/rolling/요일/공휴일)를 반환합니다.
+
+    Returns:
+    - FeatureStore: 한 번의 벡터 연산으로 계산된 공유 피처 행렬
+    """
+    return get_store().features
+
+
+def get_rollups() -> Rollups:
+    """
+    일/ISO 주/월/연 × 센터 × 품목 롤업(합계, 건수, M2, 최솟값, 최댓값)을 반환합니다.
+
+    Returns:
+    - Rollups: 원본 행 스캔 없이 그룹 통계를 조회하는 query API
+    """
+    return get_store().rollups
+
+
+def get_range_index() -> RangeIndex:
+    """
+    날짜 축 누적합 기반 기간 집계 인덱스를 반환합니다.
+
+    Returns:
+    - RangeIndex: 임의 기간의 센터 × 품목 합계/일평균/증감률을 원본 행 스캔 없이 계산
+    """
+    return get_store().range_index
+
+
+def cached_result(name: str, fn, *args, **kwargs):
+    """
+    선택값별 계산 결과를 용량/TTL 제한이 있는 결과 캐시(src.result_cache)에서 반환합니다.
+
+    키는 데이터 식별값(store.data_version: 원본 지문 + 버전)과 인자로 만들므로,
+    데이터가 갱신되거나 저장소가 다른 내용으로 다시 만들어지면 새로 계산합니다.
+    인자는 키로 쓰이므로 목록/딕셔너리/문자열/숫자 같은 값이어야 합니다.
+
+    Parameters:
+    - name (str): 캐시 이름 (진단 페이지/계측 라벨)
+    - fn: 결과를 계산할 함수 (fn(*args, **kwargs))
+
+    Returns:
+    - 캐시된(또는 새로 계산한) 결과
+    """
+    key = make_key(get_store().data_version, *args, **kwargs)
+    return get_cache(name).get_or_compute(key, fn, *args, **kwargs)
+
+
+def get_holdout_forecast(name: str, center: str, item: str, period_days: int, registry: ModelRegistry = None,
+                         columns: list = None, params: dict = None, **predict_kwargs) -> HoldoutForecast:
+    """
+    단일 센터 × 품목 홀드아웃 예측(forecasters.holdout_forecast)을 결과 캐시에서 반환합니다.
+
+    키에 센터 데이터 해시를 쓰므로 다른 센터에 행이 추가되어도 이 센터의 결과는 유지됩니다.
+    registry는 모델 재사용 여부만 바꾸고 결과는 같으므로 키에 넣지 않습니다.
+
+    Parameters:
+    - name (str): 모델 이름 (available_forecasters())
+    - center, item (str): 센터명, 품목명
+    - period_days (int): 평가(예측) 기간
+    - registry (ModelRegistry): 지정하면 저장된 모델을 재사용
+    - columns, params, predict_kwargs: holdout_forecast 인자
+
+    Returns:
+    - HoldoutForecast
+
+    Raises:
+    - ValueError: 모델 종류가 잘못됐거나 학습 데이터가 부족한 경우 (캐시하지 않음)
+    """
+    features = get_store().features
+    key = make_key(
+        features.cube.center_fingerprint(center), name, center, item, period_days,
+        columns=columns, params=params, **predict_kwargs
+    )
+    return get_cache("holdout_forecast").get_or_compute(
+        key, holdout_forecast, features, name, center, item, period_days,
+        registry=registry, columns=columns, params=params, **predict_kwargs
+    )
+
+
+@st.cache_resource
+def get_model_registry() -> ModelRegistry:
+    """
+    학습된 모델을 저장/재사용하는 디스크 레지스트리를 반환합니다.
+
+    Returns:
+    - ModelRegistry
+    """
+    return ModelRegistry()
+
+
+@st.cache_resource(max_entries=3, show_spinner="글로벌 모델을 학습하는 중입니다...")
+def _global_model(period_days: int, version: int) -> GlobalModel:
+    mark_cache_miss()
+    return fit_global_model(get_store().features, period_days)
+
+
+def get_global_model(period_days: int) -> GlobalModel:
+    """
+    모든 센터 × 품목을 하나로 학습한 글로벌 LightGBM 모델을 반환합니다.
+
+    데이터가 증분 갱신되면(store.version 증가) 다시 학습합니다.
+
+    Parameters:
+    - period_days (int): 평가 기간 (일)
+
+    Returns:
+    - GlobalModel: 평가 구간 예측이 포함된 글로벌 모델
+    """
+    return cached_call("global_model", _global_model, period_days, get_store().version)
+
+
+@st.cache_resource(max_entries=2, show_spinner="미래 예측을 계산하는 중입니다...")
+def _future_forecast(method: str, version: int) -> FutureForecast:
+    mark_cache_miss()
+    store = get_store()
+    return forecast_future(store.features, store.calendar, max(FUTURE_HORIZONS), method)
+
+
+def get_future_forecast(horizon: int, method: str = "global") -> FutureForecast:
+    """
+    모든 센터 × 품목의 마지막 관측일 이후 horizon일 예측을 반환합니다.
+
+    가장 긴 예측 기간으로 한 번 계산해 두고 앞부분을 잘라 쓰므로, 예측 기간을 바꿔도
+    다시 학습하지 않습니다 (데이터가 갱신되면 다시 계산).
+
+    Parameters:
+    - horizon (int): 예측 일수 (FUTURE_HORIZONS 최댓값 이하)
+    - method (str): 예측 방식 (future.FUTURE_METHODS 키)
+
+    Returns:
+    - FutureForecast
+    """
+    return cached_call("future_forecast", _future_forecast, method, get_store().version).head(horizon)
+
+
+@st.cache_resource(max_entries=8, show_spinner="롤링 백테스트를 실행하는 중입니다...")
+def _rolling_backtest(horizon: int, n_folds: int, window: str, kind: str,
+                      series: tuple, version: int) -> BacktestReport:
+    mark_cache_miss()
+    return rolling_backtest(
+        get_store().features, horizon, n_folds, window=window, kind=kind,
+        series=None if series is None else list(series),
+    )
+
+
+def get_rolling_backtest(horizon: int, n_folds: int = 4, window: str = "expanding",
+                         kind: str = "global", series: list = None) -> BacktestReport:
+    """
+    롤링 원점 다중 폴드 백테스트 결과를 반환합니다 (데이터가 갱신되면 다시 계산).
+
+    Parameters:
+    - horizon (int): 폴드별 예측 일수
+    - n_folds (int): 폴드 수
+    - window (str): "expanding" 또는 "sliding"
+    - kind (str): 모델 종류 (backtest.BACKTEST_MODELS 키)
+    - series (list): (센터, 품목) 목록 (None이면 전체)
+
+    Returns:
+    - BacktestReport
+    """
+    key = None if series is None else tuple(tuple(pair) for pair in series)
+    return cached_call(
+        "rolling_backtest", _rolling_backtest, horizon, n_folds, window, kind, key, get_store().version
+    )
+
+
+def get_anomalies(z_thresh: float = DEFAULT_Z_THRESH) -> WeekdayAnomalies:
+    """
+    모든 센터 × 품목의 요일별 Z-score 이상치 탐지 결과를 반환합니다.
+
+    증분 적재 시 요일별 통계를 병합하고 영향받은 센터만 다시 계산합니다.
+
+    Parameters:
+    - z_thresh (float): 이상치 판단 기준 |Z| 값
+
+    Returns:
+    - WeekdayAnomalies
+    """
+    return get_store().anomalies(z_thresh)
+
+
+@st.cache_resource(max_entries=1)
+def _backtest_results(generated_at: str) -> BacktestResults:
+    mark_cache_miss()
+    return BacktestResults.read(RESULTS_DIR)
+
+
+def get_backtest_results() -> BacktestResults:
+    """
+    배치 작업(`python -m src.batch backtest`)이 저장한 백테스트 결과를 반환합니다.
+
+    manifest의 생성 시각이 바뀌면(배치 재실행) 다시 읽습니다.
+
+    Returns:
+    - BacktestResults: 저장된 결과 (배치를 아직 실행하지 않았으면 None)
+    """
+    manifest = read_manifest(RESULTS_DIR)
+    if not manifest:
+        return None
+    return cached_call("backtest_results", _backtest_results, manifest["generated_at"])
@@ -0,0 +1,157 @@
+# 🧮 공통 피처	모든 예측 페이지가 같은 lag/rolling/요일/공휴일 피처를 사용
+# ⚡ 벡터화	센터 × 품목 전체 피처를 배열 연산 한 번으로 계산
+# 🗃️ 캐싱	한 번 계산한 피처 행렬을 페이지 간에 재사용
+
+import numpy as np
+import pandas as pd
+
+from src.calendar import HolidayCalendar
+from src.cube import LogisticsCube
+
+# 피처 정의가 바뀌면 올려서 저장된 모델 등 하위 캐시를 무효화합니다.
+# 2: lag/rolling을 달력 일 대신 센터별 관측 행 기준으로 계산 (원본 shift/rolling과 동일)
+FEATURE_SET_VERSION = 2
+FEATURE_COLUMNS = ["lag_1", "lag_7", "rolling_mean_7", "dow", "is_holiday"]
+ROLLING_WINDOW = 7
+# 시계열 피처가 참조하는 최대 과거 관측 행 수 (lag_7)
+MAX_LOOKBACK = 7
+
+
+def _shift_days(values: np.ndarray, periods: int) -> np.ndarray:
+    """(센터, 행, 품목) 배열을 행 축으로 periods행 미룹니다."""
+    shifted = np.full_like(values, np.nan)
+    shifted[:, periods:, :] = values[:, :-periods, :]
+    return shifted
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """행 축 이동평균 (pandas rolling(window).mean()과 같이 창에 NaN이 있으면 NaN)."""
+    rolled = np.full_like(values, np.nan)
+    if values.shape[1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=1)
+        rolled[:, window - 1:, :] = windows.mean(axis=-1)
+    return rolled
+
+
+def _series_features(values: np.ndarray, observed: np.ndarray) -> dict:
+    """
+    센터별 관측 행 기준으로 시계열 피처를 계산합니다.
+
+    센터마다 관측된 날짜를 앞으로 모아(순서 유지) 행 단위로 shift/rolling한 뒤 원래 날짜 위치로
+    되돌리므로, 센터 DataFrame의 y.shift(1) / shift(7) / rolling(7).mean()과 같습니다
+    (빠진 날짜가 있으면 lag_1은 직전 관측일 값). 미관측 날짜의 피처는 NaN입니다.
+
+    Parameters:
+    - values (np.ndarray): (센터, 날짜, 품목) 물동량
+    - observed (np.ndarray): (센터, 날짜) 관측 여부
+
+    Returns:
+    - dict: 피처 이름 → (센터, 날짜, 품목) 배열
+    """
+    order = np.broadcast_to(np.argsort(~observed, axis=1, kind="stable")[:, :, None], values.shape)
+    packed = np.take_along_axis(values, order, axis=1)
+    features = {
+        "lag_1": _shift_days(packed, 1),
+        "lag_7": _shift_days(packed, 7),
+        "rolling_mean_7": _rolling_mean(packed, ROLLING_WINDOW),
+    }
+    for name, array in features.items():
+        unpacked = np.empty_like(array)
+        np.put_along_axis(unpacked, order, array, axis=1)
+        unpacked[~observed] = np.nan
+        features[name] = unpacked
+    return features
+
+
+class FeatureStore:
+    """
+    저장소(LogisticsCube) 전체에 대한 예측용 피처 행렬입니다.
+
+    시계열 피처(lag_1, lag_7, rolling_mean_7)는 센터별 관측 행 기준으로 계산해 cube와 같은
+    (센터, 날짜, 품목) 배열로, 날짜 피처(dow, is_holiday)는 날짜 축 1차원 배열로 보관합니다.
+    """
+
+    def __init__(self, cube: LogisticsCube, arrays: dict, dow: np.ndarray, is_holiday: np.ndarray):
+        self.cube = cube
+        self.arrays = arrays
+        self.dow = dow
+        self.is_holiday = is_holiday
+
+    @classmethod
+    def build(cls, cube: LogisticsCube, calendar: HolidayCalendar) -> "FeatureStore":
+        """
+        모든 센터 × 품목 시계열의 피처를 한 번에 계산합니다.
+
+        Parameters:
+        - cube (LogisticsCube): 물동량 배열 저장소
+        - calendar (HolidayCalendar): 공휴일 달력
+
+        Returns:
+        - FeatureStore
+        """
+        dow = cube.dates.dayofweek.to_numpy()
+        is_holiday = calendar.lookup(cube.dates, "is_holiday").astype(int)
+        return cls(cube, _series_features(cube.values, cube.observed), dow, is_holiday)
+
+    def copy(self, cube: LogisticsCube) -> "FeatureStore":
+        """피처 배열을 복사해 cube(복사된 저장소)에 연결한 새 피처 행렬을 반환합니다."""
+        arrays = {name: np.array(array) for name, array in self.arrays.items()}
+        return FeatureStore(cube, arrays, self.dow, self.is_holiday)
+
+    def extend(self, calendar: HolidayCalendar, start: int) -> None:
+        """
+        cube에 날짜/센터가 추가된 뒤, start 위치 이후의 피처만 다시 계산합니다.
+
+        시계열 피처는 센터별로 최근 MAX_LOOKBACK개 관측 행까지만 참조하므로, 모든 센터의
+        start 이전 MAX_LOOKBACK개 관측을 포함하는 구간만 잘라서 계산합니다.
+
+        Parameters:
+        - calendar (HolidayCalendar): 새 날짜를 포함하는 공휴일 달력
+        - start (int): 값이 바뀐 가장 이른 날짜 위치
+        """
+        values = self.cube.values
+        for name, array in self.arrays.items():
+            if array.shape != values.shape:
+                grown = np.full_like(values, np.nan)
+                grown[:array.shape[0], :array.shape[1]] = array
+                self.arrays[name] = grown
+
+        observed = self.cube.observed
+        base = start
+        for row in observed[:, :start]:
+            previous = np.flatnonzero(row)
+            base = min(base, int(previous[-MAX_LOOKBACK]) if len(previous) >= MAX_LOOKBACK else 0)
+        for name, array in _series_features(values[:, base:, :], observed[:, base:]).items():
+            self.arrays[name][:, start:, :] = array[:, start - base:, :]
+
+        self.dow = self.cube.dates.dayofweek.to_numpy()
+        self.is_holiday = calendar.lookup(self.cube.dates, "is_holiday").astype(int)
+
+    def series_frame(self, center: str, item: str, columns: list = None) -> pd.DataFrame:
+        """
+        단일 센터 × 품목의 학습용 DataFrame (ds, y, 피처...)을 반환합니다.
+
+        관측된 날짜만 포함하며, 요청한 피처 중 결측이 있는 행(시계열 앞부분)은 제외합니다.
+
+        Parameters:
+        - center (str): 센터명
+        - item (str): 품목명
+        - columns (list): 포함할 피처 목록 (기본값: FEATURE_COLUMNS 전체)
+
+        Returns:
+        - pd.DataFrame: ds, y 및 요청한 피처 컬럼
+        """
+        columns = FEATURE_COLUMNS if columns is None else columns
+        c = self.cube.center_index[center]
+        i = self.cube.item_index[item]
+        mask = self.cube.observed[c]
+
+        frame = {"ds": self.cube.dates[mask], "y": self.cube.values[c, mask, i]}
+        for col in columns:
+            if col == "dow":
+                frame[col] = self.dow[mask]
+            elif col == "is_holiday":
+                frame[col] = self.is_holiday[mask]
+            else:
+                frame[col] = self.arrays[col][c, mask, i]
+        return pd.DataFrame(frame).dropna().reset_index(drop=True)
@@ -0,0 +1,212 @@
+# 🔌 예측 서비스	Streamlit 없이 같은 src 코드로 예측 · 이상치 · 지표를 제공 (main.py API 백엔드)
+# 🤝 요청 병합	같은 요청이 동시에 들어오면 한 번만 계산하고 결과를 공유
+# 🧠 모델 캐시	메모리 LRU → 디스크 레지스트리 → 학습 순으로 모델 조회
+
+import asyncio
+import datetime
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.batch import RESULTS_DIR, BacktestResults, read_manifest
+from src.forecasters import SeriesSpec, available_forecasters, make_forecaster
+from src.ingest import DEFAULT_SOURCE
+from src.instrument import record_cache
+from src.metrics import regression_metrics
+from src.model_registry import ModelRegistry
+from src.store import LiveStore
+
+# 등록된 모든 예측 모델 (lgbm, prophet 및 기준선)
+FORECAST_MODELS = available_forecasters()
+DEFAULT_MAX_MODELS = 256
+
+
+class ResultsNotFound(LookupError):
+    """요청한 모델/기간의 평가 지표가 없는 경우 (API는 404로 응답)."""
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    """DataFrame을 JSON 응답용 레코드로 변환합니다 (NaN → None)."""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def _number(value: float, digits: int = 4):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+class RequestCoalescer:
+    """
+    같은 키의 요청이 처리 중이면 새로 계산하지 않고 진행 중인 결과를 함께 기다립니다.
+
+    계산은 스레드 풀에서 실행되어 이벤트 루프를 막지 않습니다.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor):
+        self.executor = executor
+        self.started = 0
+        self.coalesced = 0
+        self._inflight = {}
+
+    async def run(self, key, fn, *args):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.started += 1
+            future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 한 요청이 취소되어도 같은 결과를 기다리는 다른 요청에는 영향이 없도록 shield
+        return await asyncio.shield(future)
+
+
+class ForecastService:
+    """
+    API 프로세스 하나가 공유하는 예측 서비스입니다.
+
+    Attributes:
+    - store (LiveStore): 데이터 상태 (원본 CSV에 추가된 행은 요청 시 증분 반영)
+    - registry (ModelRegistry): 디스크 모델 레지스트리 (대시보드와 공유)
+    - coalescer (RequestCoalescer): 동시 동일 요청 병합기
+    """
+
+    def __init__(self, source_path: str = DEFAULT_SOURCE, registry: ModelRegistry = None,
+                 max_models: int = DEFAULT_MAX_MODELS, max_workers: int = None):
+        self.store = LiveStore(source_path)
+        self.registry = registry or ModelRegistry()
+        self.max_models = max_models
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="forecast")
+        self.coalescer = RequestCoalescer(self.executor)
+        self.model_stats = {"memory": 0, "disk": 0, "fit": 0}
+        self._models = OrderedDict()
+        self._models_lock = threading.Lock()
+        self._results = None
+        self._global_metrics = {}
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, key: tuple, fn, *args):
+        """fn(*args)를 스레드 풀에서 실행합니다 (같은 key의 동시 요청은 병합)."""
+        return await self.coalescer.run(key, fn, *args)
+
+    def stats(self) -> dict:
+        return {
+            "data_version": self.store.version,
+            "requests_started": self.coalescer.started,
+            "requests_coalesced": self.coalescer.coalesced,
+            "models_in_memory": len(self._models),
+            "model_cache": dict(self.model_stats),
+        }
+
+    def _cached_model(self, cache_key: tuple, load_or_fit):
+        with self._models_lock:
+            model = self._models.get(cache_key)
+            record_cache("model_memory", model is not None, kind=cache_key[0])
+            if model is not None:
+                self._models.move_to_end(cache_key)
+                self.model_stats["memory"] += 1
+                return model
+
+        model, source = load_or_fit()
+        with self._models_lock:
+            self.model_stats[source] += 1
+            self._models[cache_key] = model
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+        return model
+
+    def _predict(self, kind: str, spec: SeriesSpec, train_df: pd.DataFrame, test_df: pd.DataFrame) -> np.ndarray:
+        def load_or_fit():
+            # 예측 페이지와 같은 구성/키로 레지스트리의 모델을 공유
+            forecaster = make_forecaster(kind).fit(train_df, self.registry, spec)
+            return forecaster, "disk" if forecaster.status == "cached" else "fit"
+
+        cache_key = (kind, spec.center, spec.item, spec.period_days, spec.data_fingerprint)
+        forecaster = self._cached_model(cache_key, load_or_fit)
+        return forecaster.predict(test_df)["yhat"].to_numpy()
+
+    def forecast(self, center: str, item: str, period_days: int = 14, kind: str = "lgbm") -> dict:
+        """
+        단일 센터 × 품목의 마지막 period_days일 예측과 지표를 반환합니다 (예측 페이지와 같은 구간).
+
+        Raises:
+        - KeyError: 센터/품목이 없는 경우
+        - ValueError: 모델 종류가 잘못됐거나 학습 데이터가 부족한 경우
+        """
+        if kind not in FORECAST_MODELS:
+            raise ValueError(f"지원하지 않는 모델 종류: {kind}")
+        self.store.sync()
+        features = self.store.features
+        cube = features.cube
+        if center not in cube.center_index:
+            raise KeyError(f"센터 없음: {center}")
+        if item not in cube.item_index:
+            raise KeyError(f"품목 없음: {item}")
+
+        target_df = features.series_frame(center, item, columns=make_forecaster(kind).columns)
+        if len(target_df) <= period_days:
+            raise ValueError(f"학습 데이터 부족: {center} / {item} ({len(target_df)}일)")
+        train_df = target_df.iloc[:-period_days]
+        test_df = target_df.iloc[-period_days:]
+
+        spec = SeriesSpec(center, item, period_days, cube.center_fingerprint(center))
+        y_pred = self._predict(kind, spec, train_df, test_df)
+        y_true = test_df["y"].to_numpy()
+
+        metrics = regression_metrics(y_true, y_pred)
+        return {
+            "center": center,
+            "item": item,
+            "model": kind,
+            "period_days": period_days,
+            "metrics": {name: _number(value) for name, value in metrics.items()},
+            "forecast": [
+                {"ds": ds.strftime("%Y-%m-%d"), "y": _number(y), "yhat": _number(yhat, 2)}
+                for ds, y, yhat in zip(test_df["ds"], y_true, y_pred)
+            ],
+        }
+
+    def anomalies(self, start: datetime.date = None, end: datetime.date = None, centers: list = None,
+                  items: list = None, z_thresh: float = None, limit: int = 100) -> list[dict]:
+        """기간 내 전체 네트워크 이상치를 |Z| 내림차순으로 반환합니다 (최대 limit건)."""
+        self.store.sync()
+        engine = self.store.anomalies() if z_thresh is None else self.store.anomalies(z_thresh)
+        outliers = engine.outliers(start, end, centers or None, items or None).head(limit)
+        return _records(outliers.assign(date=outliers["date"].dt.strftime("%Y-%m-%d")))
+
+    def metrics(self, period_days: int = 14, kind: str = "lgbm") -> dict:
+        """
+        시리즈별 평가 지표를 반환합니다.
+
+        배치 백테스트 결과(`python -m src.batch backtest`)가 있으면 그대로 사용하고,
+        없으면 kind="global"일 때만 글로벌 모델로 계산합니다.
+
+        Raises:
+        - ResultsNotFound: 저장된 결과가 없고 실시간 계산도 할 수 없는 경우
+        """
+        manifest = read_manifest(RESULTS_DIR)
+        if manifest and (self._results is None or self._results.manifest != manifest):
+            self._results = BacktestResults.read(RESULTS_DIR)
+        results = self._results if manifest else None
+        if results is not None and results.has(kind, period_days):
+            return {
+                "source": "batch",
+                "generated_at": results.manifest["generated_at"],
+                "series": _records(results.series_metrics(kind, period_days)),
+            }
+        if kind == "global":
+            from src.global_model import fit_global_model
+
+            self.store.sync()
+            key = (period_days, self.store.version)
+            if key not in self._global_metrics:
+                # 데이터 버전이 바뀌면 이전 결과는 버림
+                self._global_metrics = {
+                    key: fit_global_model(self.store.features, period_days).holdout_metrics()
+                }
+            return {"source": "live", "generated_at": None, "series": _records(self._global_metrics[key])}
+        raise ResultsNotFound(f"저장된 {kind} {period_days}일 백테스트 결과가 없습니다.")
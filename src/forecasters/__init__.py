@@ -0,0 +1,18 @@
+# 🧩 예측 모델 패키지	페이지 · 배치 · API가 같은 fit/predict 경로로 모델을 사용
+# 💤 지연 import	prophet / lightgbm은 해당 모델을 처음 학습할 때만 import
+# 📏 기준선	naive / seasonal_naive / weekday_mean 등 가벼운 비교 모델 등록
+#
+# 사용법: from src.forecasters import holdout_forecast, make_forecaster
+#         register_forecaster("my_model", "my_package.module:MyForecaster", "내 모델")
+
+from src.forecasters.base import Forecaster, SeriesSpec
+from src.forecasters.holdout import HoldoutForecast, holdout_forecast
+from src.forecasters.registry import (
+    available_forecasters, forecaster_label, get_forecaster_class, is_available, make_forecaster,
+    register_forecaster,
+)
+
+__all__ = [
+    "Forecaster", "HoldoutForecast", "SeriesSpec", "available_forecasters", "forecaster_label",
+    "get_forecaster_class", "holdout_forecast", "is_available", "make_forecaster", "register_forecaster",
+]
@@ -0,0 +1,91 @@
+# 🧩 공통 인터페이스	모든 예측 모델이 같은 fit(train_df) / predict(test_df) 형식을 따름
+# 🔑 저장 키	SeriesSpec으로 모델 레지스트리 키(센터, 품목, 예측 기간, 데이터 지문)를 전달
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class SeriesSpec:
+    """
+    모델 레지스트리 키를 만드는 데 필요한 시계열 정보입니다.
+
+    Attributes:
+    - center (str): 센터명
+    - item (str): 품목명
+    - period_days (int): 평가(예측) 기간
+    - data_fingerprint (str): 학습 데이터 지문 (센터 단위: LogisticsCube.center_fingerprint)
+    - key_extra (dict): 모델 키에 추가로 포함할 구성 (예: 학습 구간을 정한 피처 목록)
+    """
+
+    center: str
+    item: str
+    period_days: int
+    data_fingerprint: str
+    key_extra: dict = None
+
+
+class Forecaster:
+    """
+    단일 센터 × 품목 시계열 예측 모델의 공통 인터페이스입니다.
+
+    train_df/test_df는 FeatureStore.series_frame 형식(ds, y, 피처 컬럼)이며,
+    predict는 ds, yhat (모델에 따라 yhat_lower, yhat_upper) 컬럼의 DataFrame을 반환합니다.
+    음수 예측의 0 보정은 기존 예측 경로가 보정하던 모델만 합니다 (clip_negative: LightGBM,
+    Prophet은 prophet_backend.predict에서 구간 컬럼까지 보정). 기준선 모델은 값을 그대로 둡니다.
+
+    Attributes:
+    - name (str): 레지스트리 등록 이름
+    - columns (list): 학습/예측에 필요한 피처 컬럼 (series_frame의 columns)
+    - requires (str): 필요한 외부 패키지 이름 (없으면 None)
+    - clip_negative (bool): _frame에서 음수 예측값을 0으로 보정할지 여부
+    - params (dict): 모델 구성 (default_params에 생성 인자를 덮어씀)
+    - n_jobs (int): 학습 스레드 수 (지원하는 모델만 사용하며 모델 키에는 포함하지 않음)
+    - status (str): 마지막 fit 결과 ("cached" | "warm" | "cold")
+    """
+
+    name = None
+    columns = []
+    requires = None
+    clip_negative = False
+    default_params = {}
+
+    def __init__(self, n_jobs: int = None, **params):
+        self.params = {**self.default_params, **params}
+        self.n_jobs = n_jobs
+        self.model = None
+        self.status = None
+
+    def fit(self, train_df: pd.DataFrame, registry=None, spec: SeriesSpec = None) -> "Forecaster":
+        """
+        모델을 학습합니다.
+
+        Parameters:
+        - train_df (pd.DataFrame): ds, y 및 피처 컬럼
+        - registry (ModelRegistry): 지정하면 저장된 모델을 재사용하고 학습 결과를 저장
+        - spec (SeriesSpec): registry 키 구성 (registry를 쓸 때 필수)
+
+        Returns:
+        - Forecaster: self
+        """
+        raise NotImplementedError
+
+    def predict(self, test_df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """
+        test_df의 각 날짜를 예측합니다.
+
+        Returns:
+        - pd.DataFrame: ds, yhat (및 모델별 구간 컬럼)
+        """
+        raise NotImplementedError
+
+    def _frame(self, test_df: pd.DataFrame, yhat) -> pd.DataFrame:
+        yhat = np.asarray(yhat, dtype=np.float64)
+        if self.clip_negative:
+            yhat = np.where(yhat < 0, 0, yhat)
+        return pd.DataFrame({
+            "ds": test_df["ds"].to_numpy(),
+            "yhat": yhat,
+        })
@@ -0,0 +1,61 @@
+# 📏 기준선 모델	학습 비용이 거의 없는 비교용 예측 (외부 패키지 불필요)
+# 🔁 Naive	전일 값 (lag_1) / 🗓️ Seasonal Naive	7일 전 값 (lag_7)
+# 📊 요일 평균	학습 구간 최근 N주의 요일별 평균
+
+import numpy as np
+import pandas as pd
+
+from src.forecasters.base import Forecaster, SeriesSpec
+
+
+class _LagForecaster(Forecaster):
+    """피처 컬럼 하나(과거 값)를 그대로 예측값으로 사용하는 기준선입니다."""
+
+    def fit(self, train_df: pd.DataFrame, registry=None, spec: SeriesSpec = None) -> "_LagForecaster":
+        self.status = "cold"
+        return self
+
+    def predict(self, test_df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        return self._frame(test_df, test_df[self.columns[0]])
+
+
+class NaiveForecaster(_LagForecaster):
+    """전일 물동량(lag_1)을 예측값으로 사용합니다."""
+
+    name = "naive"
+    columns = ["lag_1"]
+
+
+class SeasonalNaiveForecaster(_LagForecaster):
+    """같은 요일인 7일 전 물동량(lag_7)을 예측값으로 사용합니다."""
+
+    name = "seasonal_naive"
+    columns = ["lag_7"]
+
+
+class WeekdayMeanForecaster(Forecaster):
+    """
+    학습 구간 마지막 weeks주의 요일별 평균을 예측값으로 사용합니다.
+
+    해당 요일의 관측이 없으면 같은 구간 전체 평균을 사용합니다.
+
+    Parameters:
+    - weeks (int): 평균을 낼 최근 주 수 (기본값: 8)
+    """
+
+    name = "weekday_mean"
+    columns = ["dow"]
+    default_params = {"weeks": 8}
+
+    def fit(self, train_df: pd.DataFrame, registry=None, spec: SeriesSpec = None) -> "WeekdayMeanForecaster":
+        start = train_df["ds"].iloc[-1] - pd.Timedelta(days=7 * self.params["weeks"] - 1)
+        recent = train_df[train_df["ds"] >= start]
+        by_dow = recent.groupby("dow")["y"].mean()
+        means = np.full(7, recent["y"].mean())
+        means[by_dow.index.to_numpy(dtype=int)] = by_dow.to_numpy()
+        self.model = means
+        self.status = "cold"
+        return self
+
+    def predict(self, test_df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        return self._frame(test_df, self.model[test_df["dow"].to_numpy(dtype=int)])
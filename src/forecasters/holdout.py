@@ -0,0 +1,82 @@
+# 🧪 평가 구간 예측	마지막 period_days일을 평가 구간으로 학습/예측 (예측 페이지·API 공통 경로)
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.features import FeatureStore
+from src.forecasters.base import SeriesSpec
+from src.forecasters.registry import make_forecaster
+from src.metrics import regression_metrics
+
+
+@dataclass
+class HoldoutForecast:
+    """
+    단일 센터 × 품목의 평가 구간 예측 결과입니다.
+
+    Attributes:
+    - name (str): 모델 이름
+    - train (pd.DataFrame): 학습 데이터 (ds, y, 피처)
+    - test (pd.DataFrame): 평가 데이터 (ds, y, 피처)
+    - forecast (pd.DataFrame): ds, yhat (및 모델별 구간 컬럼)
+    - status (str): 모델 준비 방식 ("cached" | "warm" | "cold")
+    """
+
+    name: str
+    train: pd.DataFrame
+    test: pd.DataFrame
+    forecast: pd.DataFrame
+    status: str
+
+    @property
+    def y_true(self) -> np.ndarray:
+        return self.test["y"].to_numpy()
+
+    @property
+    def y_pred(self) -> np.ndarray:
+        return self.forecast["yhat"].to_numpy()
+
+    def metrics(self) -> dict:
+        """평가 구간의 MAE, RMSE, R²를 반환합니다."""
+        return regression_metrics(self.y_true, self.y_pred)
+
+
+def holdout_forecast(features: FeatureStore, name: str, center: str, item: str, period_days: int,
+                     registry=None, columns: list = None, params: dict = None,
+                     **predict_kwargs) -> HoldoutForecast:
+    """
+    공유 피처 행렬에서 시계열을 잘라 마지막 period_days일을 예측합니다.
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - name (str): 모델 이름 (available_forecasters())
+    - center, item (str): 센터명, 품목명
+    - period_days (int): 평가(예측) 기간
+    - registry (ModelRegistry): 지정하면 저장된 모델을 재사용
+    - columns (list): 결측 제거 기준 피처 (기본값: 모델의 피처). 여러 모델의 학습 구간을
+      맞출 때 지정하며, 모델 피처와 다르면 모델 키에 포함됩니다.
+    - params (dict): 모델 생성 인자
+    - predict_kwargs: 모델별 predict 인자 (예: Prophet의 uncertainty_samples)
+
+    Returns:
+    - HoldoutForecast
+
+    Raises:
+    - ValueError: 모델 종류가 잘못됐거나 학습 데이터가 부족한 경우
+    """
+    forecaster = make_forecaster(name, **(params or {}))
+    frame_columns = list(dict.fromkeys([*(columns or []), *forecaster.columns]))
+    target_df = features.series_frame(center, item, columns=frame_columns)
+    if len(target_df) <= period_days:
+        raise ValueError(f"학습 데이터 부족: {center} / {item} ({len(target_df)}일)")
+    train_df = target_df.iloc[:-period_days].reset_index(drop=True)
+    test_df = target_df.iloc[-period_days:].reset_index(drop=True)
+
+    key_extra = None
+    if set(frame_columns) != set(forecaster.columns):
+        key_extra = {"train_columns": frame_columns}
+    spec = SeriesSpec(center, item, period_days, features.cube.center_fingerprint(center), key_extra)
+    forecaster.fit(train_df, registry, spec)
+    return HoldoutForecast(name, train_df, test_df, forecaster.predict(test_df, **predict_kwargs), forecaster.status)
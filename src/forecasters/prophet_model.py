@@ -0,0 +1,49 @@
+# 🔮 Prophet	prophet_backend의 학습(웜 스타트 포함)/예측 경로를 Forecaster 형식으로 사용
+
+import pandas as pd
+
+from src.forecasters.base import Forecaster, SeriesSpec
+from src.prophet_backend import PROPHET_PARAMS, PROPHET_REGRESSORS, fit_prophet, get_or_fit_prophet, predict
+
+
+class ProphetForecaster(Forecaster):
+    """
+    외생 변수(공휴일, 요일, 전일 물동량)를 등록한 Prophet 모델입니다.
+
+    Parameters:
+    - regressors (list): 외생 변수 목록 (기본값: PROPHET_REGRESSORS)
+    - n_jobs (int): 사용하지 않음 (Stan 최적화는 단일 스레드)
+    - params: Prophet 생성 인자 (기본값: PROPHET_PARAMS)
+    """
+
+    name = "prophet"
+    columns = PROPHET_REGRESSORS
+    requires = "prophet"
+    default_params = PROPHET_PARAMS
+
+    def __init__(self, regressors: list = None, n_jobs: int = None, **params):
+        super().__init__(n_jobs, **params)
+        if regressors is not None:
+            self.columns = regressors
+
+    def fit(self, train_df: pd.DataFrame, registry=None, spec: SeriesSpec = None) -> "ProphetForecaster":
+        if registry is None or spec is None:
+            self.model = fit_prophet(train_df, self.params, self.columns)
+            self.status = "cold"
+            return self
+
+        # 저장된 모델이 없으면 같은 구성의 직전 모델에서 웜 스타트
+        self.model, self.status = get_or_fit_prophet(
+            registry, spec.center, spec.item, spec.period_days, train_df, spec.data_fingerprint,
+            self.params, self.columns, spec.key_extra,
+        )
+        return self
+
+    def predict(self, test_df: pd.DataFrame, uncertainty_samples: int = 0, **kwargs) -> pd.DataFrame:
+        """
+        Parameters:
+        - uncertainty_samples (int): 예측 구간 시뮬레이션 횟수 (0이면 yhat_lower/yhat_upper 생략)
+        """
+        forecast = predict(self.model, test_df[["ds", *self.columns]], uncertainty_samples)
+        columns = [col for col in ["ds", "yhat", "yhat_lower", "yhat_upper"] if col in forecast.columns]
+        return forecast[columns].reset_index(drop=True)
@@ -0,0 +1,72 @@
+# 🗂️ 모델 등록부	이름 → 모델 클래스 ("모듈:클래스" 문자열로 등록하면 처음 사용할 때 import)
+# 💤 지연 import	예측 모델을 쓰지 않는 페이지는 prophet / lightgbm / sklearn을 import 하지 않음
+
+import importlib
+import importlib.util
+
+from src.forecasters.base import Forecaster
+
+_REGISTRY = {}
+_LABELS = {}
+
+
+def register_forecaster(name: str, target, label: str = None) -> None:
+    """
+    예측 모델을 등록합니다 (같은 이름이면 덮어씀).
+
+    Parameters:
+    - name (str): 모델 이름 (예: "lgbm")
+    - target: Forecaster 하위 클래스 또는 "모듈경로:클래스명" 문자열 (지연 import)
+    - label (str): 화면 표시 이름 (기본값: name)
+    """
+    _REGISTRY[name] = target
+    _LABELS[name] = label or name
+
+
+def get_forecaster_class(name: str) -> type:
+    """
+    등록된 모델 클래스를 반환합니다 (문자열로 등록된 경우 이때 모듈을 import).
+
+    Raises:
+    - ValueError: 등록되지 않은 이름인 경우
+    """
+    if name not in _REGISTRY:
+        raise ValueError(f"지원하지 않는 모델 종류: {name}")
+    target = _REGISTRY[name]
+    if isinstance(target, str):
+        module_name, class_name = target.split(":")
+        target = getattr(importlib.import_module(module_name), class_name)
+        _REGISTRY[name] = target
+    return target
+
+
+def make_forecaster(name: str, **params) -> Forecaster:
+    """등록된 모델의 (학습 전) 인스턴스를 만듭니다."""
+    return get_forecaster_class(name)(**params)
+
+
+def forecaster_label(name: str) -> str:
+    return _LABELS.get(name, name)
+
+
+def is_available(name: str) -> bool:
+    """모델에 필요한 외부 패키지가 설치되어 있는지 확인합니다 (패키지를 import 하지는 않음)."""
+    requires = get_forecaster_class(name).requires
+    return requires is None or importlib.util.find_spec(requires) is not None
+
+
+def available_forecasters(installed_only: bool = False) -> list:
+    """
+    등록된 모델 이름 목록을 등록 순서대로 반환합니다.
+
+    Parameters:
+    - installed_only (bool): True면 필요한 패키지가 설치된 모델만 반환
+    """
+    return [name for name in _REGISTRY if not installed_only or is_available(name)]
+
+
+register_forecaster("lgbm", "src.forecasters.lgbm:LightGBMForecaster", "LightGBM")
+register_forecaster("prophet", "src.forecasters.prophet_model:ProphetForecaster", "Prophet")
+register_forecaster("naive", "src.forecasters.baselines:NaiveForecaster", "Naive (전일)")
+register_forecaster("seasonal_naive", "src.forecasters.baselines:SeasonalNaiveForecaster", "Seasonal Naive (7일 전)")
+register_forecaster("weekday_mean", "src.forecasters.baselines:WeekdayMeanForecaster", "요일 평균 (최근 8주)")
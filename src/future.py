@@ -0,0 +1,219 @@
+# 🔭 미래 예측	마지막 관측일 다음 날부터 horizon일을 예측 (실제값이 없는 실제 미래 구간)
+# 🔁 재귀 예측	글로벌 LightGBM 예측값으로 lag/rolling 피처를 갱신하며 하루씩 전진
+# ⚡ 일괄 계산	하루마다 모든 센터 × 품목을 한 번의 predict로 계산 (시리즈별 반복 없음)
+#
+# 사용법: python -m src.future --horizon 14 --method global
+
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.calendar import HolidayCalendar
+from src.features import MAX_LOOKBACK, ROLLING_WINDOW, FeatureStore
+from src.instrument import span
+
+FUTURE_HORIZONS = [7, 14, 30]
+# 차트에 함께 표시할 최근 실제값 일수
+HISTORY_DAYS = 56
+FUTURE_METHODS = {
+    "global": "Global LightGBM (재귀 예측)",
+    "seasonal_naive": "Seasonal Naive (최근 7일 반복)",
+}
+
+
+@dataclass
+class FutureForecast:
+    """
+    모든 센터 × 품목의 미래 예측 결과입니다.
+
+    Attributes:
+    - features (FeatureStore): 예측에 사용한 피처 행렬
+    - method (str): 예측 방식 (FUTURE_METHODS 키)
+    - dates (pd.DatetimeIndex): 예측 날짜 (마지막 관측일 다음 날부터)
+    - predictions (np.ndarray): (센터 수, horizon, 품목 수) 예측 (최근 관측이 없는 시리즈는 NaN)
+    """
+
+    features: FeatureStore
+    method: str
+    dates: pd.DatetimeIndex
+    predictions: np.ndarray
+
+    @property
+    def horizon(self) -> int:
+        return len(self.dates)
+
+    def head(self, horizon: int) -> "FutureForecast":
+        """앞 horizon일만 남긴 결과를 반환합니다 (재귀 예측은 앞부분이 horizon과 무관하게 같음)."""
+        return FutureForecast(self.features, self.method, self.dates[:horizon], self.predictions[:, :horizon, :])
+
+    def series(self, center: str, item: str) -> pd.DataFrame:
+        """
+        단일 센터 × 품목의 미래 예측을 반환합니다.
+
+        Returns:
+        - pd.DataFrame: ds, yhat 컬럼
+        """
+        cube = self.features.cube
+        return pd.DataFrame({
+            "ds": self.dates,
+            "yhat": self.predictions[cube.center_index[center], :, cube.item_index[item]],
+        })
+
+    def history(self, center: str, item: str, days: int = HISTORY_DAYS) -> pd.DataFrame:
+        """
+        미래 예측과 함께 그릴 최근 days일 실제값을 반환합니다.
+
+        Returns:
+        - pd.DataFrame: ds, y 컬럼 (미관측일 제외)
+        """
+        cube = self.features.cube
+        c = cube.center_index[center]
+        frame = pd.DataFrame({
+            "ds": cube.dates[-days:],
+            "y": cube.values[c, -days:, cube.item_index[item]],
+        })
+        return frame.dropna().reset_index(drop=True)
+
+    def frame(self) -> pd.DataFrame:
+        """
+        전체 예측을 긴 형식으로 반환합니다 (예측이 없는 시리즈 제외).
+
+        Returns:
+        - pd.DataFrame: 센터, 품목, ds, yhat 컬럼
+        """
+        cube = self.features.cube
+        c_idx, d_idx, i_idx = np.nonzero(~np.isnan(self.predictions))
+        return pd.DataFrame({
+            "센터": np.asarray(cube.centers, dtype=object)[c_idx],
+            "품목": np.asarray(cube.items, dtype=object)[i_idx],
+            "ds": self.dates[d_idx],
+            "yhat": self.predictions[c_idx, d_idx, i_idx],
+        })
+
+
+def future_dates(features: FeatureStore, horizon: int) -> pd.DatetimeIndex:
+    """마지막 관측일 다음 날부터 horizon일의 날짜 축을 반환합니다."""
+    last = features.cube.dates[-1]
+    return pd.date_range(last + pd.Timedelta(days=1), periods=horizon, freq="D")
+
+
+def _recent_history(features: FeatureStore) -> np.ndarray:
+    """(센터, MAX_LOOKBACK일, 품목) 최근 물동량 (미관측일은 NaN)."""
+    cube = features.cube
+    history = np.full((cube.shape[0], MAX_LOOKBACK, cube.shape[2]), np.nan)
+    recent = cube.values[:, -MAX_LOOKBACK:, :]
+    history[:, MAX_LOOKBACK - recent.shape[1]:, :] = recent
+    return history
+
+
+def recursive_rollout(model, features: FeatureStore, scales: np.ndarray, dow: np.ndarray,
+                      is_holiday: np.ndarray) -> np.ndarray:
+    """
+    학습된 글로벌 모델로 하루씩 전진하며 모든 시리즈를 예측합니다.
+
+    매 단계에서 모든 센터 × 품목 행을 한 번에 예측하고, 예측값을 최근 물동량 창에 밀어 넣어
+    다음 날의 lag_1 / lag_7 / rolling_mean_7을 만듭니다. 학습 피처 rolling_mean_7은 당일 값을
+    포함하지만 미래 시점에서는 당일 값을 알 수 없으므로 직전 7일 평균으로 대체합니다.
+    최근 7일 중 결측이 있는 피처는 NaN 그대로 넘겨 LightGBM의 결측 처리에 맡기며,
+    최근 7일 관측이 하나도 없는 시리즈(운영 중단 센터 등)는 예측하지 않습니다(NaN).
+
+    Parameters:
+    - model: fit_window로 학습한 글로벌 LGBMRegressor
+    - features (FeatureStore): 학습에 사용한 피처 행렬
+    - scales (np.ndarray): (센터 수, 품목 수) 시리즈별 스케일
+    - dow (np.ndarray): 예측 날짜별 요일 (0=월)
+    - is_holiday (np.ndarray): 예측 날짜별 공휴일 여부 (0/1)
+
+    Returns:
+    - np.ndarray: (센터 수, horizon, 품목 수) 예측 (역스케일, 음수 제거)
+    """
+    from src.global_model import GLOBAL_FEATURE_COLUMNS
+
+    n_centers, _, n_items = features.cube.shape
+    horizon = len(dow)
+    c_idx, i_idx = np.divmod(np.arange(n_centers * n_items), n_items)
+    scale = scales[c_idx, i_idx]
+
+    history = _recent_history(features)
+    active = (~np.isnan(history)).any(axis=1).ravel()
+    predictions = np.full((n_centers, horizon, n_items), np.nan)
+    for step in range(horizon):
+        with np.errstate(invalid="ignore"):
+            rolling = history[:, -ROLLING_WINDOW:, :].mean(axis=1)
+        X = pd.DataFrame({
+            "lag_1": history[:, -1, :].ravel() / scale,
+            "lag_7": history[:, -7, :].ravel() / scale,
+            "rolling_mean_7": rolling.ravel() / scale,
+            "dow": np.full(len(c_idx), dow[step]),
+            "is_holiday": np.full(len(c_idx), is_holiday[step]),
+            "center_code": c_idx,
+            "item_code": i_idx,
+        })[GLOBAL_FEATURE_COLUMNS]
+
+        y_pred = np.full(len(c_idx), np.nan)
+        if active.any():
+            y_pred[active] = model.predict(X[active]) * scale[active]
+        y_pred = np.where(y_pred < 0, 0, y_pred).reshape(n_centers, n_items)
+        predictions[:, step, :] = y_pred
+        history = np.concatenate([history[:, 1:, :], y_pred[:, None, :]], axis=1)
+    return predictions
+
+
+def seasonal_naive_future(features: FeatureStore, horizon: int) -> np.ndarray:
+    """최근 7일 물동량을 요일에 맞춰 반복한 (센터 수, horizon, 품목 수) 예측을 반환합니다."""
+    history = _recent_history(features)[:, -7:, :]
+    return history[:, np.arange(horizon) % 7, :]
+
+
+def forecast_future(features: FeatureStore, calendar: HolidayCalendar, horizon: int = 30,
+                    method: str = "global", params: dict = None) -> FutureForecast:
+    """
+    모든 센터 × 품목의 마지막 관측일 이후 horizon일을 예측합니다.
+
+    - global: 전체 기간으로 글로벌 LightGBM을 한 번 학습한 뒤 재귀 예측
+    - seasonal_naive: 최근 7일 반복 (비교용 기준선)
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - calendar (HolidayCalendar): 예측 구간을 포함하는 공휴일 달력
+    - horizon (int): 예측 일수
+    - method (str): 예측 방식 (FUTURE_METHODS 키)
+    - params (dict): LGBMRegressor 하이퍼파라미터 (global만 사용)
+
+    Returns:
+    - FutureForecast
+
+    Raises:
+    - ValueError: 예측 방식이 잘못된 경우
+    """
+    if method not in FUTURE_METHODS:
+        raise ValueError(f"지원하지 않는 예측 방식: {method}")
+    dates = future_dates(features, horizon)
+    if method == "seasonal_naive":
+        return FutureForecast(features, method, dates, seasonal_naive_future(features, horizon))
+
+    from src.global_model import fit_window
+
+    model, scales = fit_window(features, 0, len(features.cube.dates), params)
+    dow = dates.dayofweek.to_numpy()
+    is_holiday = calendar.lookup(dates, "is_holiday").astype(int)
+    with span("model_predict", kind="global_future"):
+        predictions = recursive_rollout(model, features, scales, dow, is_holiday)
+    return FutureForecast(features, method, dates, predictions)
+
+
+if __name__ == "__main__":
+    from src.dataset import get_calendar, get_features
+
+    parser = argparse.ArgumentParser(description="전체 센터 × 품목 미래 예측")
+    parser.add_argument("--horizon", type=int, default=14)
+    parser.add_argument("--method", choices=list(FUTURE_METHODS), default="global")
+    parser.add_argument("--output", default=None, help="예측 결과 CSV 경로 (미지정 시 요약만 출력)")
+    args = parser.parse_args()
+
+    result = forecast_future(get_features(), get_calendar(), args.horizon, args.method).frame()
+    if args.output:
+        result.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(result.groupby("ds")["yhat"].sum().round(1).to_string())
@@ -0,0 +1,49 @@
+# 🔭 미래 예측 화면	예측 페이지 공통 "미래 예측" 섹션 (차트 + 표)
+# 🧩 재사용	LightGBM / Prophet / 모델 비교 페이지가 같은 함수로 같은 화면을 그림
+
+import pandas as pd
+import streamlit as st
+
+from src.dataset import get_future_forecast
+from src.future import FUTURE_METHODS
+from src.instrument import plotly_chart
+from src.visualizer import future_forecast_chart
+
+
+def render_future_forecast(center: str, item: str, period_days: int, note: str = None) -> None:
+    """
+    마지막 관측일 다음 날부터 period_days일의 미래 예측 섹션을 그립니다.
+
+    평가 구간(백테스트)과 달리 실제값이 없는 구간이므로, 전체 시리즈 글로벌 LightGBM의 재귀 예측과
+    계절성 naive 예측을 함께 보여줍니다 (모든 센터 × 품목을 한 번에 계산해 캐시).
+
+    Parameters:
+    - center (str): 센터명
+    - item (str): 품목명
+    - period_days (int): 예측 일수
+    - note (str): 제목 아래에 표시할 안내 문구 (예: 페이지 모델과 다른 모델로 예측함을 알림)
+    """
+    future = get_future_forecast(period_days)
+    st.subheader(
+        f"🔭 미래 {period_days}일 예측 ({future.dates[0]:%Y-%m-%d} ~ {future.dates[-1]:%Y-%m-%d})"
+    )
+    if note:
+        st.caption(note)
+    future_df = future.series(center, item)
+    naive_df = get_future_forecast(period_days, "seasonal_naive").series(center, item)
+    plotly_chart(
+        future_forecast_chart(
+            future.history(center, item),
+            {FUTURE_METHODS["global"]: future_df, FUTURE_METHODS["seasonal_naive"]: naive_df},
+            f"{center} - {item} 미래 예측",
+        ),
+        use_container_width=True
+    )
+    st.dataframe(
+        pd.DataFrame({
+            "날짜": future_df["ds"],
+            FUTURE_METHODS["global"]: future_df["yhat"],
+            FUTURE_METHODS["seasonal_naive"]: naive_df["yhat"],
+        }).set_index("날짜").round(2),
+        use_container_width=True
+    )
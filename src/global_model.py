@@ -0,0 +1,244 @@
+# 🌐 글로벌 모델	모든 센터 × 품목 시계열을 하나의 LightGBM으로 학습
+# 🏷️ 범주형 피처	센터/품목 코드를 categorical feature로 사용
+# ⚖️ 시리즈별 스케일	학습 구간 평균으로 나눠 물동량 규모 차이를 제거
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.features import FEATURE_COLUMNS, FeatureStore
+from src.instrument import span
+from src.metrics import regression_metrics
+
+CATEGORICAL_COLUMNS = ["center_code", "item_code"]
+GLOBAL_FEATURE_COLUMNS = FEATURE_COLUMNS + CATEGORICAL_COLUMNS
+# 시리즈 스케일로 나누는 피처 (물동량 단위)
+SCALED_COLUMNS = ["lag_1", "lag_7", "rolling_mean_7"]
+DEFAULT_PARAMS = {"random_state": 42}
+
+
+def _series_scales(values: np.ndarray, cutoff: int, start: int = 0) -> np.ndarray:
+    """학습 구간 [start, cutoff)의 시리즈별 평균 절댓값 (0 또는 결측이면 1)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # 전부 NaN인 시리즈
+        scales = np.nanmean(np.abs(values[:, start:cutoff, :]), axis=1)
+    return np.where(np.isfinite(scales) & (scales > 0), scales, 1.0)
+
+
+def design_matrix(features: FeatureStore, scales: np.ndarray, day_mask: np.ndarray):
+    """
+    day_mask에 해당하는 날짜의 모든 시리즈 행을 하나의 학습 행렬로 쌓습니다.
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - scales (np.ndarray): (센터 수, 품목 수) 시리즈별 스케일
+    - day_mask (np.ndarray): 날짜 축 bool 마스크
+
+    Returns:
+    - tuple: (X DataFrame, 스케일된 y 배열, (센터, 날짜, 품목) 인덱스 배열 튜플)
+    """
+    cube = features.cube
+    valid = cube.observed[:, :, None] & ~np.isnan(cube.values) & day_mask[None, :, None]
+    for col in SCALED_COLUMNS:
+        valid &= ~np.isnan(features.arrays[col])
+
+    c_idx, d_idx, i_idx = np.nonzero(valid)
+    scale = scales[c_idx, i_idx]
+    X = pd.DataFrame({
+        **{col: features.arrays[col][c_idx, d_idx, i_idx] / scale for col in SCALED_COLUMNS},
+        "dow": features.dow[d_idx],
+        "is_holiday": features.is_holiday[d_idx],
+        "center_code": c_idx,
+        "item_code": i_idx,
+    })[GLOBAL_FEATURE_COLUMNS]
+    y = cube.values[c_idx, d_idx, i_idx] / scale
+    return X, y, (c_idx, d_idx, i_idx)
+
+
+class GlobalModel:
+    """
+    전체 시리즈를 학습한 단일 LightGBM과 마지막 period_days일 평가 예측을 보관합니다.
+
+    Attributes:
+    - model: 학습된 LGBMRegressor
+    - scales (np.ndarray): (센터 수, 품목 수) 시리즈별 스케일
+    - predictions (np.ndarray): (센터 수, period_days, 품목 수) 평가 구간 예측 (역스케일, 음수 제거)
+    - cutoff (int): 평가 구간이 시작되는 날짜 축 위치
+    """
+
+    def __init__(self, features: FeatureStore, model, scales: np.ndarray,
+                 predictions: np.ndarray, cutoff: int, period_days: int):
+        self.features = features
+        self.model = model
+        self.scales = scales
+        self.predictions = predictions
+        self.cutoff = cutoff
+        self.period_days = period_days
+
+    def series_holdout(self, center: str, item: str) -> pd.DataFrame:
+        """
+        단일 센터 × 품목의 평가 구간 실제값/예측값을 반환합니다.
+
+        Returns:
+        - pd.DataFrame: ds, y, yhat 컬럼 (예측이 없는 날짜 제외)
+        """
+        cube = self.features.cube
+        c = cube.center_index[center]
+        i = cube.item_index[item]
+        frame = pd.DataFrame({
+            "ds": cube.dates[self.cutoff:],
+            "y": cube.values[c, self.cutoff:, i],
+            "yhat": self.predictions[c, :, i],
+        })
+        return frame.dropna().reset_index(drop=True)
+
+    def holdout_metrics(self) -> pd.DataFrame:
+        """
+        모든 센터 × 품목의 평가 구간 MAE/RMSE/R²를 한 번에 계산합니다.
+
+        Returns:
+        - pd.DataFrame: 센터, 품목, MAE, RMSE, R2 컬럼 (개별 모델 순위표와 같은 형식)
+        """
+        cube = self.features.cube
+        y_true = np.where(np.isnan(self.predictions), np.nan, cube.values[:, self.cutoff:, :])
+        metrics = regression_metrics(y_true, self.predictions, axis=1)
+
+        c_idx, i_idx = np.nonzero(~np.isnan(metrics["RMSE"]))
+        return pd.DataFrame({
+            "센터": [cube.centers[c] for c in c_idx],
+            "품목": [cube.items[i] for i in i_idx],
+            "MAE": metrics["MAE"][c_idx, i_idx].round(2),
+            "RMSE": metrics["RMSE"][c_idx, i_idx].round(2),
+            "R2": metrics["R2"][c_idx, i_idx].round(3),
+        })
+
+
+def fit_window(features: FeatureStore, train_start: int, origin: int, params: dict = None) -> tuple:
+    """
+    날짜 위치 [train_start, origin) 구간의 모든 시리즈로 글로벌 LightGBM을 학습합니다.
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - train_start (int): 학습 시작 날짜 위치
+    - origin (int): 학습 종료(미포함) 날짜 위치
+    - params (dict): LGBMRegressor 하이퍼파라미터 (기본값: DEFAULT_PARAMS)
+
+    Returns:
+    - tuple: (학습된 모델, (센터 수, 품목 수) 시리즈별 스케일)
+    """
+    from lightgbm import LGBMRegressor
+
+    scales = _series_scales(features.cube.values, origin, train_start)
+    days = np.arange(len(features.cube.dates))
+
+    X_train, y_train, _ = design_matrix(features, scales, (days >= train_start) & (days < origin))
+    model = LGBMRegressor(**(params or DEFAULT_PARAMS))
+    with span("model_fit", kind="global"):
+        model.fit(X_train, y_train, categorical_feature=CATEGORICAL_COLUMNS)
+    return model, scales
+
+
+def fit_predict_window(features: FeatureStore, train_start: int, origin: int, horizon: int,
+                       params: dict = None) -> tuple:
+    """
+    날짜 위치 [train_start, origin) 구간으로 글로벌 LightGBM을 학습하고
+    [origin, origin + horizon) 구간을 예측합니다 (롤링 백테스트의 한 폴드).
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬 (폴드 간 재사용)
+    - train_start (int): 학습 시작 날짜 위치
+    - origin (int): 예측 시작 날짜 위치
+    - horizon (int): 예측 일수
+    - params (dict): LGBMRegressor 하이퍼파라미터 (기본값: DEFAULT_PARAMS)
+
+    Returns:
+    - tuple: (학습된 모델, 스케일, (센터 수, horizon, 품목 수) 예측 배열 — 역스케일, 음수 제거)
+    """
+    cube = features.cube
+    model, scales = fit_window(features, train_start, origin, params)
+    days = np.arange(len(cube.dates))
+
+    X_test, _, (c_idx, d_idx, i_idx) = design_matrix(
+        features, scales, (days >= origin) & (days < origin + horizon)
+    )
+    predictions = np.full((len(cube.centers), horizon, len(cube.items)), np.nan)
+    if len(X_test):
+        y_pred = model.predict(X_test) * scales[c_idx, i_idx]
+        predictions[c_idx, d_idx - origin, i_idx] = np.where(y_pred < 0, 0, y_pred)
+    return model, scales, predictions
+
+
+def fit_global_model(features: FeatureStore, period_days: int, params: dict = None) -> GlobalModel:
+    """
+    마지막 period_days일을 제외한 전체 시리즈로 글로벌 LightGBM을 학습하고 평가 구간을 예측합니다.
+
+    평가 구간은 날짜 축 기준 마지막 period_days일이며, 데이터가 매일 관측되는 경우
+    시리즈별 모델의 `target_df.iloc[-period_days:]`와 같은 구간입니다.
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - period_days (int): 평가 기간 (일)
+    - params (dict): LGBMRegressor 하이퍼파라미터 (기본값: DEFAULT_PARAMS)
+
+    Returns:
+    - GlobalModel
+    """
+    cutoff = len(features.cube.dates) - period_days
+    model, scales, predictions = fit_predict_window(features, 0, cutoff, period_days, params)
+    return GlobalModel(features, model, scales, predictions, cutoff, period_days)
+
+
+def benchmark(features: FeatureStore, period_days: int = 14, max_workers: int = None) -> pd.DataFrame:
+    """
+    시리즈별 개별 모델(병렬 스윕)과 글로벌 모델의 학습 시간 및 평균 지표를 비교합니다.
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - period_days (int): 평가 기간 (일)
+    - max_workers (int): 개별 모델 스윕의 최대 워커 수
+
+    Returns:
+    - pd.DataFrame: 방식별 소요 시간(초), 시리즈 수, 평균 MAE/RMSE/R2
+    """
+    from src.sweep import make_holdout_tasks, run_sweep
+
+    start = time.perf_counter()
+    tasks = make_holdout_tasks(features, period_days)
+    local = pd.DataFrame([
+        outcome.result for outcome in run_sweep(tasks, max_workers=max_workers)
+        if outcome.error is None
+    ])
+    local_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    global_metrics = fit_global_model(features, period_days).holdout_metrics()
+    global_seconds = time.perf_counter() - start
+
+    rows = []
+    for name, seconds, metrics in [
+        ("개별 모델 (센터 × 품목)", local_seconds, local),
+        ("글로벌 모델", global_seconds, global_metrics),
+    ]:
+        rows.append({
+            "방식": name,
+            "소요 시간(초)": round(seconds, 2),
+            "시리즈 수": len(metrics),
+            "MAE": metrics["MAE"].mean(),
+            "RMSE": metrics["RMSE"].mean(),
+            "R2": metrics["R2"].mean(),
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    from src.dataset import get_features
+
+    parser = argparse.ArgumentParser(description="개별 모델 vs 글로벌 모델 벤치마크")
+    parser.add_argument("--period-days", type=int, default=14)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(benchmark(get_features(), args.period_days, args.workers).to_string(index=False))
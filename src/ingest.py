@@ -0,0 +1,140 @@
+# 📥 증분 적재	새 날짜 파일을 검증 후 원본 CSV 끝에 추가 (전체 재작성 없음)
+# ✅ 스키마 검증	컬럼 구성/날짜 형식/중복 (날짜, 센터)/음수 물동량 확인
+# 🗃️ 캐시 갱신	CSV를 다시 파싱하지 않고 컬럼형 캐시를 최신 상태로 저장
+#
+# 사용법: python -m src.ingest data/new_day.csv [--source data/logistics_by_center.csv]
+
+import argparse
+import io
+import os
+
+import pandas as pd
+
+from src.loader import KEY_COLUMNS, load_logistics_data, parse_logistics_csv, write_cache
+
+DEFAULT_SOURCE = os.environ.get("SOPO_DATA_PATH", "data/logistics_by_center.csv")
+
+
+def validate_increment(new_df: pd.DataFrame, columns: list, existing_keys: pd.DataFrame) -> pd.DataFrame:
+    """
+    추가할 행이 기존 데이터 스키마와 맞는지 검증합니다.
+
+    Parameters:
+    - new_df (pd.DataFrame): 추가할 행 ('date'는 datetime으로 변환된 상태)
+    - columns (list): 기존 데이터의 컬럼 순서
+    - existing_keys (pd.DataFrame): 기존 데이터의 (date, center_name) 컬럼
+
+    Returns:
+    - pd.DataFrame: 기존 컬럼 순서로 정렬된 new_df
+
+    Raises:
+    - ValueError: 검증에 실패한 경우 (모든 문제를 한 번에 나열)
+    """
+    problems = []
+    if sorted(new_df.columns) != sorted(columns):
+        missing = sorted(set(columns) - set(new_df.columns))
+        extra = sorted(set(new_df.columns) - set(columns))
+        raise ValueError(f"컬럼 구성이 다릅니다 (누락: {missing}, 추가: {extra})")
+    new_df = new_df[columns]
+
+    if new_df["date"].isna().any():
+        problems.append("날짜가 비어 있는 행이 있습니다.")
+    if new_df["center_name"].isna().any():
+        problems.append("센터명이 비어 있는 행이 있습니다.")
+    if len(existing_keys) and (new_df["date"] < existing_keys["date"].min()).any():
+        problems.append("기존 데이터 시작일보다 이전 날짜가 있습니다.")
+
+    item_columns = [col for col in columns if col not in KEY_COLUMNS]
+    non_numeric = [col for col in item_columns if not pd.api.types.is_numeric_dtype(new_df[col])]
+    if non_numeric:
+        problems.append(f"숫자가 아닌 품목 컬럼: {non_numeric}")
+    elif (new_df[item_columns] < 0).any().any():
+        problems.append("음수 물동량이 있습니다.")
+
+    if new_df.duplicated(KEY_COLUMNS).any():
+        problems.append("파일 안에 중복된 (날짜, 센터) 행이 있습니다.")
+    overlap = new_df[KEY_COLUMNS].merge(existing_keys, how="inner", on=KEY_COLUMNS)
+    if len(overlap):
+        first = overlap.iloc[0]
+        problems.append(
+            f"이미 적재된 (날짜, 센터) 행 {len(overlap)}건 (예: {first['date']:%Y-%m-%d} {first['center_name']})"
+        )
+
+    if problems:
+        raise ValueError("\n".join(problems))
+    return new_df
+
+
+def read_appended_rows(source_path: str, offset: int, columns: list) -> tuple[pd.DataFrame, int]:
+    """
+    원본 CSV에서 offset 바이트 이후에 추가된 행만 읽습니다.
+
+    기록 중인 마지막 줄을 읽지 않도록 마지막 줄바꿈까지만 사용합니다.
+
+    Parameters:
+    - source_path (str): 원본 CSV 경로
+    - offset (int): 이미 반영한 바이트 수
+    - columns (list): 원본 CSV 컬럼 순서
+
+    Returns:
+    - tuple[pd.DataFrame, int]: (추가된 행, 사용한 바이트 수)
+    """
+    with open(source_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    consumed = data.rfind(b"\n") + 1
+    if consumed == 0 or not data[:consumed].strip():
+        return pd.DataFrame(columns=columns), consumed
+    new_df = parse_logistics_csv(io.BytesIO(data[:consumed]), header=None, names=columns)
+    return new_df, consumed
+
+
+def _append_csv(source_path: str, new_df: pd.DataFrame) -> None:
+    needs_newline = False
+    if os.path.getsize(source_path) > 0:
+        with open(source_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+
+    out = new_df.assign(date=new_df["date"].dt.strftime("%Y%m%d"))
+    text = out.to_csv(header=False, index=False, lineterminator="\n")
+    # 한 번의 write로 기록하여 읽는 쪽에서 일부 행만 보이는 구간을 최소화
+    with open(source_path, "ab") as f:
+        f.write(("\n" if needs_newline else "").encode("euc-kr") + text.encode("euc-kr"))
+
+
+def append_daily_file(new_path: str, source_path: str = DEFAULT_SOURCE) -> pd.DataFrame:
+    """
+    새 날짜 파일을 검증한 뒤 원본 CSV에 추가하고 컬럼형 캐시를 갱신합니다.
+
+    실행 중인 대시보드 워커는 다음 요청 때 추가된 바이트만 읽어 증분 반영합니다.
+
+    Parameters:
+    - new_path (str): 추가할 CSV 파일 (원본과 같은 euc-kr 스키마, 헤더 포함)
+    - source_path (str): 원본 CSV 경로
+
+    Returns:
+    - pd.DataFrame: 추가된 행
+    """
+    # 캐시는 원본 dtype으로 저장하므로 스키마 적용 없이 읽음
+    existing = load_logistics_data(source_path, compact=False)
+    new_df = validate_increment(
+        parse_logistics_csv(new_path), list(existing.columns), existing[KEY_COLUMNS]
+    )
+    new_df = new_df.sort_values(KEY_COLUMNS, ignore_index=True)
+
+    _append_csv(source_path, new_df)
+    write_cache(source_path, pd.concat([existing, new_df], ignore_index=True))
+    return new_df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일별 물류 데이터 증분 적재")
+    parser.add_argument("files", nargs="+", help="추가할 CSV 파일 (날짜 순서대로)")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="원본 CSV 경로")
+    args = parser.parse_args()
+
+    for path in args.files:
+        added = append_daily_file(path, args.source)
+        dates = added["date"].dt.strftime("%Y-%m-%d").unique()
+        print(f"{path}: {len(added)}행 적재 (날짜 {', '.join(dates)}, 센터 {added['center_name'].nunique()}곳)")
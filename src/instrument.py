@@ -0,0 +1,304 @@
+# 🔬 계측	핵심 구간(span)의 소요 시간/메모리와 캐시 적중률/축출 수를 프로세스 단위로 집계
+# 📈 백분위	구간별 최근 SOPO_SPAN_SAMPLES회 기록으로 p50/p95/p99 계산
+# 📤 내보내기	JSON 스냅샷 + Prometheus 텍스트 (SOPO_METRICS_PORT 지정 시 /metrics HTTP 노출, 기본 127.0.0.1)
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+MAX_SAMPLES = int(os.environ.get("SOPO_SPAN_SAMPLES", 1000))
+# 1이면 tracemalloc으로 구간별 메모리 증가량도 기록 (추적 비용이 있어 기본 비활성화)
+TRACE_MEMORY = os.environ.get("SOPO_TRACE_MEMORY") == "1"
+METRICS_PORT_ENV = "SOPO_METRICS_PORT"
+# 계측 서버 바인딩 주소 (인증이 없으므로 기본은 로컬 전용, 외부 수집은 0.0.0.0 등으로 명시)
+METRICS_HOST_ENV = "SOPO_METRICS_HOST"
+DEFAULT_METRICS_HOST = "127.0.0.1"
+# 1이면 진단 페이지 표시 (그 외에는 ?diag=1 쿼리로만 접근)
+DIAGNOSTICS_ENV = "SOPO_DIAGNOSTICS"
+PERCENTILES = [0.5, 0.95, 0.99]
+
+if TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+_lock = threading.Lock()
+_spans = {}
+_caches = {}
+_page = contextvars.ContextVar("sopo_page", default=None)
+_page_start = contextvars.ContextVar("sopo_page_start", default=None)
+_cache_miss = contextvars.ContextVar("sopo_cache_miss", default=None)
+_server = None
+
+
+class SpanStats:
+    """단일 구간(이름 + 라벨)의 누적 통계와 최근 기록입니다."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+        self.memory_kb = None
+
+    def add(self, seconds: float, memory_kb: float = None) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+        if len(self.samples) > MAX_SAMPLES:
+            del self.samples[:len(self.samples) - MAX_SAMPLES]
+        if memory_kb is not None:
+            self.memory_kb = max(self.memory_kb or 0.0, memory_kb)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        quantiles = {
+            f"p{int(q * 100)}": ordered[min(int(q * len(ordered)), len(ordered) - 1)] for q in PERCENTILES
+        }
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count,
+            "max_s": self.max,
+            **quantiles,
+            "memory_max_kb": self.memory_kb,
+        }
+
+
+def _key(name: str, labels: dict) -> tuple:
+    page = _page.get()
+    if page is not None and "page" not in labels:
+        labels = {**labels, "page": page}
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def record_span(name: str, seconds: float, memory_kb: float = None, **labels) -> None:
+    """측정한 구간 소요 시간을 기록합니다 (현재 페이지가 있으면 page 라벨 추가)."""
+    key = _key(name, labels)
+    with _lock:
+        _spans.setdefault(key, SpanStats()).add(seconds, memory_kb)
+
+
+@contextmanager
+def span(name: str, **labels):
+    """
+    with 블록의 소요 시간(과 SOPO_TRACE_MEMORY=1이면 메모리 증가량)을 기록합니다.
+
+    예외가 발생해도 기록하며, 예외는 그대로 전파됩니다.
+
+    Parameters:
+    - name (str): 구간 이름 (예: "csv_parse", "model_fit")
+    - labels: 구분 라벨 (예: kind="lgbm")
+    """
+    memory_before = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        memory_kb = None
+        if memory_before is not None:
+            memory_kb = max(tracemalloc.get_traced_memory()[0] - memory_before, 0) / 1024
+        record_span(name, seconds, memory_kb, **labels)
+
+
+def timed(name: str = None, **labels):
+    """함수 호출 전체를 span으로 감싸는 데코레이터입니다 (이름 기본값: 함수 이름)."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name or fn.__name__, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record_cache(name: str, hit: bool, **labels) -> None:
+    """캐시 조회 결과(적중/미스)를 기록합니다."""
+    key = _key(name, labels)
+    with _lock:
+        counts = _caches.setdefault(key, [0, 0, 0])
+        counts[0 if hit else 1] += 1
+
+
+def record_cache_eviction(name: str, count: int = 1, **labels) -> None:
+    """용량 상한으로 축출된 캐시 항목 수를 기록합니다."""
+    key = _key(name, labels)
+    with _lock:
+        _caches.setdefault(key, [0, 0, 0])[2] += count
+
+
+def mark_cache_miss() -> None:
+    """cached_call로 호출된 캐시 함수 본문에서 호출하여 미스를 표시합니다."""
+    if _cache_miss.get() is not None:
+        _cache_miss.set(True)
+
+
+def cached_call(name: str, fn, *args, **kwargs):
+    """
+    st.cache_* 함수처럼 적중 여부를 알려주지 않는 캐시 함수를 호출하고 적중/미스를 기록합니다.
+
+    캐시 함수 본문이 실행되어 mark_cache_miss()가 호출되면 미스로 집계합니다.
+    """
+    token = _cache_miss.set(False)
+    try:
+        result = fn(*args, **kwargs)
+        missed = _cache_miss.get()
+    finally:
+        _cache_miss.reset(token)
+    record_cache(name, not missed)
+    return result
+
+
+def start_page(name: str) -> None:
+    """
+    페이지 스크립트 실행 시작을 표시합니다 (이후 구간에 page 라벨이 붙음).
+
+    st.stop()으로 중간에 끝난 실행은 페이지 지연 시간에 집계되지 않습니다.
+    """
+    _page.set(name)
+    _page_start.set(time.perf_counter())
+    maybe_serve_metrics()
+
+
+def finish_page() -> None:
+    """페이지 스크립트 실행 종료를 표시하고 전체 소요 시간을 "page" 구간으로 기록합니다."""
+    start = _page_start.get()
+    if start is not None:
+        record_span("page", time.perf_counter() - start)
+        _page_start.set(None)
+
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart를 Plotly 직렬화 구간("plotly_serialize")으로 계측해 호출합니다."""
+    import streamlit as st
+
+    with span("plotly_serialize"):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def snapshot() -> dict:
+    """
+    현재까지의 계측 결과를 반환합니다.
+
+    Returns:
+    - dict: spans (이름/라벨별 count, total_s, mean_s, max_s, p50, p95, p99, memory_max_kb),
+      caches (이름/라벨별 hits, misses, hit_rate, evictions), pid
+    """
+    with _lock:
+        spans = [
+            {"name": name, "labels": dict(labels), **stats.summary()}
+            for (name, labels), stats in sorted(_spans.items())
+        ]
+        caches = [
+            {"name": name, "labels": dict(labels), "hits": hits, "misses": misses,
+             "hit_rate": hits / (hits + misses) if hits + misses else 0.0, "evictions": evictions}
+            for (name, labels), (hits, misses, evictions) in sorted(_caches.items())
+        ]
+    return {"pid": os.getpid(), "spans": spans, "caches": caches}
+
+
+def to_json() -> str:
+    return json.dumps(snapshot(), ensure_ascii=False, indent=2)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def to_prometheus() -> str:
+    """계측 결과를 Prometheus 텍스트 노출 형식으로 반환합니다."""
+    data = snapshot()
+    lines = [
+        "# HELP sopo_span_seconds 구간 소요 시간 (최근 기록 기준 분위수)",
+        "# TYPE sopo_span_seconds summary",
+    ]
+    for entry in data["spans"]:
+        labels = {"span": entry["name"], **entry["labels"]}
+        for q in PERCENTILES:
+            lines.append(f"sopo_span_seconds{_labels({**labels, 'quantile': q})} {entry[f'p{int(q * 100)}']}")
+        lines.append(f"sopo_span_seconds_sum{_labels(labels)} {entry['total_s']}")
+        lines.append(f"sopo_span_seconds_count{_labels(labels)} {entry['count']}")
+
+    memory = [entry for entry in data["spans"] if entry["memory_max_kb"] is not None]
+    if memory:
+        lines += ["# HELP sopo_span_memory_max_kib 구간 메모리 증가량 최댓값", "# TYPE sopo_span_memory_max_kib gauge"]
+        for entry in memory:
+            labels = {"span": entry["name"], **entry["labels"]}
+            lines.append(f"sopo_span_memory_max_kib{_labels(labels)} {entry['memory_max_kb']}")
+
+    lines += ["# HELP sopo_cache_requests_total 캐시 조회 수", "# TYPE sopo_cache_requests_total counter"]
+    for entry in data["caches"]:
+        labels = {"cache": entry["name"], **entry["labels"]}
+        lines.append(f"sopo_cache_requests_total{_labels({**labels, 'result': 'hit'})} {entry['hits']}")
+        lines.append(f"sopo_cache_requests_total{_labels({**labels, 'result': 'miss'})} {entry['misses']}")
+    lines += ["# HELP sopo_cache_evictions_total 용량 상한으로 축출된 캐시 항목 수",
+              "# TYPE sopo_cache_evictions_total counter"]
+    for entry in data["caches"]:
+        labels = {"cache": entry["name"], **entry["labels"]}
+        lines.append(f"sopo_cache_evictions_total{_labels(labels)} {entry['evictions']}")
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """모든 계측 기록을 지웁니다."""
+    with _lock:
+        _spans.clear()
+        _caches.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = to_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body, content_type = to_json(), "application/json; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def maybe_serve_metrics() -> None:
+    """
+    SOPO_METRICS_PORT가 지정되어 있으면 프로세스당 한 번 /metrics, /metrics.json HTTP 서버를 띄웁니다.
+
+    Streamlit처럼 자체 HTTP 엔드포인트를 추가하기 어려운 프로세스를 Prometheus가 수집할 때 사용합니다.
+    인증 없이 구간 라벨(센터명 등)을 노출하므로 기본은 127.0.0.1에만 바인딩하며,
+    다른 호스트에서 수집하려면 SOPO_METRICS_HOST로 주소를 지정합니다.
+    """
+    global _server
+    port = os.environ.get(METRICS_PORT_ENV)
+    host = os.environ.get(METRICS_HOST_ENV, DEFAULT_METRICS_HOST)
+    if not port or _server is not None:
+        return
+    with _lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+        except OSError as e:
+            logger.warning("계측 서버 시작 실패 (%s:%s): %s", host, port, e)
+            _server = False
+            return
+        threading.Thread(target=_server.serve_forever, name="sopo-metrics", daemon=True).start()
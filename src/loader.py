@@ -1,18 +1,375 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
 import pandas as pd
 
-def load_logistics_data(filepath: str) -> pd.DataFrame:
+try:
+    import pyarrow.feather as feather
+    from pyarrow import ArrowInvalid, ArrowTypeError
+except ImportError:  # pyarrow 미설치 시 CSV 직접 파싱으로 동작
+    feather = None
+    _CACHE_WRITE_ERRORS = (OSError,)
+else:
+    # 디스크 오류 + DataFrame을 Arrow로 변환할 수 없는 경우(혼합 타입 object 컬럼 등)
+    _CACHE_WRITE_ERRORS = (OSError, ArrowInvalid, ArrowTypeError)
+
+from src.instrument import record_cache, span
+
+logger = logging.getLogger(__name__)
+
+# 원본 CSV의 고정 컬럼 (나머지는 품목 컬럼)
+KEY_COLUMNS = ["date", "center_name"]
+
+# 캐시 포맷이 바뀌면 올려서 기존 캐시를 무효화합니다.
+CACHE_SCHEMA_VERSION = 1
+CACHE_DIR_NAME = ".cache"
+_HASH_CHUNK_SIZE = 1 << 20
+
+# 0이면 원본 dtype(int64/float64, object 센터명) 그대로 사용
+COMPACT_DTYPES = os.environ.get("SOPO_COMPACT_DTYPES", "1") != "0"
+# 품목 컬럼 정수 후보 (작은 것부터). 부호 있는 정수로 두어 뺄셈 시 언더플로를 막음
+_INT_DTYPES = ["int8", "int16", "int32"]
+
+
+def _cache_paths(filepath: str) -> tuple[str, str]:
+    """원본 CSV 경로에 대응하는 (feather 캐시, manifest) 경로를 반환합니다."""
+    directory, filename = os.path.split(os.path.abspath(filepath))
+    stem = os.path.splitext(filename)[0]
+    cache_dir = os.path.join(directory, CACHE_DIR_NAME)
+    return (
+        os.path.join(cache_dir, f"{stem}.feather"),
+        os.path.join(cache_dir, f"{stem}.manifest.json"),
+    )
+
+
+def _hash_file(filepath: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_manifest(manifest_path: str) -> dict:
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def replace_atomic(path: str, write) -> None:
+    """
+    path와 같은 디렉터리의 고유한 임시 파일에 write(tmp_path)로 쓴 뒤 이름을 바꿉니다.
+
+    임시 파일 이름이 호출마다 다르므로 여러 워커가 동시에 같은 캐시를 써도 서로 덮어쓰지 않고,
+    실패하면 임시 파일을 지웁니다.
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f"{name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_manifest(manifest_path: str, manifest: dict) -> None:
+    def write(tmp_path: str) -> None:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    replace_atomic(manifest_path, write)
+
+
+def get_file_fingerprint(filepath: str) -> str:
+    """
+    CSV 파일의 내용 기반 지문(fingerprint)을 반환합니다.
+
+    크기/수정시각이 manifest와 같으면 저장된 해시를 그대로 사용하고,
+    달라졌을 때만 파일 전체를 다시 해시합니다.
+
+    Parameters:
+    - filepath (str): CSV 파일 경로
+
+    Returns:
+    - str: 16바이트 blake2b 해시 문자열
+    """
+    stat = os.stat(filepath)
+    _, manifest_path = _cache_paths(filepath)
+    manifest = _read_manifest(manifest_path)
+    if (
+        manifest.get("source_size") == stat.st_size
+        and manifest.get("source_mtime_ns") == stat.st_mtime_ns
+        and manifest.get("fingerprint")
+    ):
+        return manifest["fingerprint"]
+    return _hash_file(filepath)
+
+
+def parse_logistics_csv(source, **read_csv_kwargs) -> pd.DataFrame:
+    """
+    euc-kr CSV(파일 경로 또는 버퍼)를 파싱하고 'date' 컬럼을 datetime으로 변환합니다.
+
+    Parameters:
+    - source: CSV 파일 경로 또는 파일 객체
+    - read_csv_kwargs: pd.read_csv에 전달할 추가 인자 (예: header=None, names=[...])
+
+    Returns:
+    - pd.DataFrame
+    """
+    with span("csv_parse"):
+        df = pd.read_csv(source, encoding="euc-kr", **read_csv_kwargs)
+
+        # 'date' 컬럼이 문자열 형식이라면 datetime 형식으로 변환
+        df['date'] = pd.to_datetime(df['date'], format='%Y%m%d')
+
+    return df
+
+
+def _load_cached(filepath: str) -> pd.DataFrame:
+    cache_path, manifest_path = _cache_paths(filepath)
+    stat = os.stat(filepath)
+    manifest = _read_manifest(manifest_path)
+    valid = (
+        manifest.get("schema_version") == CACHE_SCHEMA_VERSION
+        and os.path.exists(cache_path)
+    )
+
+    if valid and (
+        manifest.get("source_size") != stat.st_size
+        or manifest.get("source_mtime_ns") != stat.st_mtime_ns
+    ):
+        # 크기/수정시각이 달라졌으면 내용 해시로 최종 판단 (touch만 된 경우 재사용)
+        fingerprint = _hash_file(filepath)
+        valid = fingerprint == manifest.get("fingerprint")
+        if valid:
+            manifest.update(source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+            try:
+                _write_manifest(manifest_path, manifest)
+            except OSError:
+                pass
+
+    if valid:
+        try:
+            with span("feather_read"):
+                df = feather.read_table(cache_path, memory_map=True).to_pandas()
+            record_cache("feather", True)
+            return df
+        except Exception as e:
+            logger.warning("캐시 읽기 실패, CSV를 다시 파싱합니다: %s", e)
+
+    record_cache("feather", False)
+    df = parse_logistics_csv(filepath)
+    write_cache(filepath, df)
+    return df
+
+
+def write_cache(filepath: str, df: pd.DataFrame) -> None:
+    """
+    원본 CSV의 현재 상태에 대응하는 컬럼형 캐시와 manifest를 저장합니다.
+
+    증분 적재처럼 CSV와 DataFrame을 함께 갱신한 경우, CSV를 다시 파싱하지 않고
+    캐시를 최신 상태로 맞출 때 사용합니다. 저장 실패는 경고만 남깁니다.
+
+    Parameters:
+    - filepath (str): 원본 CSV 파일 경로
+    - df (pd.DataFrame): CSV 전체 내용과 같은 DataFrame
+    """
+    if feather is None:
+        return
+    cache_path, manifest_path = _cache_paths(filepath)
+    stat = os.stat(filepath)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        replace_atomic(
+            cache_path, lambda tmp_path: feather.write_feather(df, tmp_path, compression="uncompressed")
+        )
+        _write_manifest(manifest_path, {
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "fingerprint": _hash_file(filepath),
+        })
+    except _CACHE_WRITE_ERRORS as e:
+        logger.warning("캐시 저장 실패 (읽기 전용 경로 또는 Arrow 변환 불가): %s", e)
+
+
+def _compact_numeric(series: pd.Series) -> pd.Series:
+    """
+    값이 손실 없이 들어가는 가장 작은 dtype으로 변환합니다 (줄어들지 않으면 None).
+
+    결측이 없는 정수 값은 int8/int16/int32, 그 외는 float32를 시도하고
+    변환 결과가 원본과 정확히 같은지 확인합니다.
+    """
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return None
+    values = series.to_numpy(dtype=np.float64)
+    finite = values[~np.isnan(values)]
+    candidate = None
+    if len(finite) == len(values) and np.array_equal(finite, np.round(finite)):
+        low, high = (finite.min(), finite.max()) if len(finite) else (0, 0)
+        for dtype in _INT_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                candidate = series.astype(dtype)
+                break
+    if candidate is None:
+        candidate = series.astype("float32")
+
+    if candidate.dtype.itemsize >= series.dtype.itemsize:
+        return None
+    if not np.array_equal(candidate.to_numpy(dtype=np.float64), values, equal_nan=True):
+        return None
+    return candidate
+
+
+def validate_schema(df: pd.DataFrame) -> None:
+    """
+    물류 DataFrame이 load_logistics_data 스키마를 따르는지 확인합니다.
+
+    Raises:
+    - ValueError: 키 컬럼 누락, 날짜 형식 오류, 빈 센터명, 숫자가 아닌 품목 컬럼이 있는 경우
+    """
+    missing = [col for col in KEY_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼 누락: {missing}")
+    problems = []
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        problems.append(f"date 컬럼이 datetime이 아닙니다 ({df['date'].dtype})")
+    if df["center_name"].isna().any():
+        problems.append("센터명이 비어 있는 행이 있습니다.")
+    non_numeric = [
+        col for col in df.columns
+        if col not in KEY_COLUMNS and not pd.api.types.is_numeric_dtype(df[col])
+    ]
+    if non_numeric:
+        problems.append(f"숫자가 아닌 품목 컬럼: {non_numeric}")
+    if problems:
+        raise ValueError("\n".join(problems))
+
+
+def compact_dtypes(df: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+    """
+    메모리를 줄이는 dtype 스키마를 적용합니다 (이미 적용된 컬럼은 그대로 둠).
+
+    - 문자열(object) 컬럼 → category (범주 순서는 데이터 등장 순서)
+    - 숫자 컬럼 → 값이 손실 없이 들어가는 가장 작은 dtype (int8/16/32, float32)
+
+    Parameters:
+    - df (pd.DataFrame): 변환할 DataFrame
+    - columns (list): 변환할 컬럼 (기본값: date를 제외한 전체)
+
+    Returns:
+    - pd.DataFrame: 변환된 DataFrame (원본은 수정하지 않음)
+    """
+    columns = [col for col in df.columns if col != "date"] if columns is None else columns
+    converted = {}
+    for col in columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            converted[col] = pd.Categorical(series, categories=pd.unique(series.dropna()))
+        else:
+            compact = _compact_numeric(series)
+            if compact is not None:
+                converted[col] = compact
+    return df.assign(**converted) if converted else df
+
+
+def concat_frames(frames: list) -> pd.DataFrame:
+    """
+    pd.concat과 같지만 category 컬럼의 범주를 합쳐 dtype을 유지합니다.
+
+    범주가 다른 category 컬럼을 그대로 이으면 object로 바뀌므로, 먼저 범주를
+    (등장 순서대로) 합집합으로 맞춘 뒤 잇습니다. 숫자 컬럼은 pandas가 큰 dtype으로 올립니다.
+    """
+    frames = list(frames)
+    for col in frames[0].columns:
+        dtypes = [frame[col].dtype for frame in frames if col in frame.columns]
+        if not all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            continue
+        categories = dtypes[0].categories
+        for dtype in dtypes[1:]:
+            categories = categories.union(dtype.categories, sort=False)
+        frames = [
+            frame.assign(**{col: frame[col].cat.set_categories(categories)})
+            if col in frame.columns and not frame[col].cat.categories.equals(categories) else frame
+            for frame in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    컬럼별 dtype과 메모리 사용량(MB)을 변환 전후로 비교합니다 (마지막 행은 합계).
+
+    Returns:
+    - pd.DataFrame: 컬럼, 변환 전 dtype, 변환 후 dtype, 변환 전(MB), 변환 후(MB)
+    """
+    before_bytes = before.memory_usage(deep=True, index=False)
+    after_bytes = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "컬럼": before.columns,
+        "변환 전 dtype": [str(before[col].dtype) for col in before.columns],
+        "변환 후 dtype": [str(after[col].dtype) for col in before.columns],
+        "변환 전(MB)": before_bytes[before.columns].to_numpy() / 1e6,
+        "변환 후(MB)": after_bytes[before.columns].to_numpy() / 1e6,
+    })
+    total = {
+        "컬럼": "합계", "변환 전 dtype": "", "변환 후 dtype": "",
+        "변환 전(MB)": report["변환 전(MB)"].sum(), "변환 후(MB)": report["변환 후(MB)"].sum(),
+    }
+    return pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+
+
+def log_memory_report(report: pd.DataFrame) -> None:
+    total = report.iloc[-1]
+    saved = 1 - total["변환 후(MB)"] / total["변환 전(MB)"] if total["변환 전(MB)"] else 0.0
+    logger.info(
+        "dtype 스키마 적용: %.1f MB → %.1f MB (%.0f%% 절감)",
+        total["변환 전(MB)"], total["변환 후(MB)"], saved * 100,
+    )
+
+
+def load_logistics_data(filepath: str, use_cache: bool = True, compact: bool = COMPACT_DTYPES) -> pd.DataFrame:
     """
     주어진 CSV 파일 경로에서 물류 데이터를 불러오는 함수입니다.
 
+    첫 로딩 시 파싱 결과를 같은 폴더의 `.cache/`에 Feather(Arrow) 형식으로 저장하고,
+    이후에는 원본 파일의 크기/수정시각/내용 해시가 같으면 메모리 맵으로 캐시를 읽습니다.
+
     Parameters:
     - filepath (str): CSV 파일 경로
+    - use_cache (bool): 컬럼형 캐시 사용 여부 (pyarrow 미설치 시 자동 비활성화)
+    - compact (bool): 스키마 검증 후 작은 dtype 적용 여부 (센터명 category, 품목 int8~int32/float32).
+      기본값은 환경변수 SOPO_COMPACT_DTYPES (0이면 원본 dtype 유지)
 
     Returns:
     - pd.DataFrame: 'date' 컬럼은 datetime 형식으로 변환된 DataFrame
-    """
-    df = pd.read_csv(filepath, encoding="euc-kr")
 
-    # 'date' 컬럼이 문자열 형식이라면 datetime 형식으로 변환
-    df['date'] = pd.to_datetime(df['date'], format='%Y%m%d')
+    Raises:
+    - ValueError: compact=True이고 스키마 검증에 실패한 경우
+    """
+    if use_cache and feather is not None:
+        df = _load_cached(filepath)
+    else:
+        df = parse_logistics_csv(filepath)
+    if not compact:
+        return df
 
-    return df
\ No newline at end of file
+    validate_schema(df)
+    compacted = compact_dtypes(df)
+    if logger.isEnabledFor(logging.INFO):
+        log_memory_report(memory_report(df, compacted))
+    return compacted
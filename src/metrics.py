@@ -0,0 +1,43 @@
+# 📏 평가 지표	MAE / RMSE / R²를 여러 시계열에 대해 한 번에 계산
+# ⚡ 벡터화	(시리즈 × 기간) 배열을 축 단위로 계산, 결측(NaN)은 제외
+
+import numpy as np
+
+
+def regression_metrics(y_true: np.ndarray, y_pred: np.ndarray, axis: int = -1) -> dict:
+    """
+    실제값/예측값 배열의 MAE, RMSE, R²를 지정 축 기준으로 계산합니다.
+
+    sklearn의 mean_absolute_error / root_mean_squared_error / r2_score와 같은 정의이며,
+    NaN 칸은 계산에서 제외합니다. 실제값이 일정한(분산 0) 구간의 R²는 r2_score와 같이 예측이 정확하면 1.0,
+    아니면 0.0이고, 유효한 값이 2개 미만이면 NaN입니다.
+
+    Parameters:
+    - y_true (np.ndarray): 실제값
+    - y_pred (np.ndarray): 예측값 (y_true와 같은 shape)
+    - axis (int): 집계 축 (기본값: 마지막 축)
+
+    Returns:
+    - dict: "MAE", "RMSE", "R2" → 지정 축이 제거된 배열 (1차원 입력이면 float)
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    valid = ~(np.isnan(y_true) | np.isnan(y_pred))
+    count = valid.sum(axis=axis)
+
+    error = np.where(valid, y_true - y_pred, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mae = np.abs(error).sum(axis=axis) / count
+        sse = (error ** 2).sum(axis=axis)
+        rmse = np.sqrt(sse / count)
+
+        mean_true = np.where(valid, y_true, 0.0).sum(axis=axis, keepdims=True) / np.expand_dims(count, axis)
+        sst = (np.where(valid, y_true - mean_true, 0.0) ** 2).sum(axis=axis)
+        # r2_score(force_finite=True)와 같은 분산 0 처리
+        r2 = np.where(sst > 0, 1 - sse / np.where(sst > 0, sst, 1), np.where(sse == 0, 1.0, 0.0))
+        r2 = np.where(count >= 2, r2, np.nan)
+
+    metrics = {"MAE": mae, "RMSE": rmse, "R2": r2}
+    if np.ndim(mae) == 0:
+        return {name: float(value) for name, value in metrics.items()}
+    return metrics
@@ -0,0 +1,202 @@
+# 💾 모델 레지스트리	학습된 LightGBM/Prophet 모델을 디스크에 저장하고 재사용
+# 🔑 키 구성	센터, 품목, 예측 기간, 피처 버전, 하이퍼파라미터, 데이터 지문
+# 🧹 용량 제한	최근 사용 순서(LRU)로 오래된 모델부터 삭제
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from src.features import FEATURE_SET_VERSION
+from src.instrument import record_cache, span
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.environ.get("SOPO_MODEL_DIR", "data/.models")
+DEFAULT_MAX_BYTES = int(os.environ.get("SOPO_MODEL_MAX_BYTES", 512 * 1024 * 1024))
+
+# 모델 종류별 저장 파일 확장자
+_EXTENSIONS = {"lgbm": "txt", "prophet": "json"}
+
+
+def model_key(kind: str, center: str, item: str, period_days: int,
+              params: dict, data_fingerprint: str) -> str:
+    """
+    모델 저장 키를 만듭니다.
+
+    Parameters:
+    - kind (str): 모델 종류 ("lgbm" 또는 "prophet")
+    - center (str): 센터명
+    - item (str): 품목명
+    - period_days (int): 평가(예측) 기간
+    - params (dict): 하이퍼파라미터 및 모델 구성
+    - data_fingerprint (str): 학습 데이터 지문 (센터 단위: LogisticsCube.center_fingerprint)
+
+    Returns:
+    - str: 32자리 16진수 키
+    """
+    payload = json.dumps({
+        "kind": kind,
+        "center": center,
+        "item": item,
+        "period_days": period_days,
+        "feature_set_version": FEATURE_SET_VERSION,
+        "params": params,
+        "data": data_fingerprint,
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _serialize(kind: str, model) -> str:
+    if kind == "lgbm":
+        booster = getattr(model, "booster_", model)
+        return booster.model_to_string()
+    if kind == "prophet":
+        from prophet.serialize import model_to_json
+        return model_to_json(model)
+    raise ValueError(f"지원하지 않는 모델 종류: {kind}")
+
+
+def _deserialize(kind: str, text: str):
+    if kind == "lgbm":
+        import lightgbm
+        return lightgbm.Booster(model_str=text)
+    if kind == "prophet":
+        from prophet.serialize import model_from_json
+        return model_from_json(text)
+    raise ValueError(f"지원하지 않는 모델 종류: {kind}")
+
+
+class ModelRegistry:
+    """
+    학습된 모델을 키 단위로 저장/조회하는 디스크 레지스트리입니다.
+
+    LightGBM은 Booster 텍스트 형식으로, Prophet은 prophet.serialize JSON으로 저장합니다.
+    LightGBM 모델은 Booster로 복원되며 `predict(X)`는 LGBMRegressor와 같은 결과를 냅니다.
+    """
+
+    def __init__(self, root: str = MODEL_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, f"{kind}-{key}.{_EXTENSIONS[kind]}")
+
+    def load(self, kind: str, key: str):
+        """
+        저장된 모델을 반환합니다 (없으면 None). 조회 시 LRU 순서를 갱신합니다.
+
+        파일이 손상되어 복원에 실패하면(잘린 파일, 백엔드 버전 불일치 등) 파일을 지우고 None을 반환해
+        다시 학습하게 합니다. 백엔드가 설치되지 않은 경우(ImportError)는 그대로 올립니다.
+        """
+        path = self._path(kind, key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, ValueError):
+            return None
+        try:
+            model = _deserialize(kind, text)
+        except ImportError:
+            raise
+        except Exception as e:
+            # LightGBMError, prophet JSON 복원 오류 등 백엔드별 예외를 모두 손상으로 간주
+            logger.warning("손상된 모델 파일 삭제: %s (%s)", path, e)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return model
+
+    def save(self, kind: str, key: str, model) -> None:
+        """모델을 원자적으로 저장한 뒤 용량 제한을 적용합니다."""
+        self._write(self._path(kind, key), _serialize(kind, model))
+        self._evict()
+
+    def _write(self, path: str, text: str) -> None:
+        """
+        같은 디렉터리의 고유한 임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 저장합니다.
+
+        임시 파일 이름이 프로세스/호출마다 다르므로 여러 워커가 같은 모델을 동시에 저장해도
+        서로의 임시 파일을 덮어쓰지 않습니다.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _alias_path(self, kind: str, alias: str) -> str:
+        return os.path.join(self.root, f"{kind}-alias-{alias}.key")
+
+    def set_alias(self, kind: str, alias: str, key: str) -> None:
+        """alias가 가리키는 모델 키를 기록합니다 (예: 같은 구성의 가장 최근 모델)."""
+        self._write(self._alias_path(kind, alias), key)
+
+    def load_alias(self, kind: str, alias: str):
+        """alias가 가리키는 모델을 반환합니다 (alias 또는 모델이 없으면 None)."""
+        try:
+            with open(self._alias_path(kind, alias), encoding="utf-8") as f:
+                key = f.read().strip()
+        except OSError:
+            return None
+        return self.load(kind, key)
+
+    def get_or_fit(self, kind: str, key: str, fit_fn):
+        """
+        저장된 모델이 있으면 불러오고, 없으면 fit_fn()으로 학습해 저장합니다.
+
+        Parameters:
+        - kind (str): 모델 종류
+        - key (str): model_key()로 만든 키
+        - fit_fn (callable): 인자 없이 학습된 모델을 반환하는 함수
+
+        Returns:
+        - tuple: (모델, 캐시 적중 여부)
+        """
+        model = self.load(kind, key)
+        record_cache("model_registry", model is not None, kind=kind)
+        if model is not None:
+            return model, True
+        with span("model_fit", kind=kind):
+            model = fit_fn()
+        try:
+            self.save(kind, key, model)
+        except OSError:
+            pass  # 저장 실패 시에도 학습 결과는 그대로 사용
+        return model, False
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,294 @@
+# 🔮 Prophet 백엔드	페이지/배치 작업이 같은 Prophet 학습·예측 경로를 사용
+# 🔥 웜 스타트	며칠만 추가된 경우 직전 모델의 파라미터를 초기값으로 최적화 시작
+# 🚀 일괄 학습	센터 × 품목 Prophet 학습을 프로세스 풀(sweep)로 병렬 실행
+# ⚡ 빠른 추론	예측 구간이 필요 없는 화면은 uncertainty_samples=0으로 시뮬레이션 생략
+#
+# 사용법: python -m src.prophet_backend --period-days 14 --series 8
+
+import argparse
+import copy
+import logging
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.features import FeatureStore
+from src.metrics import regression_metrics
+from src.instrument import record_cache, span
+from src.model_registry import ModelRegistry, model_key
+
+logger = logging.getLogger(__name__)
+
+PROPHET_PARAMS = {
+    "weekly_seasonality": False,
+    "yearly_seasonality": True,
+    "daily_seasonality": False,
+}
+PROPHET_REGRESSORS = ["is_holiday", "dow", "lag_1"]
+# Prophet 기본값 (예측 구간 계산용 시뮬레이션 횟수)
+DEFAULT_UNCERTAINTY_SAMPLES = 1000
+# 직전 모델보다 학습 데이터가 이 일수 이내로 늘어난 경우에만 웜 스타트
+WARM_START_MAX_NEW_DAYS = 31
+
+
+def make_prophet(params: dict = None, regressors: list = None):
+    """설정과 외생 변수가 등록된 (학습 전) Prophet 모델을 만듭니다."""
+    from prophet import Prophet
+
+    model = Prophet(**(PROPHET_PARAMS if params is None else params))
+    for regressor in PROPHET_REGRESSORS if regressors is None else regressors:
+        model.add_regressor(regressor)
+    return model
+
+
+def warm_start_params(model) -> dict:
+    """
+    학습된 Prophet 모델의 파라미터를 다음 학습의 초기값(fit의 init) 형식으로 반환합니다.
+
+    MAP 추정이면 단일 값, MCMC면 표본 평균을 사용합니다.
+    """
+    params = {name: float(np.mean(model.params[name])) for name in ["k", "m", "sigma_obs"]}
+    for name in ["delta", "beta"]:
+        params[name] = np.mean(model.params[name], axis=0)
+    return params
+
+
+def can_warm_start(previous, train_df: pd.DataFrame) -> bool:
+    """직전 모델과 학습 시작일이 같고 추가된 날짜가 WARM_START_MAX_NEW_DAYS 이내인지 확인합니다."""
+    history = getattr(previous, "history", None)
+    if history is None or history.empty or train_df.empty:
+        return False
+    if history["ds"].iloc[0] != train_df["ds"].iloc[0]:
+        return False
+    return 0 <= len(train_df) - len(history) <= WARM_START_MAX_NEW_DAYS
+
+
+def fit_prophet(train_df: pd.DataFrame, params: dict = None, regressors: list = None, init: dict = None):
+    """
+    Prophet 모델을 학습합니다.
+
+    Parameters:
+    - train_df (pd.DataFrame): ds, y 및 외생 변수 컬럼
+    - params (dict): Prophet 생성 인자 (기본값: PROPHET_PARAMS)
+    - regressors (list): 외생 변수 목록 (기본값: PROPHET_REGRESSORS)
+    - init (dict): 웜 스타트 초기값 (warm_start_params 결과, None이면 처음부터 학습)
+
+    Returns:
+    - Prophet: 학습된 모델
+    """
+    with span("model_fit", kind="prophet"):
+        if init is not None:
+            try:
+                return make_prophet(params, regressors).fit(train_df, init=init)
+            except (RuntimeError, ValueError) as e:
+                # 초기값 차원이 현재 구성과 맞지 않거나 최적화가 실패하면 처음부터 학습
+                logger.warning("Prophet 웜 스타트 실패, 처음부터 학습합니다: %s", e)
+        return make_prophet(params, regressors).fit(train_df)
+
+
+def predict(model, future: pd.DataFrame, uncertainty_samples: int = 0) -> pd.DataFrame:
+    """
+    음수를 0으로 보정한 예측 결과를 반환합니다.
+
+    모델은 레지스트리/캐시에서 여러 세션이 공유하므로, uncertainty_samples는 얕은 복사본에만
+    설정하고 원래 모델은 바꾸지 않습니다.
+
+    Parameters:
+    - model (Prophet): 학습된 모델
+    - future (pd.DataFrame): ds 및 외생 변수 컬럼
+    - uncertainty_samples (int): 예측 구간 시뮬레이션 횟수 (0이면 yhat_lower/yhat_upper 생략)
+
+    Returns:
+    - pd.DataFrame: Prophet predict 결과 (yhat, 구간 컬럼은 0 이상으로 보정)
+    """
+    model = copy.copy(model)
+    model.uncertainty_samples = uncertainty_samples
+    with span("model_predict", kind="prophet"):
+        forecast = model.predict(future)
+    columns = [col for col in ["yhat", "yhat_lower", "yhat_upper"] if col in forecast.columns]
+    forecast[columns] = forecast[columns].clip(lower=0)
+    return forecast
+
+
+def get_or_fit_prophet(registry: ModelRegistry, center: str, item: str, period_days: int,
+                       train_df: pd.DataFrame, data_fingerprint: str, params: dict = None,
+                       regressors: list = None, key_extra: dict = None) -> tuple:
+    """
+    저장된 모델을 재사용하고, 없으면 같은 구성의 직전 모델에서 웜 스타트해 학습합니다.
+
+    Parameters:
+    - registry (ModelRegistry): 모델 레지스트리
+    - center, item (str): 센터명, 품목명
+    - period_days (int): 평가(예측) 기간
+    - train_df (pd.DataFrame): 학습 데이터
+    - data_fingerprint (str): 학습 데이터 지문 (센터 단위)
+    - params (dict): Prophet 생성 인자
+    - regressors (list): 외생 변수 목록
+    - key_extra (dict): 모델 키에 추가로 포함할 구성 (예: 학습 구간을 정한 피처 목록)
+
+    Returns:
+    - tuple: (모델, "cached" | "warm" | "cold")
+    """
+    params = PROPHET_PARAMS if params is None else params
+    regressors = PROPHET_REGRESSORS if regressors is None else regressors
+    config = {**params, "regressors": regressors, **(key_extra or {})}
+
+    key = model_key("prophet", center, item, period_days, config, data_fingerprint)
+    model = registry.load("prophet", key)
+    record_cache("model_registry", model is not None, kind="prophet")
+    if model is not None:
+        return model, "cached"
+
+    # 데이터 지문만 뺀 키: 같은 센터/품목/구성의 가장 최근 모델을 가리킴
+    latest = model_key("prophet", center, item, period_days, config, None)
+    previous = registry.load_alias("prophet", latest)
+    init = warm_start_params(previous) if can_warm_start(previous, train_df) else None
+
+    model = fit_prophet(train_df, params, regressors, init)
+    try:
+        registry.save("prophet", key, model)
+        registry.set_alias("prophet", latest, key)
+    except OSError:
+        pass  # 저장 실패 시에도 학습 결과는 그대로 사용
+    return model, "cold" if init is None else "warm"
+
+
+def make_prophet_tasks(features: FeatureStore, period_days: int, regressors: list = None,
+                       registry_root: str = None) -> list[dict]:
+    """
+    모든 센터 × 품목에 대해 마지막 period_days일을 평가 구간으로 하는 Prophet 학습 과제를 만듭니다.
+
+    학습 데이터가 부족한 조합(행 수 <= period_days)은 제외합니다.
+
+    Returns:
+    - list[dict]: sweep.run_sweep에 넘길 과제 목록
+    """
+    regressors = PROPHET_REGRESSORS if regressors is None else regressors
+    tasks = []
+    for center in features.cube.centers:
+        fingerprint = features.cube.center_fingerprint(center)
+        for item in features.cube.items:
+            target_df = features.series_frame(center, item, columns=regressors)
+            if len(target_df) <= period_days:
+                continue
+            tasks.append({
+                "center": center,
+                "item": item,
+                "period_days": period_days,
+                "regressors": regressors,
+                "train": target_df.iloc[:-period_days],
+                "test": target_df.iloc[-period_days:].reset_index(drop=True),
+                "data_fingerprint": fingerprint,
+                "registry_root": registry_root,
+            })
+    return tasks
+
+
+def predict_prophet_holdout(task: dict, n_jobs: int = 1) -> np.ndarray:
+    """
+    단일 조합에 Prophet을 학습(또는 레지스트리에서 재사용)하고 평가 구간 예측값을 반환합니다.
+
+    프로세스 풀에서 실행되므로 모듈 최상위 함수로 둡니다. Stan 최적화는 단일 스레드이므로
+    n_jobs는 사용하지 않습니다 (LightGBM 과제와 같은 호출 형식 유지용).
+    """
+    registry = ModelRegistry(task["registry_root"]) if task.get("registry_root") else ModelRegistry()
+    model, _ = get_or_fit_prophet(
+        registry, task["center"], task["item"], task["period_days"], task["train"],
+        task["data_fingerprint"], regressors=task["regressors"],
+    )
+    forecast = predict(model, task["test"][["ds", *task["regressors"]]])
+    return forecast["yhat"].to_numpy()
+
+
+def fit_prophet_holdout(task: dict, n_jobs: int = 1) -> dict:
+    """단일 조합에 Prophet을 학습하고 평가 구간의 MAE/RMSE/R²를 계산합니다."""
+    y_pred = predict_prophet_holdout(task, n_jobs=n_jobs)
+    metrics = regression_metrics(task["test"]["y"].to_numpy(), y_pred)
+
+    return {
+        "센터": task["center"],
+        "품목": task["item"],
+        "MAE": round(metrics["MAE"], 2),
+        "RMSE": round(metrics["RMSE"], 2),
+        "R2": round(metrics["R2"], 3),
+    }
+
+
+def benchmark(features: FeatureStore, period_days: int = 14, n_series: int = 8,
+              new_days: int = 7, max_workers: int = None) -> pd.DataFrame:
+    """
+    기존 경로(매번 처음부터 학습 + 기본 예측 구간)와 백엔드 경로의 소요 시간을 비교합니다.
+
+    - 웜 스타트: new_days일 적은 데이터로 학습한 모델에서 시작 (직전 모델 학습 시간은 제외)
+    - 일괄 학습: 빈 임시 레지스트리로 프로세스 풀 학습 + 빠른 추론
+
+    Parameters:
+    - features (FeatureStore): 공유 피처 행렬
+    - period_days (int): 평가 기간 (일)
+    - n_series (int): 비교에 사용할 센터 × 품목 조합 수
+    - new_days (int): 웜 스타트 시 추가된 것으로 가정할 일수
+    - max_workers (int): 일괄 학습 최대 워커 수
+
+    Returns:
+    - pd.DataFrame: 방식별 시리즈 수, 소요 시간(초), 시리즈당 소요 시간(초)
+    """
+    from src.sweep import run_sweep
+
+    tasks = make_prophet_tasks(features, period_days)[:n_series]
+
+    def timed(name, run):
+        start = time.perf_counter()
+        for task in tasks:
+            run(task)
+        return name, time.perf_counter() - start
+
+    def future(task):
+        return task["test"][["ds", *task["regressors"]]]
+
+    previous = {
+        (task["center"], task["item"]): fit_prophet(task["train"].iloc[:-new_days])
+        for task in tasks
+    }
+
+    results = [
+        timed("기존 (콜드 학습 + 예측 구간 1000회)", lambda task: predict(
+            fit_prophet(task["train"]), future(task), DEFAULT_UNCERTAINTY_SAMPLES)),
+        timed("콜드 학습 + 빠른 추론", lambda task: predict(
+            fit_prophet(task["train"]), future(task))),
+        timed(f"웜 스타트 (+{new_days}일) + 빠른 추론", lambda task: predict(
+            fit_prophet(task["train"], init=warm_start_params(previous[(task["center"], task["item"])])),
+            future(task))),
+    ]
+
+    with tempfile.TemporaryDirectory() as root:
+        for task in tasks:
+            task["registry_root"] = root
+        start = time.perf_counter()
+        for _ in run_sweep(tasks, fn=fit_prophet_holdout, max_workers=max_workers):
+            pass
+        results.append(("일괄 학습 (프로세스 풀) + 빠른 추론", time.perf_counter() - start))
+
+    return pd.DataFrame([
+        {
+            "방식": name,
+            "시리즈 수": len(tasks),
+            "소요 시간(초)": round(seconds, 2),
+            "시리즈당(초)": round(seconds / max(len(tasks), 1), 3),
+        }
+        for name, seconds in results
+    ])
+
+
+if __name__ == "__main__":
+    from src.dataset import get_features
+
+    parser = argparse.ArgumentParser(description="Prophet 학습/추론 경로 벤치마크")
+    parser.add_argument("--period-days", type=int, default=14)
+    parser.add_argument("--series", type=int, default=8)
+    parser.add_argument("--new-days", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(benchmark(get_features(), args.period_days, args.series, args.new_days, args.workers).to_string(index=False))
@@ -0,0 +1,141 @@
+# 🔎 기간 인덱스	정렬된 날짜 축을 이진 탐색해 임의 기간을 잘라 센터별로 집계
+# ➕ 누적합	(센터, 날짜, 품목) 누적합/관측 수를 두고 어떤 기간이든 뺄셈 두 번으로 합계·평균 계산
+# 🔁 증분 갱신	행이 추가되면 가장 이른 변경일 이후 누적합만 다시 계산
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+from src.cube import LogisticsCube
+
+RANGE_STATS = {
+    "sum": "합계",
+    "mean": "일평균",
+    "growth": "증감률(%)",
+}
+
+
+class RangeIndex:
+    """
+    LogisticsCube의 날짜 축(정렬, 일 단위 연속)에 대한 기간 집계 인덱스입니다.
+
+    sums[c, d, i]는 날짜 위치 d 이전(미포함)까지의 물동량 합계, counts[c, d, i]는 관측 일수이므로
+    [s, e) 기간 합계는 sums[:, e] - sums[:, s]로 원본 행을 스캔하지 않고 계산됩니다.
+    누적합은 float64 / int64로 보관하여 작은 dtype으로 저장된 원본 값의 합계도 넘치지 않습니다.
+
+    Attributes:
+    - cube (LogisticsCube): 원본 배열 저장소
+    - sums (np.ndarray): shape (센터 수, 일수 + 1, 품목 수) 누적 합계
+    - counts (np.ndarray): shape (센터 수, 일수 + 1, 품목 수) 누적 관측 일수
+    """
+
+    def __init__(self, cube: LogisticsCube, sums: np.ndarray = None, counts: np.ndarray = None):
+        self.cube = cube
+        if sums is not None and counts is not None:
+            # 공유 스냅샷에서 매핑한 누적합은 그대로 사용
+            self.sums, self.counts = sums, counts
+            return
+        n_centers, n_days, n_items = cube.shape
+        self.sums = np.zeros((n_centers, n_days + 1, n_items), dtype=np.float64)
+        self.counts = np.zeros((n_centers, n_days + 1, n_items), dtype=np.int64)
+        self.update(0)
+
+    def copy(self, cube: LogisticsCube) -> "RangeIndex":
+        """누적합 배열을 복사해 cube(복사된 저장소)에 연결한 새 인덱스를 반환합니다."""
+        index = copy.copy(self)
+        index.cube = cube
+        index.sums, index.counts = np.array(self.sums), np.array(self.counts)
+        return index
+
+    def update(self, start: int) -> None:
+        """
+        cube에 행이 추가된 뒤 날짜 위치 start 이후의 누적합을 다시 계산합니다.
+
+        센터/날짜 축이 늘어났으면 배열을 먼저 늘립니다 (새 센터의 start 이전 누적합은 0).
+
+        Parameters:
+        - start (int): 값이 바뀐 가장 이른 날짜 위치
+        """
+        n_centers, n_days, n_items = self.cube.shape
+        if self.sums.shape != (n_centers, n_days + 1, n_items):
+            old_centers, old_days = self.sums.shape[:2]
+            sums = np.zeros((n_centers, n_days + 1, n_items), dtype=np.float64)
+            counts = np.zeros((n_centers, n_days + 1, n_items), dtype=np.int64)
+            sums[:old_centers, :old_days] = self.sums
+            counts[:old_centers, :old_days] = self.counts
+            self.sums, self.counts = sums, counts
+
+        values = self.cube.values[:, start:, :]
+        present = ~np.isnan(values)
+        self.sums[:, start + 1:] = self.sums[:, start:start + 1] + np.cumsum(
+            np.where(present, values, 0.0), axis=1, dtype=np.float64
+        )
+        self.counts[:, start + 1:] = self.counts[:, start:start + 1] + np.cumsum(present, axis=1)
+
+    def bounds(self, start=None, end=None) -> tuple[int, int]:
+        """
+        날짜 기간 [start, end]를 날짜 축 위치 [s, e)로 변환합니다 (이진 탐색, 범위 밖은 잘라냄).
+
+        Parameters:
+        - start: 시작 날짜 (None이면 처음부터)
+        - end: 종료 날짜 (포함, None이면 끝까지)
+
+        Returns:
+        - tuple[int, int]: (시작 위치, 종료 위치(미포함))
+        """
+        dates = self.cube.dates
+        s = 0 if start is None else int(dates.searchsorted(pd.Timestamp(start), side="left"))
+        e = len(dates) if end is None else int(dates.searchsorted(pd.Timestamp(end), side="right"))
+        return s, max(s, e)
+
+    def _window(self, s: int, e: int) -> tuple[np.ndarray, np.ndarray]:
+        return self.sums[:, e] - self.sums[:, s], self.counts[:, e] - self.counts[:, s]
+
+    def range_stats(self, start=None, end=None, stat: str = "sum", centers: list = None,
+                    items: list = None) -> pd.DataFrame:
+        """
+        기간 내 센터 × 품목 집계를 반환합니다.
+
+        - sum: 기간 합계
+        - mean: 관측일 기준 일평균
+        - growth: 바로 앞 같은 길이 기간 대비 일평균 증감률(%) (앞 기간이 데이터 시작 전이면
+          남은 부분만 사용, 앞 기간 관측이 없거나 평균이 0이면 NaN)
+
+        관측이 없는 센터 × 품목은 NaN입니다.
+
+        Parameters:
+        - start, end: 기간 (종료일 포함)
+        - stat (str): 집계 종류 (RANGE_STATS 키)
+        - centers (list): 센터명 목록 (기본값: 전체, 순서 유지)
+        - items (list): 품목 목록 (기본값: 전체, 순서 유지)
+
+        Returns:
+        - pd.DataFrame: index=center_name, columns=품목
+
+        Raises:
+        - ValueError: 집계 종류가 잘못된 경우
+        """
+        if stat not in RANGE_STATS:
+            raise ValueError(f"지원하지 않는 집계: {stat}")
+        cube = self.cube
+        s, e = self.bounds(start, end)
+        total, count = self._window(s, e)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if stat == "sum":
+                result = np.where(count > 0, total, np.nan)
+            else:
+                result = np.where(count > 0, total / count, np.nan)
+                if stat == "growth":
+                    prev_total, prev_count = self._window(max(s - (e - s), 0), s)
+                    prev_mean = np.where(prev_count > 0, prev_total / prev_count, np.nan)
+                    result = np.where(prev_mean > 0, (result / prev_mean - 1) * 100, np.nan)
+
+        c_idx = np.arange(len(cube.centers)) if centers is None else [cube.center_index[c] for c in centers]
+        i_idx = np.arange(len(cube.items)) if items is None else [cube.item_index[i] for i in items]
+        return pd.DataFrame(
+            result[np.ix_(c_idx, i_idx)],
+            index=pd.Index([cube.centers[c] for c in c_idx], name="center_name"),
+            columns=[cube.items[i] for i in i_idx],
+        )
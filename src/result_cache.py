@@ -0,0 +1,201 @@
+# 🗃️ 결과 캐시	선택값별 계산 결과(피벗, 이상치 시리즈, 홀드아웃 예측)를 프로세스 메모리에 보관
+# ⚖️ 용량 제한	결과 크기(바이트)를 추정해 캐시별 상한을 넘으면 가장 오래 안 쓴 항목부터 축출 (LRU)
+# ⏳ TTL	오래된 항목은 만료 후 다시 계산, 적중/미스/축출/만료 수를 진단 페이지와 계측에 노출
+
+import dataclasses
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src.instrument import record_cache, record_cache_eviction
+
+DEFAULT_MAX_BYTES = int(os.environ.get("SOPO_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+# 초 단위 (0이면 만료 없음)
+DEFAULT_TTL = float(os.environ.get("SOPO_RESULT_CACHE_TTL", 3600))
+
+_lock = threading.Lock()
+_caches = {}
+
+
+def estimate_size(value) -> int:
+    """
+    캐시 항목의 메모리 크기(바이트)를 추정합니다.
+
+    DataFrame/Series는 memory_usage(deep=True), 배열은 nbytes, dataclass/컨테이너는 구성 요소 합입니다.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(estimate_size(getattr(value, field.name)) for field in dataclasses.fields(value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(v) for v in value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def make_key(*parts, **params) -> tuple:
+    """
+    데이터 지문과 선택값으로 해시 가능한 캐시 키를 만듭니다 (목록/딕셔너리는 튜플로 고정).
+
+    Parameters:
+    - parts: 데이터 지문(버전, 센터 해시 등)과 위치 인자
+    - params: 이름 있는 선택값 (순서와 무관하게 같은 키)
+
+    Returns:
+    - tuple
+    """
+    return _freeze(parts) + _freeze(params)
+
+
+class ResultCache:
+    """
+    용량(바이트) 기반 LRU + TTL 결과 캐시입니다.
+
+    계산은 잠금 밖에서 실행하므로 같은 키를 동시에 요청하면 중복 계산될 수 있지만
+    결과는 하나만 남습니다. 예외가 난 계산은 캐시하지 않으며, 상한보다 큰 결과는 저장하지 않습니다.
+
+    Attributes:
+    - name (str): 캐시 이름 (계측 라벨)
+    - max_bytes (int): 저장 항목 크기 합계 상한
+    - ttl (float): 항목 유효 시간(초), 0이면 만료 없음
+    """
+
+    def __init__(self, name: str, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, stored_at)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get_or_compute(self, key, fn, *args, **kwargs):
+        """
+        key에 해당하는 결과를 반환하고, 없거나 만료되었으면 fn(*args, **kwargs)를 계산해 저장합니다.
+
+        Parameters:
+        - key: make_key로 만든 캐시 키
+        - fn: 결과를 계산할 함수
+
+        Returns:
+        - 캐시된(또는 새로 계산한) 결과
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.monotonic() - entry[2] > self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        record_cache(self.name, entry is not None)
+        if entry is not None:
+            return entry[0]
+
+        value = fn(*args, **kwargs)
+        self.put(key, value)
+        return value
+
+    def put(self, key, value) -> None:
+        """결과를 저장하고 상한을 넘으면 오래 안 쓴 항목부터 축출합니다."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, time.monotonic())
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                evicted += 1
+            self.evictions += evicted
+        if evicted:
+            record_cache_eviction(self.name, evicted)
+
+    def _drop(self, key) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """항목 수, 사용 바이트, 적중/미스/축출/만료 수를 반환합니다."""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def get_cache(name: str, max_bytes: int = None, ttl: float = None) -> ResultCache:
+    """
+    이름별 프로세스 공유 ResultCache를 반환합니다 (처음 호출 시 생성).
+
+    Parameters:
+    - name (str): 캐시 이름
+    - max_bytes (int): 용량 상한 (기본값: SOPO_RESULT_CACHE_MAX_BYTES)
+    - ttl (float): 유효 시간(초) (기본값: SOPO_RESULT_CACHE_TTL)
+
+    Returns:
+    - ResultCache
+    """
+    with _lock:
+        if name not in _caches:
+            _caches[name] = ResultCache(
+                name,
+                DEFAULT_MAX_BYTES if max_bytes is None else max_bytes,
+                DEFAULT_TTL if ttl is None else ttl,
+            )
+        return _caches[name]
+
+
+def cache_stats() -> list[dict]:
+    """모든 결과 캐시의 stats()를 이름순으로 반환합니다."""
+    with _lock:
+        caches = sorted(_caches.values(), key=lambda cache: cache.name)
+    return [cache.stats() for cache in caches]
+
+
+def clear_all() -> None:
+    """모든 결과 캐시를 비웁니다."""
+    with _lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
@@ -0,0 +1,404 @@
+# 🧮 롤업 테이블	일 / ISO 주 / 월 / 연 × 센터 × 품목 합계·건수·M2(편차 제곱합)·최솟값·최댓값을 미리 집계
+# 📥 증분 갱신	새 관측이 들어오면 영향받은 센터의 해당 기간 이후만 다시 집계
+# 🔎 조회 API	페이지는 원본 행을 groupby하지 않고 롤업을 병합해 평균/표준편차/합계를 계산
+# 📅 기간 조회	임의 날짜 기간은 양 끝 일 단위 블록 + 사이의 월 단위 블록만 병합해 정확히 계산
+
+import copy
+import math
+
+import numpy as np
+import pandas as pd
+
+from src.cube import LogisticsCube
+
+GRAINS = ["day", "week", "month", "year"]
+# 기간 라벨 컬럼명 (day/month/year는 공유 DataFrame의 date/year_month/year 컬럼과 같은 형식)
+PERIOD_NAMES = {"day": "date", "week": "iso_week", "month": "year_month", "year": "year"}
+# m2: 블록 평균 기준 편차 제곱합 (Welford M2). 블록 병합 시 평균 차이 보정항을 더해 합침
+STATS = ["sum", "count", "m2", "min", "max"]
+DERIVED_STATS = ["mean", "std"]
+
+
+def _period_labels(dates: pd.DatetimeIndex, grain: str):
+    if grain == "day":
+        return dates
+    if grain == "week":
+        iso = dates.isocalendar()
+        return (iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)).to_numpy()
+    if grain == "month":
+        return dates.to_period("M").astype(str)
+    if grain == "year":
+        return dates.year
+    raise ValueError(f"지원하지 않는 집계 단위: {grain} (가능: {GRAINS})")
+
+
+def _fsum(array: np.ndarray, axis: int) -> np.ndarray:
+    """
+    axis 방향 합계를 math.fsum으로 정확히 반올림해 계산합니다 (차원 유지).
+
+    블록을 어떤 순서로 병합해도 같은 값이 나오므로 행 단위 groupby와의 합산 순서 오차가 생기지 않습니다.
+    """
+    if array.dtype.kind != "f":
+        return array.sum(axis=axis, keepdims=True)
+    moved = np.moveaxis(array, axis, -1)
+    rows = moved.reshape(-1, moved.shape[-1])
+    total = np.fromiter((math.fsum(row) for row in rows), dtype=np.float64, count=len(rows))
+    return np.expand_dims(total.reshape(moved.shape[:-1]), axis)
+
+
+def _reduce(values: np.ndarray, observed: np.ndarray, starts: np.ndarray) -> dict:
+    """
+    (센터, 일수, 품목) 블록을 연속된 기간 구간별로 집계합니다.
+
+    Parameters:
+    - values (np.ndarray): (센터, 일수, 품목) 물동량 (미관측 NaN)
+    - observed (np.ndarray): (센터, 일수) 관측 여부
+    - starts (np.ndarray): 각 기간의 첫 날 위치 (블록 기준, 오름차순)
+
+    Returns:
+    - dict: STATS 배열 (센터, 기간, 품목) + rows (센터, 기간) 관측 행 수
+    """
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    total = np.add.reduceat(filled, starts, axis=1)
+    count = np.add.reduceat(present.astype(np.int64), starts, axis=1)
+    # 제곱합 - 합²/n 대신 블록 평균을 뺀 편차로 M2를 계산 (큰 값에서도 상쇄 오차 없음)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / count, 0.0)
+    lengths = np.diff(np.r_[starts, values.shape[1]])
+    deviation = np.where(present, values - np.repeat(mean, lengths, axis=1), 0.0)
+    return {
+        "sum": total,
+        "count": count,
+        "m2": np.add.reduceat(deviation * deviation, starts, axis=1),
+        # fmin/fmax는 NaN을 무시 (구간 전체가 NaN이면 NaN)
+        "min": np.fmin.reduceat(values, starts, axis=1),
+        "max": np.fmax.reduceat(values, starts, axis=1),
+        "rows": np.add.reduceat(observed.astype(np.int64), starts, axis=1),
+    }
+
+
+class RollupTable:
+    """
+    하나의 집계 단위(grain)에 대한 (센터 × 기간 × 품목) 롤업입니다.
+
+    Attributes:
+    - grain (str): "day", "week", "month", "year"
+    - labels (pd.Index): 기간 라벨 (시간순)
+    - starts (pd.DatetimeIndex): 각 기간의 (데이터 축 기준) 첫 날짜
+    - codes (np.ndarray): 날짜 위치 → 기간 코드
+    - arrays (dict): STATS별 (센터, 기간, 품목) 배열 + rows (센터, 기간) 관측 행 수
+    """
+
+    def __init__(self, cube: LogisticsCube, grain: str, arrays: dict = None):
+        self.grain = grain
+        self._index_periods(cube.dates)
+        # arrays가 있으면(공유 스냅샷에서 매핑한 집계) 다시 집계하지 않음
+        self.arrays = _reduce(cube.values, cube.observed, self.start_positions) if arrays is None else arrays
+
+    def _index_periods(self, dates: pd.DatetimeIndex) -> None:
+        codes, labels = pd.factorize(_period_labels(dates, self.grain), sort=False)
+        self.codes = codes
+        self.labels = pd.Index(labels, name=PERIOD_NAMES[self.grain])
+        self.start_positions = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        self.starts = dates[self.start_positions]
+
+    def copy(self) -> "RollupTable":
+        """집계 배열을 복사한 새 테이블을 반환합니다 (기간 축 정보는 update 때 다시 만듦)."""
+        table = copy.copy(self)
+        table.arrays = {name: np.array(array) for name, array in self.arrays.items()}
+        return table
+
+    def update(self, cube: LogisticsCube, center_codes: np.ndarray, day_codes: np.ndarray) -> None:
+        """
+        cube에 추가된 관측을 반영합니다.
+
+        날짜/센터 축이 늘어난 만큼 배열을 넓히고, 값이 바뀐 센터의
+        가장 이른 변경 기간부터 끝까지만 다시 집계합니다.
+        """
+        self._index_periods(cube.dates)
+        n_centers, _, n_items = cube.shape
+        n_periods = len(self.labels)
+        for name, array in self.arrays.items():
+            fill = np.nan if name in ("min", "max") else 0
+            shape = (n_centers, n_periods) + array.shape[2:]
+            if array.shape != shape:
+                grown = np.full(shape, fill, dtype=array.dtype)
+                grown[:array.shape[0], :array.shape[1]] = array
+                self.arrays[name] = grown
+
+        centers = np.unique(center_codes)
+        first = int(self.codes[int(day_codes.min())])
+        d0 = self.start_positions[first]
+        block = _reduce(cube.values[centers, d0:], cube.observed[centers, d0:],
+                        self.start_positions[first:] - d0)
+        for name, array in block.items():
+            self.arrays[name][centers, first:] = array
+
+    def period_slice(self, start=None, end=None) -> slice:
+        """[start, end] 날짜 범위와 겹치는 기간 구간을 반환합니다 (기간 단위로 포함)."""
+        first = 0 if start is None else int(self.starts.searchsorted(pd.Timestamp(start), side="right")) - 1
+        last = len(self.labels) if end is None else int(self.starts.searchsorted(pd.Timestamp(end), side="right"))
+        return slice(max(first, 0), last)
+
+
+class Rollups:
+    """
+    LogisticsCube 위에 유지되는 일/주/월/연 롤업 테이블 모음입니다.
+
+    합계·건수·M2·최솟값·최댓값은 모두 병합 가능하므로 센터/기간을 묶은 평균,
+    표준편차(ddof=1), 합계를 원본 행 스캔 없이 계산할 수 있습니다.
+    M2는 병렬 분산 병합식 M2 = ΣM2_k + Σn_k(mean_k - mean)²으로 합칩니다.
+
+    Attributes:
+    - cube (LogisticsCube): 원본 배열 저장소
+    - tables (dict[str, RollupTable]): 집계 단위별 롤업
+    - item_dtypes (dict): 품목별 원본 dtype (min/max를 원본 groupby와 같은 dtype으로 돌려줄 때 사용)
+    """
+
+    def __init__(self, cube: LogisticsCube, grains: list = GRAINS, item_dtypes: dict = None,
+                 arrays: dict = None):
+        # arrays: 집계 단위별로 이미 계산된 집계 배열 (공유 스냅샷 매핑용, 없는 단위는 새로 집계)
+        arrays = arrays or {}
+        self.cube = cube
+        self.item_dtypes = dict(item_dtypes or {})
+        self.tables = {grain: RollupTable(cube, grain, arrays.get(grain)) for grain in grains}
+
+    def copy(self, cube: LogisticsCube) -> "Rollups":
+        """모든 집계 단위 배열을 복사해 cube(복사된 저장소)에 연결한 새 롤업을 반환합니다."""
+        rollups = copy.copy(self)
+        rollups.cube = cube
+        rollups.tables = {grain: table.copy() for grain, table in self.tables.items()}
+        return rollups
+
+    def update(self, center_codes: np.ndarray, day_codes: np.ndarray) -> None:
+        """cube에 추가된 (센터, 날짜) 관측을 모든 집계 단위에 반영합니다."""
+        for table in self.tables.values():
+            table.update(self.cube, center_codes, day_codes)
+
+    def periods(self, grain: str) -> pd.DataFrame:
+        """집계 단위의 기간 라벨과 첫 날짜를 반환합니다 (period_key 작성용)."""
+        table = self.tables[grain]
+        return pd.DataFrame({"label": table.labels, "start": table.starts})
+
+    def query(self, grain: str = "year", by: tuple = (), stats="mean", centers: list = None,
+              items: list = None, start=None, end=None, period_key=None):
+        """
+        롤업을 병합해 그룹별 통계를 반환합니다.
+
+        groupby(by)[items].agg(stats)와 같은 결과를 원본 행 대신 롤업으로 계산하며,
+        관측 행이 없는 그룹은 제외합니다.
+
+        Parameters:
+        - grain (str): 집계 단위 ("day", "week", "month", "year")
+        - by (tuple): 그룹 기준 ("center", "period" 중 0개 이상)
+        - stats (str | list): STATS + "mean", "std" 중 하나 또는 목록
+        - centers (list): 센터 필터 (None이면 전체)
+        - items (list): 품목 필터 (None이면 전체)
+        - start, end: 날짜 범위 (해당 범위와 겹치는 기간 전체를 포함)
+        - period_key (pd.Series): 기간별 그룹 키 (예: 일 단위의 요일). by에 "period"가 있으면
+          기간 라벨 대신 이 값으로 묶음 (길이는 전체 기간 수)
+
+        Returns:
+        - pd.DataFrame: 그룹 인덱스 × 품목 (stats가 목록이면 (품목, 통계) 다중 컬럼).
+          by가 비어 있고 stats가 하나면 품목별 pd.Series
+        """
+        table = self.tables[grain]
+        periods = table.period_slice(start, end)
+        center_codes, item_names, item_codes = self._codes(centers, items)
+        arrays = self._select({name: array[:, periods] for name, array in table.arrays.items()},
+                              center_codes, item_codes)
+
+        # 센터 축 병합
+        if "center" in by:
+            center_labels = pd.Index([self.cube.centers[c] for c in center_codes], name="center_name")
+        else:
+            center_labels = None
+            arrays = self._merge(arrays, axis=0)
+
+        # 기간 축 병합 (period_key가 있으면 키별로, "period"가 없으면 전체를 하나로)
+        n_periods = max(periods.stop - periods.start, 0)
+        if "period" in by and period_key is None:
+            period_labels = table.labels[periods]
+        else:
+            if "period" in by:
+                keys = np.asarray(period_key)[periods]
+                unique_keys, inverse = np.unique(keys, return_inverse=True)
+                period_labels = pd.Index(unique_keys, name=getattr(period_key, "name", None) or "key")
+            else:
+                period_labels, inverse = None, np.zeros(n_periods, dtype=int)
+            arrays = self._group(arrays, inverse)
+
+        levels = [labels for labels in (center_labels, period_labels) if labels is not None]
+        return self._frame(arrays, levels, item_names, stats)
+
+    def query_range(self, start=None, end=None, by: tuple = (), stats="mean", centers: list = None,
+                    items: list = None):
+        """
+        날짜 기간 [start, end]를 일 단위로 정확히 잘라 그룹별 통계를 반환합니다.
+
+        기간 안에 통째로 들어가는 달은 월 롤업 블록을, 양 끝의 잘린 달은 일 롤업 블록을 써서
+        원본 행을 다시 스캔하지 않고 df[기간 필터].groupby(by)[items].agg(stats)와 같은 결과를 냅니다.
+
+        Parameters:
+        - start, end: 날짜 범위 (종료일 포함, None이면 데이터 처음/끝)
+        - by (tuple): 그룹 기준 ("center" 또는 빈 튜플)
+        - stats (str | list): STATS + "mean", "std" 중 하나 또는 목록
+        - centers (list): 센터 필터 (None이면 전체)
+        - items (list): 품목 필터 (None이면 전체)
+
+        Returns:
+        - pd.DataFrame: query와 같은 형식 (관측 행이 없는 센터는 제외)
+
+        Raises:
+        - ValueError: by에 "center" 이외의 기준이 있는 경우
+        """
+        if set(by) - {"center"}:
+            raise ValueError(f"기간 조회는 센터 기준 그룹만 지원합니다: {by}")
+        center_codes, item_names, item_codes = self._codes(centers, items)
+        arrays = self._select(self._range_blocks(start, end), center_codes, item_codes)
+
+        levels = []
+        # 블록 수가 적으므로 합계/M2는 정확한 합산(fsum)으로 병합해 groupby와 같은 값을 냄
+        if "center" in by:
+            levels.append(pd.Index([self.cube.centers[c] for c in center_codes], name="center_name"))
+        else:
+            arrays = self._merge(arrays, axis=0, exact=True)
+        return self._frame(self._merge(arrays, axis=1, exact=True), levels, item_names, stats)
+
+    def _range_blocks(self, start, end) -> dict:
+        """[start, end] 기간을 덮는 (센터, 블록, 품목) 배열 (앞 일 블록 + 월 블록 + 뒤 일 블록)."""
+        day, month = self.tables["day"], self.tables["month"]
+        dates = self.cube.dates
+        s = 0 if start is None else int(dates.searchsorted(pd.Timestamp(start), side="left"))
+        e = len(dates) if end is None else int(dates.searchsorted(pd.Timestamp(end), side="right"))
+        e = max(s, e)
+
+        # 기간 안에 통째로 들어가는 달 [m0, m1)
+        month_starts = month.start_positions
+        month_ends = np.r_[month_starts[1:], len(dates)]
+        m0 = int(month_starts.searchsorted(s, side="left"))
+        m1 = int(month_ends.searchsorted(e, side="right"))
+        if m0 >= m1:
+            pieces = [(day, slice(s, e))]
+        else:
+            pieces = [
+                (day, slice(s, int(month_starts[m0]))),
+                (month, slice(m0, m1)),
+                (day, slice(int(month_ends[m1 - 1]), e)),
+            ]
+        return {
+            name: np.concatenate([table.arrays[name][:, periods] for table, periods in pieces], axis=1)
+            for name in day.arrays
+        }
+
+    def _codes(self, centers: list, items: list) -> tuple:
+        center_codes = np.arange(len(self.cube.centers)) if centers is None else \
+            np.array([self.cube.center_index[c] for c in centers], dtype=int)
+        item_names = list(self.cube.items) if items is None else list(items)
+        item_codes = np.array([self.cube.item_index[i] for i in item_names], dtype=int)
+        return center_codes, item_names, item_codes
+
+    @staticmethod
+    def _select(arrays: dict, center_codes: np.ndarray, item_codes: np.ndarray) -> dict:
+        return {
+            name: array[center_codes][..., item_codes] if array.ndim == 3 else array[center_codes]
+            for name, array in arrays.items()
+        }
+
+    def _frame(self, arrays: dict, levels: list, item_names: list, stats):
+        rows = arrays["rows"].reshape(-1)
+        values = {name: arrays[name].reshape(len(rows), len(item_names)) for name in STATS}
+        stat_list = [stats] if isinstance(stats, str) else list(stats)
+        computed = {stat: self._stat(stat, values) for stat in stat_list}
+
+        if isinstance(stats, str):
+            frame = pd.DataFrame(computed[stats], columns=pd.Index(item_names))
+        else:
+            frame = pd.DataFrame(
+                np.stack([computed[stat] for stat in stat_list], axis=-1).reshape(len(rows), -1),
+                columns=pd.MultiIndex.from_product([item_names, stat_list]),
+            )
+
+        if not levels:
+            return frame.iloc[0] if isinstance(stats, str) else frame
+        frame.index = levels[0] if len(levels) == 1 else pd.MultiIndex.from_product(levels)
+        return self._restore_dtypes(frame[rows > 0].sort_index(), item_names, stats)
+
+    def _restore_dtypes(self, frame: pd.DataFrame, item_names: list, stats) -> pd.DataFrame:
+        """
+        min/max 컬럼을 원본 품목 dtype으로 되돌립니다 (groupby().min()/max()와 같은 dtype).
+
+        정수 품목은 그룹 중 하나라도 값이 없으면(NaN) float64로 둡니다 (groupby와 동일).
+        """
+        single = isinstance(stats, str)
+        stat_list = [stats] if single else list(stats)
+        frame = frame.copy()
+        for item in item_names:
+            dtype = self.item_dtypes.get(item)
+            if dtype is None or not pd.api.types.is_integer_dtype(dtype):
+                continue
+            for stat in ("min", "max"):
+                column = item if single else (item, stat)
+                if stat in stat_list and frame[column].notna().all():
+                    frame[column] = frame[column].astype(dtype)
+        return frame
+
+    @staticmethod
+    def _merge(arrays: dict, axis: int, exact: bool = False) -> dict:
+        """블록을 axis 방향으로 하나로 병합합니다 (차원 유지, exact면 합계/M2를 fsum으로 합산)."""
+        total = _fsum if exact else (lambda array, axis: array.sum(axis=axis, keepdims=True))
+        merged = {}
+        for name, array in arrays.items():
+            if name == "min":
+                merged[name] = np.fmin.reduce(array, axis=axis, keepdims=True, initial=np.nan)
+            elif name == "max":
+                merged[name] = np.fmax.reduce(array, axis=axis, keepdims=True, initial=np.nan)
+            elif name != "m2":
+                merged[name] = total(array, axis)
+        spread = Rollups._spread(arrays, merged["sum"], merged["count"])
+        merged["m2"] = total(arrays["m2"] + spread, axis)
+        return merged
+
+    @staticmethod
+    def _group(arrays: dict, inverse: np.ndarray) -> dict:
+        """기간 축(axis=1) 블록을 inverse 그룹별로 병합합니다."""
+        n_groups = int(inverse.max()) + 1 if len(inverse) else 1
+        index = (slice(None), inverse)
+        grouped = {}
+        for name, array in arrays.items():
+            shape = (array.shape[0], n_groups) + array.shape[2:]
+            if name in ("min", "max"):
+                out = np.full(shape, np.nan)
+                (np.fmin if name == "min" else np.fmax).at(out, index, array)
+            elif name != "m2":
+                out = np.zeros(shape, dtype=array.dtype)
+                np.add.at(out, index, array)
+            else:
+                continue
+            grouped[name] = out
+        spread = Rollups._spread(arrays, grouped["sum"][:, inverse], grouped["count"][:, inverse])
+        grouped["m2"] = np.zeros(grouped["sum"].shape)
+        np.add.at(grouped["m2"], index, arrays["m2"] + spread)
+        return grouped
+
+    @staticmethod
+    def _spread(arrays: dict, total: np.ndarray, count: np.ndarray) -> np.ndarray:
+        """블록별 n_k(mean_k - mean)² (mean은 블록이 속한 병합 그룹의 평균, 빈 블록은 0)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            block_mean = arrays["sum"] / arrays["count"]
+            diff = np.where(arrays["count"] > 0, block_mean - total / count, 0.0)
+        return arrays["count"] * diff * diff
+
+    @staticmethod
+    def _stat(stat: str, values: dict) -> np.ndarray:
+        if stat in STATS:
+            return values[stat].astype(np.float64)
+        count = values["count"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = values["sum"] / count
+            if stat == "mean":
+                return np.where(count > 0, mean, np.nan)
+            if stat == "std":
+                return np.where(count > 1, np.sqrt(values["m2"] / (count - 1)), np.nan)
+        raise ValueError(f"지원하지 않는 통계: {stat} (가능: {STATS + DERIVED_STATS})")
@@ -0,0 +1,180 @@
+# 🗺️ 공유 배열	(센터 × 날짜 × 품목) 물동량/관측 마스크, 피처, 일 단위 롤업, 기간 누적합을 .npy 스냅샷으로 게시
+# 💾 페이지 캐시 공유	여러 Streamlit 서버 프로세스가 같은 파일을 읽기 전용 memmap으로 매핑 (물리 메모리 한 벌)
+# 🚀 빠른 시작	원본 지문이 같은 스냅샷이 있으면 새 워커는 배열 저장소/피처/일 롤업/누적합을 다시 계산하지 않음
+#
+# 사용법: python -m src.shared_arrays --source data/logistics_by_center.csv   (워커 시작 전 미리 게시)
+#         SOPO_SHARED_ARRAYS=1 streamlit run app.py
+
+import argparse
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from src.cube import LogisticsCube
+from src.features import FEATURE_SET_VERSION, FeatureStore
+from src.loader import CACHE_DIR_NAME, get_file_fingerprint
+from src.range_index import RangeIndex
+from src.rollups import Rollups
+
+logger = logging.getLogger(__name__)
+
+# 1이면 LiveStore가 배열을 공유 스냅샷에서 매핑 (기본값: 프로세스별 배열)
+SHARED_ARRAYS = os.environ.get("SOPO_SHARED_ARRAYS") == "1"
+# 스냅샷 파일 구성이 바뀌면 올려서 기존 스냅샷을 무시합니다.
+SHARED_SCHEMA_VERSION = 2
+SHARED_DIR_NAME = "shared"
+META_FILE = "meta.json"
+# 스냅샷에 넣는 롤업 집계 단위 (일 단위가 가장 크고, 주/월/연은 매핑 후 다시 집계해도 작음)
+SHARED_GRAINS = ["day"]
+
+
+def snapshot_dir(source_path: str, fingerprint: str = None) -> str:
+    """
+    원본 CSV 내용에 대응하는 스냅샷 디렉터리 경로를 반환합니다.
+
+    원본 지문과 스키마/피처 버전이 이름에 들어가므로, 내용이 바뀌면 다른 디렉터리가 됩니다.
+
+    Parameters:
+    - source_path (str): 원본 CSV 경로
+    - fingerprint (str): 원본 내용 지문 (None이면 계산)
+
+    Returns:
+    - str: 스냅샷 디렉터리 경로
+    """
+    directory, filename = os.path.split(os.path.abspath(source_path))
+    stem = os.path.splitext(filename)[0]
+    fingerprint = fingerprint or get_file_fingerprint(source_path)
+    name = f"{stem}-{fingerprint}-v{SHARED_SCHEMA_VERSION}.{FEATURE_SET_VERSION}"
+    return os.path.join(directory, CACHE_DIR_NAME, SHARED_DIR_NAME, name)
+
+
+def _prune(directory: str) -> None:
+    """같은 원본의 이전 스냅샷을 지웁니다 (이미 매핑한 워커는 매핑이 유지됨)."""
+    parent, name = os.path.split(directory)
+    stem = name.rsplit("-", 2)[0]
+    for other in os.listdir(parent):
+        if other != name and other.rsplit("-", 2)[0] == stem and ".tmp-" not in other:
+            shutil.rmtree(os.path.join(parent, other), ignore_errors=True)
+
+
+def publish(cube: LogisticsCube, features: FeatureStore, rollups: Rollups, range_index: RangeIndex,
+            directory: str) -> bool:
+    """
+    배열 저장소, 피처, 일 단위 롤업, 기간 누적합 배열을 스냅샷 디렉터리에 저장합니다.
+
+    임시 디렉터리에 모두 쓴 뒤 이름을 바꾸므로, 다른 워커는 완성된 스냅샷만 보게 됩니다.
+    여러 워커가 동시에 게시하면 먼저 끝낸 쪽이 남고 나머지는 버립니다.
+
+    Parameters:
+    - cube (LogisticsCube): 물동량 배열 저장소
+    - features (FeatureStore): 피처 행렬
+    - rollups (Rollups): 롤업 (SHARED_GRAINS 단위만 저장)
+    - range_index (RangeIndex): 기간 누적합 인덱스
+    - directory (str): snapshot_dir 경로
+
+    Returns:
+    - bool: 이 호출이 스냅샷을 게시했으면 True (이미 있었으면 False)
+    """
+    if os.path.exists(os.path.join(directory, META_FILE)):
+        return False
+    os.makedirs(os.path.dirname(directory), exist_ok=True)
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    arrays = {
+        "values": cube.values,
+        "observed": cube.observed,
+        "dow": features.dow,
+        "is_holiday": features.is_holiday,
+        **{f"feature_{name}": array for name, array in features.arrays.items()},
+        **{
+            f"rollup_{grain}_{name}": array
+            for grain in SHARED_GRAINS for name, array in rollups.tables[grain].arrays.items()
+        },
+        "range_sums": range_index.sums,
+        "range_counts": range_index.counts,
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+    meta = {
+        "start": str(cube.dates[0].date()),
+        "n_days": len(cube.dates),
+        "centers": list(cube.centers),
+        "items": list(cube.items),
+        "features": list(features.arrays),
+        "rollups": {grain: list(rollups.tables[grain].arrays) for grain in SHARED_GRAINS},
+    }
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    try:
+        os.rename(tmp_dir, directory)
+    except OSError:
+        # 다른 워커가 먼저 게시함
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+    try:
+        _prune(directory)
+    except OSError:
+        pass
+    logger.info("공유 배열 스냅샷 게시: %s", directory)
+    return True
+
+
+def attach(directory: str) -> tuple:
+    """
+    스냅샷을 읽기 전용 memmap으로 매핑해 배열 저장소, 피처, 기간 인덱스를 만듭니다.
+
+    롤업은 품목 dtype 등 원본 DataFrame 정보가 필요하므로 집계 배열만 돌려주고,
+    호출하는 쪽이 Rollups(cube, arrays=...)로 만듭니다.
+
+    Parameters:
+    - directory (str): snapshot_dir 경로
+
+    Returns:
+    - tuple[LogisticsCube, FeatureStore, dict, RangeIndex]: 저장소, 피처, 집계 단위별 롤업 배열,
+      기간 인덱스 (스냅샷이 없거나 손상되었으면 None)
+    """
+    try:
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        def load(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+        dates = pd.date_range(meta["start"], periods=meta["n_days"], freq="D")
+        cube = LogisticsCube(load("values"), load("observed"), dates, meta["centers"], meta["items"])
+        arrays = {name: load(f"feature_{name}") for name in meta["features"]}
+        features = FeatureStore(cube, arrays, np.asarray(load("dow")), np.asarray(load("is_holiday")))
+        rollup_arrays = {
+            grain: {name: load(f"rollup_{grain}_{name}") for name in names}
+            for grain, names in meta["rollups"].items()
+        }
+        range_index = RangeIndex(cube, load("range_sums"), load("range_counts"))
+    except (OSError, ValueError, KeyError):
+        return None
+    return cube, features, rollup_arrays, range_index
+
+
+if __name__ == "__main__":
+    from src.calendar import HolidayCalendar
+    from src.ingest import DEFAULT_SOURCE
+    from src.loader import KEY_COLUMNS, load_logistics_data
+
+    parser = argparse.ArgumentParser(description="공유 배열 스냅샷 게시")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="원본 CSV 경로")
+    args = parser.parse_args()
+
+    df = load_logistics_data(args.source, compact=False)
+    item_columns = [col for col in df.columns if col not in KEY_COLUMNS]
+    calendar = HolidayCalendar(df["date"].min(), df["date"].max())
+    cube = LogisticsCube.from_frame(df, item_columns)
+    target = snapshot_dir(args.source)
+    published = publish(cube, FeatureStore.build(cube, calendar), Rollups(cube, grains=SHARED_GRAINS),
+                        RangeIndex(cube), target)
+    print(f"{'게시 완료' if published else '이미 최신 스냅샷 있음'}: {target}")
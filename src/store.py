@@ -0,0 +1,313 @@
+# 🧠 프로세스 공유 상태	DataFrame, 배열 저장소, 피처, 롤업, 이상치 통계를 한 곳에서 관리
+# 📥 증분 반영	원본 CSV에 추가된 바이트만 읽어 영향받는 날짜/센터만 갱신
+# 🔢 버전	갱신될 때마다 version이 올라가 하위 캐시 키로 사용
+# 🗺️ 공유 배열	SOPO_SHARED_ARRAYS=1이면 배열 저장소/피처/일 롤업/기간 누적합을 워커 간 공유 memmap 스냅샷에서 매핑
+
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.anomaly import DEFAULT_Z_THRESH, WeekdayAnomalies
+from src.calendar import HolidayCalendar
+from src.cube import LogisticsCube
+from src.features import FeatureStore
+from src.ingest import read_appended_rows, validate_increment
+from src.instrument import span
+from src.loader import (
+    COMPACT_DTYPES, KEY_COLUMNS, compact_dtypes, concat_frames, get_file_fingerprint, load_logistics_data,
+    log_memory_report, memory_report, validate_schema,
+)
+from src.range_index import RangeIndex
+from src.rollups import Rollups
+from src.shared_arrays import SHARED_ARRAYS, attach, publish, snapshot_dir
+
+logger = logging.getLogger(__name__)
+
+DERIVED_COLUMNS = [
+    "weekday", "year", "month", "dow", "year_month", "is_holiday", "is_festival_week",
+]
+
+
+def festival_week_flags(calendar: HolidayCalendar, dates) -> np.ndarray:
+    """공휴일 당일 ~ 2일 후를 명절 주간으로 간주합니다."""
+    days_since = calendar.lookup(dates, "days_since_holiday")
+    return (days_since >= 0) & (days_since < 3)
+
+
+def add_derived_columns(df: pd.DataFrame, calendar: HolidayCalendar) -> pd.DataFrame:
+    """날짜 기반 파생 컬럼을 고유 날짜 단위로 한 번만 계산해 붙입니다."""
+    dates = pd.Series(df["date"].unique()).sort_values(ignore_index=True)
+
+    by_date = pd.DataFrame({"date": dates})
+    by_date["weekday"] = dates.dt.day_name()
+    by_date["year"] = dates.dt.year
+    by_date["month"] = dates.dt.month
+    by_date["dow"] = dates.dt.dayofweek
+    by_date["year_month"] = dates.dt.to_period("M").astype(str)
+    by_date["is_holiday"] = calendar.lookup(dates, "is_holiday")
+    by_date["is_festival_week"] = festival_week_flags(calendar, dates)
+
+    return df.merge(by_date, how="left", on="date")
+
+
+class LiveStore:
+    """
+    워커 프로세스 하나가 공유하는 데이터 상태입니다.
+
+    원본 CSV 끝에 행이 추가되면(`src.ingest`) sync()가 추가된 부분만 읽어
+    배열 저장소/피처/롤업/이상치 통계/DataFrame을 증분 갱신합니다.
+
+    Attributes:
+    - df (pd.DataFrame): 원본 컬럼 + 파생 컬럼 DataFrame (읽기 전용)
+    - item_columns (list[str]): 품목 컬럼 목록
+    - calendar (HolidayCalendar): 공휴일 달력
+    - cube (LogisticsCube): (센터 × 날짜 × 품목) 배열 저장소
+    - features (FeatureStore): 예측 피처 행렬
+    - rollups (Rollups): 일/주/월/연 × 센터 × 품목 집계
+    - range_index (RangeIndex): 임의 기간 센터별 합계/평균/증감률 (누적합)
+    - version (int): 데이터가 바뀔 때마다 1씩 증가
+    - fingerprint (str): 마지막으로 전체 로딩한 원본 CSV 내용 지문 (version과 함께 데이터 식별)
+    - memory_report (pd.DataFrame): dtype 스키마 적용 전후 컬럼별 메모리 (compact=False면 None)
+    - shared_dir (str): 매핑한 공유 배열 스냅샷 경로 (공유하지 않으면 None)
+    """
+
+    def __init__(self, source_path: str, compact: bool = COMPACT_DTYPES, shared: bool = SHARED_ARRAYS):
+        self.source_path = source_path
+        self.compact = compact
+        self.shared = shared
+        self.version = -1
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self) -> None:
+        """
+        원본 CSV 전체를 다시 읽어 모든 상태를 만듭니다.
+
+        새 상태는 지역 변수로 모두 만든 뒤 한 번에 교체하므로, 다시 로딩하는 동안에도
+        다른 세션은 이전 상태를 일관되게 읽습니다.
+        """
+        # 지문을 먼저 계산 (로딩 중 행이 추가되어도 지문은 더 짧은 내용을 가리킴)
+        fingerprint = get_file_fingerprint(self.source_path)
+        with span("load_data"):
+            df = load_logistics_data(self.source_path, compact=False)
+        if self.compact:
+            validate_schema(df)
+        source_size = os.path.getsize(self.source_path)
+        item_columns = [col for col in df.columns if col not in KEY_COLUMNS]
+        item_dtypes = df[item_columns].dtypes.to_dict()
+        calendar = HolidayCalendar(df["date"].min(), df["date"].max())
+        directory = snapshot_dir(self.source_path, fingerprint) if self.shared else None
+        state = self._attach(directory, df, item_columns, item_dtypes)
+        if state is None:
+            with span("build_cube"):
+                cube = LogisticsCube.from_frame(df, item_columns)
+            with span("build_features"):
+                features = FeatureStore.build(cube, calendar)
+            with span("build_rollups"):
+                rollups = Rollups(cube, item_dtypes=item_dtypes)
+            with span("build_range_index"):
+                range_index = RangeIndex(cube)
+            state = self._share(directory, df, item_columns, (cube, features, rollups, range_index))
+        (cube, features, rollups, range_index), shared_dir = state
+        with span("derived_columns"):
+            full_df = add_derived_columns(df, calendar)
+        report = None
+        if self.compact:
+            # 센터명/요일/연월 category, 품목/연/월/요일 번호는 값이 들어가는 가장 작은 dtype
+            with span("compact_dtypes"):
+                compacted = compact_dtypes(full_df)
+            report = memory_report(full_df, compacted)
+            log_memory_report(report)
+            full_df = compacted
+
+        with self._lock:
+            self.source_size = source_size
+            self.fingerprint = fingerprint
+            self.raw_columns = list(df.columns)
+            self.item_columns = item_columns
+            self.calendar = calendar
+            self.cube, self.features, self.shared_dir = cube, features, shared_dir
+            self.memory_report = report
+            self.df = full_df
+            self.rollups = rollups
+            self.range_index = range_index
+            self._anomalies = {}
+            self.version += 1
+
+    def _attach(self, directory: str, df: pd.DataFrame, item_columns: list, item_dtypes: dict) -> tuple:
+        """
+        공유 스냅샷을 읽기 전용 memmap으로 매핑합니다.
+
+        스냅샷이 없거나 로딩한 DataFrame과 맞지 않으면(로딩 중 원본 변경 등) None을 반환합니다.
+
+        Returns:
+        - tuple: ((저장소, 피처, 롤업, 기간 인덱스), 스냅샷 경로) 또는 None
+        """
+        if not directory:
+            return None
+        with span("attach_shared"):
+            attached = attach(directory)
+        if attached is None or not self._matches(attached[0], df, item_columns):
+            return None
+        cube, features, rollup_arrays, range_index = attached
+        with span("build_rollups"):
+            # 일 단위는 매핑한 배열을 쓰고, 주/월/연만 다시 집계
+            rollups = Rollups(cube, item_dtypes=item_dtypes, arrays=rollup_arrays)
+        return (cube, features, rollups, range_index), directory
+
+    def _share(self, directory: str, df: pd.DataFrame, item_columns: list, state: tuple) -> tuple:
+        """
+        직접 계산한 상태를 스냅샷으로 게시한 뒤 매핑합니다 (다른 워커와 같은 페이지 캐시 사용).
+
+        게시나 매핑에 실패하면 프로세스 전용 상태를 그대로 씁니다.
+
+        Parameters:
+        - directory (str): 게시할 snapshot_dir 경로 (None이면 공유하지 않음)
+        - state (tuple): (저장소, 피처, 롤업, 기간 인덱스)
+
+        Returns:
+        - tuple: ((저장소, 피처, 롤업, 기간 인덱스), 매핑한 스냅샷 경로 또는 None)
+        """
+        if not directory:
+            return state, None
+        try:
+            with span("publish_shared"):
+                publish(*state, directory)
+        except OSError as e:
+            logger.warning("공유 배열 스냅샷 게시 실패 (읽기 전용 경로?): %s", e)
+        return self._attach(directory, df, item_columns, state[2].item_dtypes) or (state, None)
+
+    @staticmethod
+    def _matches(cube: LogisticsCube, df: pd.DataFrame, item_columns: list) -> bool:
+        return (
+            cube.items == item_columns
+            and set(cube.centers) == set(df["center_name"].unique())
+            and cube.dates[0] == df["date"].min()
+            and cube.dates[-1] == df["date"].max()
+            and int(cube.observed.sum()) == len(df)
+        )
+
+    def _current_snapshot(self) -> str:
+        """
+        반영을 마친 원본 내용의 스냅샷 경로 (공유하지 않거나 원본이 그 사이 더 늘었으면 None).
+
+        지문을 계산하는 동안 원본이 바뀌면 다른 내용의 지문이 되므로 앞뒤 크기를 확인합니다.
+        """
+        if not self.shared or os.path.getsize(self.source_path) != self.source_size:
+            return None
+        directory = snapshot_dir(self.source_path)
+        if os.path.getsize(self.source_path) != self.source_size:
+            return None
+        return directory
+
+    @property
+    def data_version(self) -> tuple:
+        """
+        (로딩 시 원본 지문, version) 쌍입니다.
+
+        version은 LiveStore를 새로 만들면 0부터 다시 시작하므로, 프로세스 캐시 키에는
+        지문과 함께 이 값을 씁니다 (같은 내용을 다시 로딩한 경우에만 키가 같아짐).
+        """
+        with self._lock:
+            return self.fingerprint, self.version
+
+    def anomalies(self, z_thresh: float = DEFAULT_Z_THRESH) -> WeekdayAnomalies:
+        """기준값별 이상치 탐지 결과 (처음 요청 시 계산하고 이후 증분 갱신)."""
+        with self._lock:
+            if z_thresh not in self._anomalies:
+                with span("anomaly_detection"):
+                    self._anomalies[z_thresh] = WeekdayAnomalies(self.cube, self.calendar, z_thresh)
+            return self._anomalies[z_thresh]
+
+    def sync(self) -> set:
+        """
+        원본 CSV에 추가된 행이 있으면 반영합니다.
+
+        파일이 줄었거나(재작성) 추가된 행이 검증에 실패하면 전체를 다시 로딩합니다.
+
+        Returns:
+        - set: 값이 바뀐 센터명 집합 (변경 없으면 빈 집합)
+        """
+        if os.path.getsize(self.source_path) == self.source_size:
+            return set()
+
+        with self._lock:
+            size = os.path.getsize(self.source_path)
+            if size == self.source_size:
+                return set()
+            if size < self.source_size:
+                self._load()
+                return set(self.cube.centers)
+
+            new_rows, consumed = read_appended_rows(self.source_path, self.source_size, self.raw_columns)
+            if new_rows.empty:
+                self.source_size += consumed
+                return set()
+            try:
+                new_rows = validate_increment(new_rows, self.raw_columns, self.df[KEY_COLUMNS])
+            except ValueError:
+                self._load()
+                return set(self.cube.centers)
+
+            self.source_size += consumed
+            return self.apply(new_rows)
+
+    def apply(self, new_rows: pd.DataFrame) -> set:
+        """
+        검증된 추가 행을 모든 파생 상태에 증분 반영합니다.
+
+        - 배열 저장소: 새 날짜/센터 축 확장 후 값 기록
+        - 피처: 가장 이른 변경 날짜 이후만 재계산
+        - 롤업: 바뀐 센터의 가장 이른 변경 기간 이후만 재집계
+        - 기간 인덱스: 가장 이른 변경 날짜 이후 누적합만 재계산
+        - 이상치: 요일별 통계 병합, 영향받은 센터의 Z-score만 재계산
+
+        각 상태의 복사본에 반영한 뒤 참조를 한 번에 교체합니다(copy-on-write). 다른 세션의
+        스크립트가 이전 객체를 읽고 있어도 갱신 도중의 배열을 보지 않습니다.
+        공유 모드에서는 매핑 중인 스냅샷 파일을 수정하지 않고, 반영 결과를 새 원본 지문의
+        스냅샷으로 게시한 뒤 그 스냅샷에 다시 매핑합니다 (다른 워커도 같은 스냅샷을 매핑).
+
+        Returns:
+        - set: 값이 바뀐 센터명 집합
+        """
+        with self._lock, span("store_apply"):
+            calendar = self.calendar
+            if new_rows["date"].max() > calendar.dates[-1]:
+                calendar = HolidayCalendar(self.cube.dates[0], new_rows["date"].max())
+
+            cube = self.cube.copy()
+            center_codes, day_codes = cube.append(new_rows)
+            start = int(day_codes.min())
+            features = self.features.copy(cube)
+            features.extend(calendar, start)
+            rollups = self.rollups.copy(cube)
+            rollups.update(center_codes, day_codes)
+            range_index = self.range_index.copy(cube)
+            range_index.update(start)
+            anomalies = {}
+            for z_thresh, previous in self._anomalies.items():
+                anomalies[z_thresh] = previous.copy(cube)
+                anomalies[z_thresh].update(calendar, center_codes, day_codes)
+
+            added = add_derived_columns(new_rows, calendar)
+            if self.compact:
+                added = compact_dtypes(added)
+            # category 범주를 합쳐 이어 붙임 (숫자 컬럼은 필요하면 큰 dtype으로 올라감)
+            df = concat_frames([self.df, added])
+            state, shared_dir = self._share(self._current_snapshot(), df, self.item_columns,
+                                            (cube, features, rollups, range_index))
+            (cube, features, rollups, range_index) = state
+            for z_thresh in anomalies:
+                anomalies[z_thresh].cube = cube
+
+            self.calendar = calendar
+            self.cube, self.features, self.shared_dir = cube, features, shared_dir
+            self.rollups = rollups
+            self.range_index = range_index
+            self._anomalies = anomalies
+            self.df = df
+            self.version += 1
+            return set(new_rows["center_name"].unique())
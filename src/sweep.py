@@ -0,0 +1,139 @@
+# 🚀 병렬 스윕	센터 × 품목 조합별 학습을 프로세스 풀로 분산
+# 🧵 스레드 예산	워커 수 × LightGBM 스레드 수가 CPU 코어 수를 넘지 않도록 조정
+# 🧾 오류 수집	조합별 예외를 결과와 함께 모아 한 번에 보고
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.features import FEATURE_COLUMNS, FeatureStore
+from src.metrics import regression_metrics
+
+# 기본 워커 수 (0 또는 미설정이면 CPU 코어 수)
+SWEEP_WORKERS_ENV = "SOPO_SWEEP_WORKERS"
+
+
+@dataclass
+class SweepOutcome:
+    center: str
+    item: str
+    result: dict = None
+    error: str = None
+
+
+def resolve_workers(n_tasks: int, max_workers: int = None) -> tuple[int, int]:
+    """
+    프로세스 워커 수와 워커당 LightGBM 스레드 수를 결정합니다.
+
+    Parameters:
+    - n_tasks (int): 전체 조합 수
+    - max_workers (int): 요청 워커 수 (None이면 환경변수 또는 CPU 코어 수)
+
+    Returns:
+    - tuple[int, int]: (워커 수, 워커당 스레드 수)
+    """
+    cpu_count = os.cpu_count() or 1
+    requested = max_workers or int(os.environ.get(SWEEP_WORKERS_ENV, 0)) or cpu_count
+    workers = max(1, min(requested, cpu_count, max(n_tasks, 1)))
+    return workers, max(1, cpu_count // workers)
+
+
+def make_holdout_tasks(features: FeatureStore, period_days: int) -> list[dict]:
+    """
+    모든 센터 × 품목에 대해 마지막 period_days일을 평가 구간으로 하는 학습 과제를 만듭니다.
+
+    학습 데이터가 부족한 조합(행 수 <= period_days)은 제외합니다.
+
+    Returns:
+    - list[dict]: center, item, X_train, y_train, X_test, y_test, ds_test 키를 가진 과제 목록
+    """
+    tasks = []
+    for center in features.cube.centers:
+        for item in features.cube.items:
+            target_df = features.series_frame(center, item)
+            if len(target_df) <= period_days:
+                continue
+            X = target_df[FEATURE_COLUMNS].to_numpy()
+            y = target_df["y"].to_numpy()
+            tasks.append({
+                "center": center,
+                "item": item,
+                "X_train": X[:-period_days],
+                "y_train": y[:-period_days],
+                "X_test": X[-period_days:],
+                "y_test": y[-period_days:],
+                "ds_test": target_df["ds"].to_numpy()[-period_days:],
+            })
+    return tasks
+
+
+def predict_lgbm_holdout(task: dict, n_jobs: int = 1) -> np.ndarray:
+    """
+    단일 조합에 LightGBM을 학습하고 평가 구간 예측값(음수는 0으로 보정)을 반환합니다.
+
+    프로세스 풀에서 실행되므로 모듈 최상위 함수로 두고, 무거운 의존성은 내부에서 import 합니다.
+    """
+    import pandas as pd
+    from src.forecasters import make_forecaster
+
+    train_df = pd.DataFrame(task["X_train"], columns=FEATURE_COLUMNS).assign(y=task["y_train"])
+    test_df = pd.DataFrame(task["X_test"], columns=FEATURE_COLUMNS).assign(ds=task["ds_test"])
+
+    forecaster = make_forecaster("lgbm", n_jobs=n_jobs).fit(train_df)
+    return forecaster.predict(test_df)["yhat"].to_numpy()
+
+
+def fit_lgbm_holdout(task: dict, n_jobs: int = 1) -> dict:
+    """단일 조합에 LightGBM을 학습하고 평가 구간의 MAE/RMSE/R²를 계산합니다."""
+    y_pred = predict_lgbm_holdout(task, n_jobs=n_jobs)
+    metrics = regression_metrics(task["y_test"], y_pred)
+    return {
+        "센터": task["center"],
+        "품목": task["item"],
+        "MAE": round(metrics["MAE"], 2),
+        "RMSE": round(metrics["RMSE"], 2),
+        "R2": round(metrics["R2"], 3),
+    }
+
+
+def _run_one(fn, task: dict, n_jobs: int) -> SweepOutcome:
+    try:
+        return SweepOutcome(task["center"], task["item"], result=fn(task, n_jobs=n_jobs))
+    except Exception as e:
+        return SweepOutcome(task["center"], task["item"], error=str(e))
+
+
+def run_sweep(tasks: list[dict], fn=fit_lgbm_holdout, max_workers: int = None):
+    """
+    과제 목록을 프로세스 풀에서 병렬 실행하고 끝나는 순서대로 결과를 돌려줍니다.
+
+    워커가 1개면 프로세스 생성 없이 현재 프로세스에서 순차 실행합니다.
+    제너레이터를 끝까지 소비하지 않고 닫으면 아직 시작하지 않은 과제는 취소됩니다.
+
+    Parameters:
+    - tasks (list[dict]): center, item 키를 포함한 과제 목록
+    - fn (callable): fn(task, n_jobs=...) 형태의 모듈 최상위 함수
+    - max_workers (int): 최대 워커 수
+
+    Yields:
+    - SweepOutcome: 조합별 결과 또는 오류 메시지
+    """
+    workers, n_jobs = resolve_workers(len(tasks), max_workers)
+    if workers == 1:
+        for task in tasks:
+            yield _run_one(fn, task, n_jobs)
+        return
+
+    # Streamlit 스크립트 스레드에서 fork 하지 않도록 spawn 컨텍스트 사용
+    context = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        futures = [pool.submit(_run_one, fn, task, n_jobs) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # 소비자가 중간에 멈추면(Streamlit 재실행 시 GeneratorExit) 남은 과제를 기다리지 않고 취소
+        pool.shutdown(wait=False, cancel_futures=True)
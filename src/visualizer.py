@@ -1,30 +1,153 @@
 # 📦 코드 분리	각 페이지가 시각화 로직으로부터 독립됨
 # 🔁 재사용성 증가	동일 그래프를 여러 페이지에서 쉽게 활용
 # 🧪 유닛 테스트 가능	시각화 함수 단위로 테스트/개선 용이
+# 📉 다운샘플링	긴 시계열은 화면 해상도(점 예산)에 맞춰 LTTB / min-max로 줄여서 전송
+# 🖥️ WebGL	점이 많으면 Scattergl로 그려 브라우저 부담 감소
 
+import logging
+import os
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 
-def line_chart_by_center(pivot_df: pd.DataFrame, item_name: str) -> go.Figure:
+logger = logging.getLogger(__name__)
+
+# 시리즈(trace)당 최대 점 수 (대략 차트 가로 픽셀 수)
+DEFAULT_POINT_BUDGET = int(os.environ.get("SOPO_CHART_POINT_BUDGET", 1500))
+# 차트 전체 점 수가 이보다 많으면 SVG 대신 WebGL(Scattergl)로 렌더링
+WEBGL_THRESHOLD = 5000
+# 시리즈당 점 수가 이보다 많으면 마커 없이 선만 표시
+MARKER_MAX_POINTS = 200
+DOWNSAMPLE_METHODS = ["lttb", "minmax"]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets로 선 모양을 가장 잘 유지하는 n_out개 점의 위치를 고릅니다.
+
+    첫 점과 마지막 점은 항상 포함하고, 나머지 구간을 n_out - 2개 버킷으로 나눠
+    (직전 선택 점, 후보, 다음 버킷 평균)이 이루는 삼각형 넓이가 가장 큰 점을 선택합니다.
+
+    Parameters:
+    - x (np.ndarray): 정렬된 x 좌표 (숫자)
+    - y (np.ndarray): y 값 (결측 없음)
+    - n_out (int): 남길 점 수
+
+    Returns:
+    - np.ndarray: 선택된 점의 위치 (오름차순)
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for k in range(n_out - 2):
+        start, end = edges[k], max(edges[k + 1], edges[k] + 1)
+        next_start, next_end = (edges[k + 1], edges[k + 2]) if k + 2 < len(edges) else (n - 1, n)
+        next_end = max(next_end, next_start + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        indices[k + 1] = selected
+    return indices
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    구간별 최솟값/최댓값 위치를 남겨 최대 n_out개 점으로 줄입니다 (급등/급락 봉우리 보존).
+
+    첫 점과 마지막 점 2개를 빼고 남은 예산으로 (n_out - 2) // 2개 구간을 만들므로
+    결과는 n_out개를 넘지 않습니다.
+
+    Returns:
+    - np.ndarray: 선택된 점의 위치 (오름차순, 중복 제거)
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = (n_out - 2) // 2
+    if n_buckets < 1:
+        return np.array([0, n - 1])[:max(n_out, 1)]
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    indices = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            segment = y[start:end]
+            indices += [start + int(np.argmin(segment)), start + int(np.argmax(segment))]
+    return np.unique(indices)
+
+
+def downsample_series(series: pd.Series, point_budget: int = DEFAULT_POINT_BUDGET,
+                      method: str = "lttb") -> pd.Series:
+    """
+    시계열을 point_budget개 이하의 점으로 줄입니다 (이미 작으면 그대로 반환).
+
+    줄이는 경우 결측(NaN) 날짜는 제외합니다.
+
+    Parameters:
+    - series (pd.Series): 날짜(또는 숫자) 인덱스의 시계열
+    - point_budget (int): 최대 점 수
+    - method (str): "lttb"(모양 보존) 또는 "minmax"(봉우리 보존)
+
+    Returns:
+    - pd.Series
+    """
+    if len(series) <= point_budget:
+        return series
+    series = series.dropna()
+    if len(series) <= point_budget:
+        return series
+
+    y = series.to_numpy(dtype=np.float64)
+    if method == "minmax":
+        indices = minmax_indices(y, point_budget)
+    else:
+        index = series.index
+        x = index.asi8 / 86400e9 if isinstance(index, pd.DatetimeIndex) else np.arange(len(y), dtype=np.float64)
+        indices = lttb_indices(x, y, point_budget)
+    return series.iloc[indices]
+
+
+def line_chart_by_center(pivot_df: pd.DataFrame, item_name: str,
+                         point_budget: int = DEFAULT_POINT_BUDGET, method: str = "lttb") -> go.Figure:
     """
     센터별 품목의 시계열 추이를 선 그래프로 시각화합니다.
 
+    센터(trace)마다 point_budget개 이하로 다운샘플링하고, 전체 점 수가 많으면
+    WebGL(Scattergl)로, 시리즈가 촘촘하면 마커 없이 그립니다.
+
     Parameters:
     - pivot_df: date x center_name 형태의 데이터프레임
     - item_name: 품목 이름 (그래프 제목용)
+    - point_budget: 센터별 최대 점 수
+    - method: 다운샘플링 방식 ("lttb" 또는 "minmax")
 
     Returns:
     - plotly.graph_objects.Figure
     """
+    traces = {center: downsample_series(pivot_df[center], point_budget, method) for center in pivot_df.columns}
+    total_points = sum(len(series) for series in traces.values())
+    scatter = go.Scattergl if total_points > WEBGL_THRESHOLD else go.Scatter
+
     fig = go.Figure()
-    for center in pivot_df.columns:
-        fig.add_trace(go.Scatter(
-            x=pivot_df.index,
-            y=pivot_df[center],
-            mode='lines+markers',
+    for center, series in traces.items():
+        dense = len(series) > MARKER_MAX_POINTS
+        fig.add_trace(scatter(
+            x=series.index,
+            y=series.to_numpy(),
+            mode='lines' if dense else 'lines+markers',
             name=center,
-            line=dict(width=2),
+            line=dict(width=1.5 if dense else 2),
             marker=dict(size=4)
         ))
     fig.update_layout(
@@ -35,15 +158,24 @@ def line_chart_by_center(pivot_df: pd.DataFrame, item_name: str) -> go.Figure:
         template="plotly_white",
         legend_title="센터"
     )
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "line_chart_by_center: 원본 %d점 → %d점, %s, payload %.1f KB",
+            int(pivot_df.count().sum()), total_points, scatter.__name__, len(fig.to_json()) / 1024,
+        )
     return fig
 
 
-def bar_chart_by_item(melted_df: pd.DataFrame) -> px.bar:
+def bar_chart_by_item(melted_df: pd.DataFrame, value_name: str = "물동량",
+                      title: str = "센터별 품목 물동량 비교") -> px.bar:
     """
     센터별 품목 물동량을 막대그래프로 시각화합니다.
 
     Parameters:
-    - melted_df: center_name, 품목, 물동량 컬럼을 가진 긴 형태의 데이터프레임
+    - melted_df: center_name, 품목, value_name 컬럼을 가진 긴 형태의 데이터프레임
+    - value_name: 값 컬럼 이름 (y축 제목)
+    - title: 그래프 제목
 
     Returns:
     - plotly.express.bar 객체
@@ -51,16 +183,58 @@ def bar_chart_by_item(melted_df: pd.DataFrame) -> px.bar:
     fig = px.bar(
         melted_df,
         x="center_name",
-        y="물동량",
+        y=value_name,
         color="품목",
         barmode="group",
         text_auto=".2s",
-        title="센터별 품목 물동량 비교"
+        title=title
     )
     fig.update_layout(
         xaxis_title="센터명",
-        yaxis_title="물동량",
+        yaxis_title=value_name,
         legend_title="품목",
         template="plotly_white"
     )
     return fig
+
+
+def future_forecast_chart(history: pd.DataFrame, forecasts: dict, title: str = None) -> go.Figure:
+    """
+    최근 실제값과 마지막 관측일 이후의 미래 예측을 이어서 그립니다.
+
+    Parameters:
+    - history: ds, y 컬럼을 가진 최근 실제값
+    - forecasts: 예측 이름 → ds, yhat 컬럼을 가진 데이터프레임
+    - title: 그래프 제목
+
+    Returns:
+    - plotly.graph_objects.Figure
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=history["ds"],
+        y=history["y"],
+        mode="lines",
+        name="실제값",
+        line=dict(color="black")
+    ))
+    for name, forecast in forecasts.items():
+        fig.add_trace(go.Scatter(
+            x=forecast["ds"],
+            y=forecast["yhat"],
+            mode="lines+markers",
+            name=name,
+            line=dict(dash="dot")
+        ))
+    if len(history):
+        # 마지막 관측일 (이후는 실제값이 없는 미래 구간)
+        fig.add_vline(x=history["ds"].iloc[-1], line_width=1, line_dash="dash", line_color="gray")
+    fig.update_layout(
+        title=title,
+        xaxis_title="날짜",
+        yaxis_title="물동량",
+        hovermode="x unified",
+        template="plotly_white",
+        legend_title="구분"
+    )
+    return fig